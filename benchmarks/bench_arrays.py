@@ -0,0 +1,52 @@
+"""
+Compare time and memory of read_obo_arrays against read_obo, measured with
+tracemalloc.
+
+Usage: python -m benchmarks.bench_arrays [n_terms]
+"""
+
+from __future__ import annotations
+
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from typing import Any
+
+import obonet
+from obonet.arrays import read_obo_arrays
+
+from .synthetic import write_synthetic_obo
+
+
+def measure(path: str, function: Callable[[str], Any]) -> None:
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = function(path)
+    seconds = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"{function.__name__}: {current / 2**20:.1f} MiB retained, "
+        f"{peak / 2**20:.1f} MiB peak, {seconds:.2f} s, {len(result):,} nodes"
+    )
+    del result
+
+
+def main() -> None:
+    n_terms = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "synthetic.obo")
+        with open(path, "w", encoding="utf-8") as write_file:
+            write_synthetic_obo(write_file, n_terms)
+        print(f"{n_terms:,} terms")
+        for function in obonet.read_obo, read_obo_arrays:
+            measure(path, function)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Benchmark graph construction by build_graph against per-node add_node and
+per-edge add_edge calls.
+
+Usage: python -m benchmarks.bench_build [n_terms]
+"""
+
+from __future__ import annotations
+
+import copy
+import io
+import sys
+import time
+
+import networkx
+
+from obonet.read import Stanza, build_graph, iter_sections
+
+from .synthetic import write_synthetic_obo
+
+
+def build_graph_add_edge(stanzas: list[Stanza]) -> networkx.MultiDiGraph:
+    graph = networkx.MultiDiGraph()
+    edge_tuples = []
+    for stanza in stanzas:
+        if stanza.stanza_type != "Term":
+            continue
+        term = stanza.tags
+        if term.get("is_obsolete", "false") == "true":
+            continue
+        term_id = term.pop("id")
+        graph.add_node(term_id, **term)
+        for target_term in term.pop("is_a", []):
+            edge_tuples.append((term_id, "is_a", target_term))
+        for relationship in term.pop("relationship", []):
+            typedef, target_term = relationship.split(" ")
+            edge_tuples.append((term_id, typedef, target_term))
+    for term0, typedef, term1 in edge_tuples:
+        graph.add_edge(term0, term1, key=typedef)
+    return graph
+
+
+def main() -> None:
+    n_terms = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    obo_file = io.StringIO()
+    write_synthetic_obo(obo_file, n_terms)
+    obo_file.seek(0)
+    stanzas = list(iter_sections(obo_file))
+    print(f"{n_terms:,} terms")
+    for function in build_graph_add_edge, build_graph:
+        stanzas_copy = copy.deepcopy(stanzas)
+        start = time.perf_counter()
+        graph = function(stanzas_copy)
+        seconds = time.perf_counter() - start
+        print(
+            f"{function.__name__}: {seconds:.2f} s, "
+            f"{len(graph):,} nodes, {graph.number_of_edges():,} edges"
+        )
+
+
+if __name__ == "__main__":
+    main()
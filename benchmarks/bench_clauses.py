@@ -0,0 +1,63 @@
+"""
+Compare the time and memory of read_obo with and without include_clauses,
+and with the clauses of every node accessed after reading. Memory is
+measured with tracemalloc in a separate pass.
+
+Usage: python -m benchmarks.bench_clauses [n_terms]
+"""
+
+from __future__ import annotations
+
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any
+
+import obonet
+
+from .synthetic import write_synthetic_obo
+
+
+def load(path: str, include_clauses: bool, access: bool) -> Any:
+    graph = obonet.read_obo(path, include_clauses=include_clauses)
+    if access:
+        for _, data in graph.nodes(data=True):
+            data.get("_clauses", {}).get("id")
+    return graph
+
+
+def measure(label: str, path: str, include_clauses: bool, access: bool) -> None:
+    gc.collect()
+    start = time.perf_counter()
+    graph = load(path, include_clauses, access)
+    seconds = time.perf_counter() - start
+    del graph
+    gc.collect()
+    tracemalloc.start()
+    graph = load(path, include_clauses, access)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del graph
+    print(
+        f"{label}: {seconds:.2f} s, {current / 2**20:.1f} MiB retained, "
+        f"{peak / 2**20:.1f} MiB peak"
+    )
+
+
+def main() -> None:
+    n_terms = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "synthetic.obo")
+        with open(path, "w", encoding="utf-8") as write_file:
+            write_synthetic_obo(write_file, n_terms)
+        print(f"{n_terms:,} terms")
+        measure("read_obo", path, include_clauses=False, access=False)
+        measure("include_clauses", path, include_clauses=True, access=False)
+        measure("include_clauses, accessed", path, include_clauses=True, access=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Compare memory used by graphs from read_obo with and without compact=True,
+measured with tracemalloc.
+
+Usage: python -m benchmarks.bench_compact [n_terms]
+"""
+
+from __future__ import annotations
+
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import obonet
+
+from .synthetic import write_synthetic_obo
+
+
+def measure(path: str, compact: bool) -> None:
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    graph = obonet.read_obo(path, compact=compact)
+    seconds = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"compact={compact}: {current / 2**20:.1f} MiB retained, "
+        f"{peak / 2**20:.1f} MiB peak, {seconds:.2f} s, {len(graph):,} nodes"
+    )
+    del graph
+
+
+def main() -> None:
+    n_terms = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "synthetic.obo")
+        with open(path, "w", encoding="utf-8") as write_file:
+            write_synthetic_obo(write_file, n_terms)
+        print(f"{n_terms:,} terms")
+        for compact in False, True:
+            measure(path, compact)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Compare writing a slim with filter_obo against reading the lines of the
+ontology, and against subsetting the graph from read_obo. Peak memory is
+measured with tracemalloc in a separate pass.
+
+Usage: python -m benchmarks.bench_filter [n_terms]
+"""
+
+from __future__ import annotations
+
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from typing import Any
+
+import obonet
+from obonet.filter import filter_obo
+
+from .synthetic import write_synthetic_obo
+
+
+def read_lines(path: str, output: str) -> int:
+    n_lines = 0
+    with open(path, encoding="utf-8") as read_file:
+        for _ in read_file:
+            n_lines += 1
+    return n_lines
+
+
+def filter_graph(path: str, output: str) -> int:
+    graph = obonet.read_obo(path)
+    nodes = [
+        node
+        for node, data in graph.nodes(data=True)
+        if "slim" in data.get("subset", [])
+    ]
+    return len(graph.subgraph(nodes))
+
+
+def filter_stream(path: str, output: str) -> int:
+    return filter_obo(path, output, subsets=["slim"])
+
+
+def measure(
+    label: str, function: Callable[[str, str], Any], path: str, output: str
+) -> None:
+    gc.collect()
+    start = time.perf_counter()
+    function(path, output)
+    seconds = time.perf_counter() - start
+    tracemalloc.start()
+    function(path, output)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    megabytes = os.path.getsize(path) / 2**20
+    print(
+        f"{label}: {seconds:.2f} s, {megabytes / seconds:.0f} MiB/s, "
+        f"{peak / 2**20:.1f} MiB peak"
+    )
+
+
+def main() -> None:
+    n_terms = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "synthetic.obo")
+        output = os.path.join(tmp_dir, "slim.obo")
+        with open(path, "w", encoding="utf-8") as write_file:
+            write_synthetic_obo(write_file, n_terms)
+        print(f"{n_terms:,} terms, {os.path.getsize(path) / 2**20:.1f} MiB")
+        measure("read lines", read_lines, path, output)
+        measure("filter_obo", filter_stream, path, output)
+        measure("read_obo and subgraph", filter_graph, path, output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Compare write time, read time and size of the CLI output formats: indented
+node-link JSON, newline-delimited JSON and the obonet binary format.
+
+Usage: python -m benchmarks.bench_formats [n_terms]
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from typing import Any
+
+import networkx
+from networkx.readwrite import json_graph
+
+import obonet
+from obonet.cli import write_ndjson, write_node_link
+
+from .synthetic import write_synthetic_obo
+
+
+def write_node_link_file(graph: networkx.MultiDiGraph, path: str) -> None:
+    with open(path, "w", encoding="utf-8") as write_file:
+        write_node_link(graph, write_file, indent=2)
+
+
+def read_node_link(path: str) -> networkx.MultiDiGraph:
+    with open(path, encoding="utf-8") as read_file:
+        return json_graph.node_link_graph(json.load(read_file))
+
+
+def write_ndjson_file(graph: networkx.MultiDiGraph, path: str) -> None:
+    with open(path, "w", encoding="utf-8") as write_file:
+        write_ndjson(graph, write_file)
+
+
+def read_ndjson(path: str) -> networkx.MultiDiGraph:
+    graph = networkx.MultiDiGraph()
+    with open(path, encoding="utf-8") as read_file:
+        graph.graph.update(json.loads(next(read_file))["graph"])
+        for line in read_file:
+            record = json.loads(line)
+            if "node" in record:
+                node = record["node"]
+                graph.add_node(node.pop("id"), **node)
+            else:
+                link = record["link"]
+                graph.add_edge(link.pop("source"), link.pop("target"), **link)
+    return graph
+
+
+formats: dict[str, tuple[Callable[..., None], Callable[[str], Any]]] = {
+    "json": (write_node_link_file, read_node_link),
+    "ndjson": (write_ndjson_file, read_ndjson),
+    "binary": (obonet.write_binary, obonet.read_binary),
+}
+
+
+def main() -> None:
+    n_terms = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "synthetic.obo")
+        with open(path, "w", encoding="utf-8") as write_file:
+            write_synthetic_obo(write_file, n_terms)
+        graph = obonet.read_obo(path)
+        print(f"{n_terms:,} terms")
+        for name, (write, read) in formats.items():
+            output = os.path.join(tmp_dir, f"synthetic.{name}")
+            start = time.perf_counter()
+            write(graph, output)
+            write_seconds = time.perf_counter() - start
+            start = time.perf_counter()
+            loaded = read(output)
+            read_seconds = time.perf_counter() - start
+            size = os.path.getsize(output)
+            print(
+                f"{name}: write {write_seconds:.2f} s, read {read_seconds:.2f} s, "
+                f"{size / 2**20:.1f} MiB, {len(loaded):,} nodes"
+            )
+
+
+if __name__ == "__main__":
+    main()
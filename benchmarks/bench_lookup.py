@@ -0,0 +1,53 @@
+"""
+Compare looking up single terms with get_term, using a sidecar stanza index,
+against parsing the whole ontology with read_obo.
+
+Usage: python -m benchmarks.bench_lookup [n_terms]
+"""
+
+from __future__ import annotations
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+import obonet
+from obonet.lookup import build_stanza_index, get_term
+
+from .synthetic import write_synthetic_obo
+
+
+def main() -> None:
+    n_terms = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "synthetic.obo")
+        with open(path, "w", encoding="utf-8") as write_file:
+            write_synthetic_obo(write_file, n_terms)
+        print(f"{n_terms:,} terms")
+
+        start = time.perf_counter()
+        graph = obonet.read_obo(path)
+        print(f"read_obo: {time.perf_counter() - start:.2f} s")
+
+        start = time.perf_counter()
+        n_stanzas = build_stanza_index(path, path + ".obonet-index")
+        seconds = time.perf_counter() - start
+        index_bytes = os.path.getsize(path + ".obonet-index")
+        print(
+            f"build_stanza_index: {seconds:.2f} s, {n_stanzas:,} stanzas, "
+            f"{index_bytes / 2**20:.1f} MiB sidecar"
+        )
+
+        terms = [node for node, data in graph.nodes(data=True) if data]
+        term_ids = random.Random(0).sample(terms, 1_000)
+        start = time.perf_counter()
+        for term_id in term_ids:
+            assert get_term(path, term_id) == graph.nodes[term_id]
+        seconds = time.perf_counter() - start
+        print(f"get_term: {seconds / len(term_ids) * 1000:.3f} ms per term")
+
+
+if __name__ == "__main__":
+    main()
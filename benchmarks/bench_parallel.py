@@ -0,0 +1,40 @@
+"""
+Benchmark read_obo with different numbers of worker processes.
+
+Usage: python -m benchmarks.bench_parallel [n_terms]
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+import time
+
+import obonet
+
+from .synthetic import write_synthetic_obo
+
+
+def main() -> None:
+    n_terms = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "synthetic.obo")
+        with open(path, "w", encoding="utf-8") as write_file:
+            write_synthetic_obo(write_file, n_terms)
+        size_mb = os.path.getsize(path) / 2**20
+        print(f"{n_terms:,} terms, {size_mb:.1f} MiB, {os.cpu_count()} CPUs")
+        baseline = None
+        for workers in [1, 2, 4, 8]:
+            start = time.perf_counter()
+            graph = obonet.read_obo(path, workers=workers)
+            seconds = time.perf_counter() - start
+            baseline = baseline or seconds
+            print(
+                f"workers={workers}: {seconds:.2f} s, "
+                f"speedup {baseline / seconds:.2f}x, {len(graph):,} nodes"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Compare exact, prefix and fuzzy queries of a search index against scanning
+the names and synonyms of every node, as an autocomplete endpoint without
+an index would. Fuzzy queries are names with one character deleted, for
+which the share of queries that find the original name is reported.
+
+Usage: python -m benchmarks.bench_search [n_terms]
+"""
+
+from __future__ import annotations
+
+import os
+import random
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from typing import Any
+
+import obonet
+from obonet.search import SearchIndex, fold_text, parse_synonym
+
+from .synthetic import write_synthetic_obo
+
+
+def scan_prefix(graph: Any, query: str) -> list[str]:
+    folded = fold_text(query)
+    return [
+        node
+        for node, data in graph.nodes(data=True)
+        if fold_text(data.get("name", "")).startswith(folded)
+        or any(
+            fold_text(parse_synonym(value)[0]).startswith(folded)
+            for value in data.get("synonym", [])
+        )
+    ]
+
+
+def time_queries(
+    label: str, function: Callable[[str], Any], queries: list[str]
+) -> None:
+    start = time.perf_counter()
+    for query in queries:
+        function(query)
+    seconds = (time.perf_counter() - start) / len(queries)
+    print(f"{label}: {seconds * 1000:.3f} ms per query")
+
+
+def main() -> None:
+    n_terms = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "synthetic.obo")
+        with open(path, "w", encoding="utf-8") as write_file:
+            write_synthetic_obo(write_file, n_terms)
+        print(f"{n_terms:,} terms")
+
+        start = time.perf_counter()
+        obonet.read_obo(path)
+        print(f"read_obo: {time.perf_counter() - start:.2f} s")
+        start = time.perf_counter()
+        graph = obonet.read_obo(path, search_index=True)
+        print(f"read_obo(search_index=True): {time.perf_counter() - start:.2f} s")
+        index: SearchIndex = graph.graph["search_index"]
+        print(f"{len(index):,} texts, {len(index.postings):,} n-grams")
+
+        rng = random.Random(0)
+        names = [data["name"] for _, data in graph.nodes(data=True) if data]
+        sample = rng.sample(names, 1_000)
+        # prefixes as typed into an autocomplete box
+        prefixes = [name[: rng.randint(11, len(name))].upper() for name in sample]
+        # names with one character deleted
+        typos = []
+        for name in sample:
+            position = rng.randrange(len(name))
+            typos.append(name[:position] + name[position + 1 :])
+
+        index.prefix("")  # sort the texts before timing prefix queries
+        time_queries("exact", index.exact, sample)
+        time_queries("prefix", index.prefix, prefixes)
+        time_queries("fuzzy", index.fuzzy, typos)
+        found = sum(
+            any(match.text == name for _, match in index.fuzzy(typo, limit=5))
+            for name, typo in zip(sample, typos, strict=True)
+        )
+        print(f"fuzzy: misspelled name among 5 best matches for {found / 10:.1f}%")
+        time_queries("search", index.search, prefixes)
+        time_queries(
+            "scan prefix", lambda query: scan_prefix(graph, query), prefixes[:5]
+        )
+
+
+if __name__ == "__main__":
+    main()
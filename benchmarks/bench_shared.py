@@ -0,0 +1,75 @@
+"""
+Compare the time and memory of attaching to a SharedOntology in worker
+processes against reading the ontology with read_obo in each worker,
+measured with tracemalloc in the workers.
+
+Usage: python -m benchmarks.bench_shared [n_terms] [n_workers]
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+
+import obonet
+from obonet.shared import SharedOntology, share_obo
+
+from .synthetic import write_synthetic_obo
+
+
+def attach(name: str) -> tuple[float, int]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    ontology = SharedOntology.attach(name)
+    seconds = time.perf_counter() - start
+    ontology.node_data(ontology.node(0))
+    ontology.successors(ontology.node(0), "is_a")
+    current, _ = tracemalloc.get_traced_memory()
+    ontology.close()
+    return seconds, current
+
+
+def read(path: str) -> tuple[float, int]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    graph = obonet.read_obo(path)
+    seconds = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    del graph
+    return seconds, current
+
+
+def main() -> None:
+    n_terms = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    n_workers = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "synthetic.obo")
+        with open(path, "w", encoding="utf-8") as write_file:
+            write_synthetic_obo(write_file, n_terms)
+        print(f"{n_terms:,} terms, {n_workers} workers")
+        start = time.perf_counter()
+        ontology = share_obo(path)
+        seconds = time.perf_counter() - start
+        size = ontology._source.size
+        print(f"share_obo: {seconds:.2f} s, {size / 2**20:.1f} MiB shared memory")
+        try:
+            with ProcessPoolExecutor(max_workers=n_workers) as executor:
+                for function, argument in (attach, ontology.location[1]), (read, path):
+                    results = list(executor.map(function, [argument] * n_workers))
+                    seconds = max(seconds for seconds, _ in results)
+                    total = sum(current for _, current in results)
+                    print(
+                        f"{function.__name__} in each worker: {seconds:.4f} s, "
+                        f"{total / 2**20:.1f} MiB retained by all workers"
+                    )
+        finally:
+            ontology.close()
+            ontology.unlink()
+
+
+if __name__ == "__main__":
+    main()
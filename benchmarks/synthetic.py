@@ -0,0 +1,51 @@
+"""
+Generate synthetic OBO ontologies for benchmarks.
+"""
+
+from __future__ import annotations
+
+import random
+from typing import TextIO
+
+namespaces = ["biological_process", "molecular_function", "cellular_component"]
+
+
+def write_synthetic_obo(write_file: TextIO, n_terms: int, seed: int = 0) -> None:
+    """
+    Write a synthetic ontology with n_terms terms to write_file. Each term
+    has is_a edges to one or two earlier terms, and some terms have part_of
+    relationships, synonyms, xrefs with trailing modifiers and comments.
+    """
+    rng = random.Random(seed)
+    write_file.write(
+        "format-version: 1.2\n"
+        "data-version: synthetic\n"
+        "ontology: synthetic\n"
+        'subsetdef: slim "Synthetic slim"\n'
+        "\n"
+    )
+    for i in range(n_terms):
+        term_id = f"SYN:{i:07d}"
+        lines = [
+            "[Term]",
+            f"id: {term_id}",
+            f"name: synthetic term {i}",
+            f"namespace: {namespaces[i % len(namespaces)]}",
+            f'def: "Definition of synthetic term {i}." [PMID:{i}]',
+        ]
+        if i % 5 == 0:
+            lines.append(f"alt_id: SYN:{i + n_terms:07d}")
+        if i % 10 == 0:
+            lines.append("subset: slim")
+        lines.append(f'synonym: "term {i}" EXACT []')
+        lines.append(f'xref: EXT:{i} {{source="synthetic"}} ! external {i}')
+        if i:
+            for parent in sorted({rng.randrange(i) for _ in range(rng.randint(1, 2))}):
+                lines.append(f"is_a: SYN:{parent:07d} ! synthetic term {parent}")
+            if i % 4 == 0:
+                part = rng.randrange(i)
+                lines.append(f"relationship: part_of SYN:{part:07d}")
+        if i % 50 == 49:
+            lines.append("is_obsolete: true")
+        write_file.write("\n".join(lines) + "\n\n")
+    write_file.write("[Typedef]\nid: part_of\nname: part of\nis_transitive: true\n")
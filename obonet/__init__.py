@@ -1,19 +1,35 @@
 from __future__ import annotations
 
-from importlib.metadata import PackageNotFoundError, version
+import functools
+from typing import Any
 
-from .read import read_obo
+from .binary import read_binary, write_binary
+from .read import Stanza, iter_stanzas, read_obo
+from .update import GraphChanges, update_graph
 
 __all__ = [
+    "GraphChanges",
+    "Stanza",
+    "iter_stanzas",
+    "read_binary",
     "read_obo",
+    "update_graph",
+    "write_binary",
 ]
 
 
+@functools.cache
 def _get_version() -> str | None:
+    from importlib.metadata import PackageNotFoundError, version
+
     try:
         return version("obonet")
     except PackageNotFoundError:
         return None
 
 
-__version__ = _get_version()
+def __getattr__(name: str) -> Any:
+    # importlib.metadata is slow to import, so look up the version on access
+    if name == "__version__":
+        return _get_version()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
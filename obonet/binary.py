@@ -0,0 +1,118 @@
+"""
+Compact binary serialization of graphs returned by read_obo.
+
+write_binary stores the graph attributes, nodes with their attributes and
+edges as integer node indices in a single marshal payload preceded by a
+magic header, which read_binary loads many times faster than node-link
+JSON. Attributes must consist of built-in types such as str, list, tuple
+and dict, which excludes closure and id indexes. Like the marshal module,
+read_binary is not secure against maliciously constructed data, so only
+load files from trusted sources. Files can be read by the Python version
+that wrote them and newer versions.
+"""
+
+from __future__ import annotations
+
+import marshal
+import os
+from collections.abc import Callable
+from typing import IO, TYPE_CHECKING, Any, cast
+
+from .io import get_opener, open_write_file
+from .read import add_edge_keys, add_node_data, paused_gc, plain_clauses
+
+if TYPE_CHECKING:
+    import networkx
+
+magic = b"OBONET-BINARY\n"
+
+# Increment when the layout of the payload changes
+binary_format_version = 1
+
+BinaryPathType = str | os.PathLike[str] | IO[bytes]
+
+
+def write_binary(
+    graph: networkx.MultiDiGraph[str], path_or_file: BinaryPathType
+) -> None:
+    """
+    Write graph in the obonet binary format to a path or a file object
+    opened in binary mode. Paths are compressed based on their extension.
+    """
+    nodes = list(graph)
+    node_to_index = {node: i for i, node in enumerate(nodes)}
+    sources, targets, keys, edge_data = [], [], [], []
+    for source, target, key, data in graph.edges(keys=True, data=True):
+        sources.append(node_to_index[source])
+        targets.append(node_to_index[target])
+        keys.append(key)
+        edge_data.append(dict(data))
+    payload = {
+        "graph": plain_clauses(dict(graph.graph)),
+        "nodes": nodes,
+        "node_data": [plain_clauses(dict(data)) for data in graph._node.values()],
+        "sources": sources,
+        "targets": targets,
+        "keys": keys,
+        # edges of graphs from read_obo have no attributes
+        "edge_data": edge_data if any(edge_data) else None,
+    }
+    content = magic + bytes([binary_format_version]) + marshal.dumps(payload)
+    if isinstance(path_or_file, (str, os.PathLike)):
+        with open_write_file(path_or_file, "wb") as write_file:
+            write_file.write(content)
+    else:
+        path_or_file.write(content)
+
+
+def read_binary(path_or_file: BinaryPathType) -> networkx.MultiDiGraph[str]:
+    """
+    Return the networkx.MultiDiGraph stored in the obonet binary format
+    by write_binary at a path or in a file object opened in binary mode.
+    Compressed paths are decompressed based on their extension.
+    """
+    if isinstance(path_or_file, (str, os.PathLike)):
+        path = os.fspath(path_or_file)
+        opener = cast(Callable[..., IO[bytes]], get_opener(path))
+        with opener(path, "rb") as read_file:
+            content = read_file.read()
+    else:
+        content = path_or_file.read()
+    header_size = len(magic) + 1
+    if content[: len(magic)] != magic:
+        raise ValueError("not a file in the obonet binary format")
+    version = content[len(magic)]
+    if version != binary_format_version:
+        message = (
+            f"unsupported obonet binary format version {version}, "
+            f"expected {binary_format_version}"
+        )
+        raise ValueError(message)
+    with paused_gc():
+        payload: dict[str, Any] = marshal.loads(memoryview(content)[header_size:])
+        del content
+        return build_graph_from_payload(payload)
+
+
+def build_graph_from_payload(payload: dict[str, Any]) -> networkx.MultiDiGraph[str]:
+    import networkx
+
+    graph = networkx.MultiDiGraph()
+    graph.graph.update(payload["graph"])
+    nodes = payload["nodes"]
+    for node, data in zip(nodes, payload["node_data"], strict=True):
+        add_node_data(graph, node, data)
+    edge_tuples = zip(
+        [nodes[i] for i in payload["sources"]],
+        [nodes[i] for i in payload["targets"]],
+        payload["keys"],
+        strict=True,
+    )
+    if payload["edge_data"] is None:
+        add_edge_keys(graph, edge_tuples)
+        return graph
+    for (source, target, key), data in zip(
+        edge_tuples, payload["edge_data"], strict=True
+    ):
+        graph.add_edge(source, target, key=key, **data)
+    return graph
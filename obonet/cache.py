@@ -0,0 +1,231 @@
+"""
+Persistent cache of graphs parsed by read_obo.
+
+Cache entries are pickle files, so only use cache directories that are not
+writable by untrusted users.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import pickle
+import tempfile
+from dataclasses import dataclass
+from http.client import HTTPException
+from typing import Any
+from urllib.request import Request, urlopen
+
+from .io import USER_AGENT, PathType, is_regular_file, is_url
+from .read import paused_gc
+
+logger = logging.getLogger(__name__)
+
+# Increment when the layout of cache entries or parsed graphs changes,
+# so that entries written by other versions are ignored.
+cache_format_version = 1
+
+# Least recently used entries are evicted once the total size of a cache
+# directory exceeds this many bytes.
+max_cache_bytes = 2**30
+
+cache_suffix = ".obonet-cache"
+
+
+@dataclass
+class CacheEntry:
+    """
+    Location and validators of the cache entry for a single source and set
+    of parsing options. For local paths, validators are the file size and
+    modification time. For URLs, validators are the ETag and Last-Modified
+    response headers.
+    """
+
+    cache_path: str
+    source: str
+    validators: dict[str, Any]
+    is_local: bool
+
+    def load(self) -> Any | None:
+        """
+        Return the cached graph, or None when the entry does not exist or
+        the source has changed since the entry was stored.
+        """
+        try:
+            with open(self.cache_path, "rb") as read_file:
+                metadata = pickle.load(read_file)
+                if not self._is_valid(metadata):
+                    return None
+                with paused_gc():
+                    graph = pickle.load(read_file)
+        except FileNotFoundError:
+            return None
+        except (OSError, EOFError, pickle.UnpicklingError) as error:
+            logger.warning(
+                f"ignoring unreadable cache entry {self.cache_path}: {error}"
+            )
+            return None
+        # update the modification time for least recently used eviction
+        os.utime(self.cache_path)
+        logger.info(f"loaded {self.source} from cache entry {self.cache_path}")
+        return graph
+
+    def store(self, graph: Any) -> None:
+        """
+        Write graph to the cache entry, replacing any existing entry, and
+        evict old entries if the cache exceeds max_cache_bytes.
+        """
+        metadata = {
+            "version": cache_format_version,
+            "source": self.source,
+            "validators": self.validators,
+        }
+        if self.is_local:
+            stat = os.stat(self.source)
+            if {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns} != self.validators:
+                logger.info(f"not caching {self.source}: changed while reading")
+                return
+            metadata["sha256"] = hash_file(self.source)
+        cache_dir = os.path.dirname(self.cache_path)
+        os.makedirs(cache_dir, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            dir=cache_dir, suffix=".tmp", delete=False
+        ) as write_file:
+            pickle.dump(metadata, write_file, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(graph, write_file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(write_file.name, self.cache_path)
+        prune_cache(cache_dir)
+
+    def _is_valid(self, metadata: dict[str, Any]) -> bool:
+        if metadata.get("version") != cache_format_version:
+            return False
+        if metadata.get("source") != self.source:
+            return False
+        if metadata["validators"] == self.validators:
+            return True
+        # The modification time can change without the content changing,
+        # for example after copying or checking out a file.
+        if (
+            self.is_local
+            and metadata["validators"]["size"] == self.validators["size"]
+            and metadata.get("sha256") == hash_file(self.source)
+        ):
+            return True
+        return False
+
+
+def get_cache_entry(
+    cache_dir: str | os.PathLike[str],
+    path_or_file: PathType,
+    options: dict[str, Any],
+) -> CacheEntry | None:
+    """
+    Return the cache entry for path_or_file parsed with options, or None
+    when the source cannot be cached: open file objects, paths that are not
+    regular files, such as pipes, and URLs whose HEAD request fails or
+    whose response has neither an ETag nor a Last-Modified header.
+    """
+    if isinstance(path_or_file, os.PathLike):
+        path_or_file = os.fspath(path_or_file)
+    if not isinstance(path_or_file, str):
+        return None
+    validators: dict[str, Any] | None
+    if is_url(path_or_file):
+        source = path_or_file
+        validators = get_url_validators(source)
+        if validators is None:
+            return None
+        if not any(validators.values()):
+            logger.info(f"not caching {source}: no ETag or Last-Modified header")
+            return None
+        is_local = False
+    else:
+        source = os.path.abspath(path_or_file)
+        if not is_regular_file(source):
+            logger.info(f"not caching {source}: not a regular file")
+            return None
+        stat = os.stat(source)
+        validators = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+        is_local = True
+    # collections of tags are keyed independently of their order
+    key = json.dumps([source, options], sort_keys=True, default=sorted)
+    digest = hashlib.sha256(key.encode("utf-8")).hexdigest()[:32]
+    cache_path = os.path.join(os.fspath(cache_dir), digest + cache_suffix)
+    return CacheEntry(cache_path, source, validators, is_local)
+
+
+def load_cache_entry(
+    cache_dir: str | os.PathLike[str],
+    path_or_file: PathType,
+    options: dict[str, Any],
+) -> tuple[CacheEntry | None, Any | None]:
+    """
+    Return the cache entry for path_or_file parsed with options and the
+    graph it contains. Either is None when the source cannot be cached or
+    the cache holds no valid graph for it.
+    """
+    cache_entry = get_cache_entry(cache_dir, path_or_file, options)
+    if cache_entry is None:
+        return None, None
+    return cache_entry, cache_entry.load()
+
+
+def get_url_validators(url: str) -> dict[str, str | None] | None:
+    """
+    Return the ETag and Last-Modified headers of a HEAD request to url, or
+    None when the request fails, such as for servers that reject HEAD.
+    """
+    request = Request(url, method="HEAD", headers={"User-Agent": USER_AGENT})
+    try:
+        with urlopen(request) as response:
+            return {
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+            }
+    # HTTPError and URLError are subclasses of OSError
+    except (OSError, HTTPException) as error:
+        logger.info(f"not caching {url}: HEAD request failed: {error}")
+        return None
+
+
+def hash_file(path: str) -> str:
+    """
+    Return the SHA-256 hexdigest of the file at path.
+    """
+    sha256 = hashlib.sha256()
+    with open(path, "rb") as read_file:
+        for block in iter(lambda: read_file.read(2**20), b""):
+            sha256.update(block)
+    return sha256.hexdigest()
+
+
+def prune_cache(
+    cache_dir: str | os.PathLike[str], max_bytes: int | None = None
+) -> list[str]:
+    """
+    Delete least recently used entries from cache_dir until their total
+    size is at most max_bytes (default max_cache_bytes).
+    Returns the paths of deleted entries.
+    """
+    if max_bytes is None:
+        max_bytes = max_cache_bytes
+    entries = []
+    with os.scandir(cache_dir) as scan:
+        for dir_entry in scan:
+            if dir_entry.name.endswith(cache_suffix) and dir_entry.is_file():
+                stat = dir_entry.stat()
+                entries.append((stat.st_mtime_ns, stat.st_size, dir_entry.path))
+    total_bytes = sum(size for _, size, _ in entries)
+    deleted = []
+    for _, size, path in sorted(entries):
+        if total_bytes <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total_bytes -= size
+        deleted.append(path)
+    return deleted
@@ -1,25 +1,71 @@
 from __future__ import annotations
 
 import argparse
+import contextlib
 import json
+import os
 import sys
-from collections.abc import Sequence
+import time
+import urllib.parse
+from collections.abc import Iterable, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import IO, TYPE_CHECKING, Any
 
-from networkx.readwrite import json_graph
+from .binary import write_binary
+from .filter import filter_obo
+from .io import is_url, open_write_file
+from .profile import ReadStats
+from .read import Clauses, read_obo
 
-from . import __version__
-from .read import read_obo
+if TYPE_CHECKING:
+    import networkx
 
 
 def get_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         prog="obonet",
-        description="Convert an OBO ontology to NetworkX node-link JSON.",
+        description="Convert OBO ontologies to NetworkX node-link JSON.",
+        epilog='Run "obonet filter --help" to write a subset of an OBO file '
+        "without converting it.",
+    )
+    parser.add_argument(
+        "path",
+        nargs="*",
+        help="Paths or URLs to OBO files. Multiple paths are converted to "
+        "files in --output-dir.",
+    )
+    parser.add_argument(
+        "--manifest",
+        help="File listing paths or URLs to convert, one per line, in addition "
+        "to path. Blank lines and lines starting with # are ignored.",
     )
-    parser.add_argument("path", help="Path or URL to an OBO file.")
     parser.add_argument(
         "--output",
-        help="Write JSON to this path instead of stdout.",
+        help="Write output to this path instead of stdout. Output is compressed "
+        "when the path ends with .gz, .bz2 or .xz.",
+    )
+    parser.add_argument(
+        "--output-dir",
+        help="Convert each path to a file in this directory, named after the "
+        "path with an extension for the format, and print a summary of each "
+        "conversion to stderr. Required for multiple paths.",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of files to convert concurrently in separate processes "
+        "with --output-dir.",
+    )
+    parser.add_argument(
+        "--format",
+        choices=["json", "ndjson", "binary"],
+        default="json",
+        help="Output format: node-link JSON (default), newline-delimited JSON "
+        "with a record per line for the graph, each node and each link, or the "
+        "obonet binary format, which obonet.read_binary loads quickly.",
     )
     parser.add_argument(
         "--include-clauses",
@@ -31,39 +77,457 @@ def get_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Include terms marked is_obsolete.",
     )
+    parser.add_argument(
+        "--resolve-imports",
+        action="store_true",
+        help="Also read the ontologies listed by import header tags, recursively, "
+        "and merge their terms into the graph.",
+    )
+    parser.add_argument(
+        "--tags",
+        type=split_tags,
+        help="Comma-separated tags to parse from stanzas, such as "
+        "id,name,namespace,is_a,relationship. Other tags are skipped.",
+    )
+    parser.add_argument(
+        "--exclude-tags",
+        type=split_tags,
+        help="Comma-separated tags to skip, such as def,synonym,xref.",
+    )
     parser.add_argument(
         "--indent",
         type=int,
         default=2,
-        help="Number of spaces for JSON indentation.",
+        help="Number of spaces for JSON indentation (json format only).",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print timing and size statistics of reading the ontology to stderr. "
+        "Not supported with --output-dir.",
     )
     parser.add_argument(
         "--version",
-        action="version",
-        version=f"obonet {__version__ or 'unknown'}",
+        action=VersionAction,
+        help="Show the version of obonet and exit.",
+    )
+    return parser
+
+
+def get_filter_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="obonet filter",
+        description="Write the header, Typedef and Instance stanzas and the "
+        "matching Term stanzas of an OBO file, without building a graph. "
+        "Stanzas are written as read.",
+    )
+    parser.add_argument("path", help="Path or URL to an OBO file.")
+    parser.add_argument(
+        "--output",
+        help="Write output to this path instead of stdout. Output is compressed "
+        "when the path ends with .gz, .bz2 or .xz.",
+    )
+    parser.add_argument(
+        "--namespace",
+        action="append",
+        dest="namespaces",
+        help="Keep terms in this namespace. Repeat to keep several namespaces.",
+    )
+    parser.add_argument(
+        "--subset",
+        action="append",
+        dest="subsets",
+        help="Keep terms in this subset, such as goslim_generic. Repeat to keep "
+        "terms in any of several subsets.",
+    )
+    parser.add_argument(
+        "--id-prefix",
+        action="append",
+        dest="id_prefixes",
+        help="Keep terms whose id starts with this prefix, such as GO:. Repeat "
+        "to keep several prefixes.",
+    )
+    parser.add_argument(
+        "--include-obsolete",
+        action="store_true",
+        help="Keep terms marked is_obsolete.",
     )
     return parser
 
 
-def write_json(data: object, output: str | None, indent: int) -> None:
-    text = json.dumps(data, ensure_ascii=False, indent=indent) + "\n"
+class VersionAction(argparse.Action):
+    """
+    Print the version and exit, like action="version", but only look up the
+    version when the option is given, since importlib.metadata is slow to
+    import.
+    """
+
+    def __init__(self, option_strings: list[str], dest: str, **kwargs: Any) -> None:
+        super().__init__(option_strings, dest, nargs=0, **kwargs)
+
+    def __call__(self, parser: argparse.ArgumentParser, *args: Any) -> None:
+        from . import __version__
+
+        print(f"obonet {__version__ or 'unknown'}")
+        parser.exit()
+
+
+def split_tags(text: str) -> list[str]:
+    return [tag.strip() for tag in text.split(",") if tag.strip()]
+
+
+def write_node_link(
+    graph: networkx.MultiDiGraph[str], write_file: IO[str], indent: int | None
+) -> None:
+    """
+    Write graph as node-link JSON, identical to serializing
+    json_graph.node_link_data(graph) with json.dumps, using json_default for
+    clauses, followed by a newline, but without building the node-link data
+    or the serialized string.
+    Each node and link is serialized and written separately.
+    """
+    import networkx
+    from networkx.readwrite import json_graph
+
+    # node-link key names differ between networkx versions
+    *_, nodes_key, links_key = json_graph.node_link_data(networkx.MultiDiGraph())
+    nodes = ({**data, "id": node} for node, data in graph.nodes(data=True))
+    links = (
+        {**data, "source": source, "target": target, "key": key}
+        for source, target, key, data in graph.edges(keys=True, data=True)
+    )
+    members = {
+        "directed": graph.is_directed(),
+        "multigraph": graph.is_multigraph(),
+        "graph": graph.graph,
+        nodes_key: nodes,
+        links_key: links,
+    }
+    separator = ", " if indent is None else ","
+
+    def line(level: int) -> str:
+        return "" if indent is None else "\n" + " " * indent * level
+
+    def dumps(value: Any, level: int) -> str:
+        text = json.dumps(
+            value, ensure_ascii=False, indent=indent, default=json_default
+        )
+        return text.replace("\n", line(level))
+
+    write_file.write("{")
+    for i, (name, value) in enumerate(members.items()):
+        write_file.write((separator if i else "") + line(1) + json.dumps(name) + ": ")
+        if isinstance(value, (bool, dict)):
+            write_file.write(dumps(value, level=1))
+            continue
+        write_file.write("[")
+        n_items = 0
+        for item in value:
+            write_file.write((separator if n_items else "") + line(2))
+            write_file.write(dumps(item, level=2))
+            n_items += 1
+        write_file.write(line(1) + "]" if n_items else "]")
+    write_file.write(line(0) + "}\n")
+
+
+def write_ndjson(graph: networkx.MultiDiGraph[str], write_file: IO[str]) -> None:
+    """
+    Write graph as newline-delimited JSON: a record with the graph
+    attributes, then a record per node and per link, each written as soon as
+    it is serialized.
+    """
+    header = {"directed": True, "multigraph": True, "graph": graph.graph}
+    write_file.write(dumps_line(header))
+    for node, data in graph.nodes(data=True):
+        write_file.write(dumps_line({"node": {**data, "id": node}}))
+    for source, target, key, data in graph.edges(keys=True, data=True):
+        link = {**data, "source": source, "target": target, "key": key}
+        write_file.write(dumps_line({"link": link}))
+
+
+def dumps_line(record: Any) -> str:
+    text = json.dumps(
+        record, ensure_ascii=False, separators=(",", ":"), default=json_default
+    )
+    return text + "\n"
+
+
+def json_default(value: Any) -> Any:
+    """
+    Serialize the lazily parsed "_clauses" of include_clauses as dicts.
+    """
+    if isinstance(value, Clauses):
+        return dict(value)
+    message = f"Object of type {type(value).__name__} is not JSON serializable"
+    raise TypeError(message)
+
+
+def write_output(
+    graph: networkx.MultiDiGraph[str],
+    output: str | None,
+    output_format: str,
+    indent: int,
+) -> None:
+    """
+    Write graph to output, or to stdout when output is None, in
+    output_format. Output paths are compressed based on their extension.
+    """
+    binary = output_format == "binary"
+    write_file: IO[Any]
     if output is None:
-        sys.stdout.write(text)
+        write_file = sys.stdout.buffer if binary else sys.stdout
+        write_format(graph, write_file, output_format, indent)
         return
+    mode, encoding = ("wb", None) if binary else ("wt", "utf-8")
+    with open_write_file(output, mode, encoding=encoding) as write_file:
+        write_format(graph, write_file, output_format, indent)
+
+
+def write_format(
+    graph: networkx.MultiDiGraph[str],
+    write_file: IO[Any],
+    output_format: str,
+    indent: int,
+) -> None:
+    if output_format == "json":
+        write_node_link(graph, write_file, indent=indent)
+    elif output_format == "ndjson":
+        write_ndjson(graph, write_file)
+    else:
+        write_binary(graph, write_file)
+
+
+# file extension of each output format
+format_extensions = {"json": ".json", "ndjson": ".ndjson", "binary": ".obonet"}
+
+
+@dataclass
+class ConversionResult:
+    """
+    Outcome of converting a single path with --output-dir. error describes
+    the exception that caused the conversion to fail, or is None.
+    """
+
+    path: str
+    output: str
+    seconds: float
+    nodes: int | None = None
+    edges: int | None = None
+    error: str | None = None
 
-    with open(output, "w", encoding="utf-8") as write_file:
-        write_file.write(text)
+    def summary(self) -> str:
+        if self.error is not None:
+            return f"{self.path}: failed after {self.seconds:.2f} s: {self.error}"
+        return (
+            f"{self.path}: {self.nodes:,} nodes, {self.edges:,} edges, "
+            f"{self.seconds:.2f} s -> {self.output}"
+        )
+
+
+def convert_file(
+    path: str,
+    output: str,
+    output_format: str = "json",
+    indent: int = 2,
+    **read_options: Any,
+) -> ConversionResult:
+    """
+    Read path with read_obo(path, **read_options) and write the graph to
+    output. Exceptions are caught and reported in the result, and partially
+    written output is removed.
+    """
+    start = time.perf_counter()
+    try:
+        graph = read_obo(path, **read_options)
+        try:
+            write_output(graph, output, output_format, indent)
+        except BaseException:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(output)
+            raise
+    except Exception as error:
+        seconds = time.perf_counter() - start
+        return ConversionResult(path, output, seconds, error=repr(error))
+    seconds = time.perf_counter() - start
+    nodes, edges = graph.number_of_nodes(), graph.number_of_edges()
+    return ConversionResult(path, output, seconds, nodes=nodes, edges=edges)
+
+
+def convert_files(
+    paths: Iterable[str],
+    output_dir: str,
+    jobs: int = 1,
+    output_format: str = "json",
+    indent: int = 2,
+    **read_options: Any,
+) -> list[ConversionResult]:
+    """
+    Convert each of paths to a file in output_dir, using a pool of jobs
+    processes when jobs is greater than 1. Results are returned in the
+    order of paths, including failed conversions.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    tasks = [
+        (path, os.path.join(output_dir, get_output_name(path, output_format)))
+        for path in paths
+    ]
+    options = {"output_format": output_format, "indent": indent, **read_options}
+    if jobs <= 1:
+        return [convert_file(path, output, **options) for path, output in tasks]
+    # A worker that is killed, such as by the out-of-memory killer, breaks
+    # the pool and fails every pending conversion, so those are retried one
+    # at a time in a process of their own.
+    results = []
+    for task, result in zip(tasks, convert_in_pool(tasks, jobs, options), strict=True):
+        if result is None:
+            result = convert_in_process(*task, **options)
+        results.append(result)
+    return results
+
+
+def convert_in_pool(
+    tasks: Sequence[tuple[str, str]], jobs: int, options: dict[str, Any]
+) -> list[ConversionResult | None]:
+    """
+    Run convert_file(path, output, **options) for each (path, output) of
+    tasks in a pool of jobs processes. Returns the results in the order of
+    tasks, with None for conversions that did not finish because a worker
+    process was terminated.
+    """
+    results: list[ConversionResult | None] = []
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = [
+            executor.submit(convert_file, path, output, **options)
+            for path, output in tasks
+        ]
+        for future in futures:
+            try:
+                results.append(future.result())
+            except BrokenProcessPool:
+                results.append(None)
+    return results
+
+
+def convert_in_process(path: str, output: str, **options: Any) -> ConversionResult:
+    """
+    Run convert_file in a separate process, and return a failed result
+    when the process is terminated.
+    """
+    start = time.perf_counter()
+    (result,) = convert_in_pool([(path, output)], 1, options)
+    if result is None:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(output)
+        seconds = time.perf_counter() - start
+        error = "worker process was terminated abruptly"
+        result = ConversionResult(path, output, seconds, error=error)
+    return result
+
+
+def get_output_name(path: str, output_format: str) -> str:
+    """
+    Return the output file name for path: its base name without .obo and
+    compression extensions, followed by the extension of output_format.
+    """
+    if is_url(path):
+        path = urllib.parse.urlparse(path).path
+    name = os.path.basename(path)
+    root, extension = os.path.splitext(name)
+    if extension in {".gz", ".bz2", ".xz"}:
+        name = root
+        root, extension = os.path.splitext(name)
+    if extension == ".obo":
+        name = root
+    return name + format_extensions[output_format]
+
+
+def read_manifest(path: str) -> list[str]:
+    """
+    Return the paths listed in a manifest file, skipping blank lines and
+    comments.
+    """
+    with open(path, encoding="utf-8") as read_file:
+        lines = [line.strip() for line in read_file]
+    return [line for line in lines if line and not line.startswith("#")]
 
 
 def main(argv: Sequence[str] | None = None) -> None:
-    args = get_parser().parse_args(argv)
-    graph = read_obo(
+    if argv is None:
+        argv = sys.argv[1:]
+    if argv and argv[0] == "filter":
+        filter_main(argv[1:])
+        return
+    parser = get_parser()
+    args = parser.parse_args(argv)
+    paths = list(args.path)
+    if args.manifest is not None:
+        paths.extend(read_manifest(args.manifest))
+    if not paths:
+        parser.error("no paths to convert")
+    read_options = {
+        "ignore_obsolete": not args.include_obsolete,
+        "include_clauses": args.include_clauses,
+        "include_tags": args.tags,
+        "exclude_tags": args.exclude_tags,
+        "resolve_imports": args.resolve_imports,
+    }
+    if args.output_dir is None and len(paths) == 1:
+        convert_single(args, paths[0], read_options)
+        return
+    check_batch_args(parser, args, paths)
+    results = convert_files(
+        paths,
+        args.output_dir,
+        jobs=args.jobs,
+        output_format=args.format,
+        indent=args.indent,
+        **read_options,
+    )
+    for result in results:
+        print(result.summary(), file=sys.stderr)
+    n_failed = sum(result.error is not None for result in results)
+    print(
+        f"converted {len(results) - n_failed} of {len(results)} files", file=sys.stderr
+    )
+    if n_failed:
+        sys.exit(1)
+
+
+def check_batch_args(
+    parser: argparse.ArgumentParser, args: argparse.Namespace, paths: list[str]
+) -> None:
+    """
+    Exit with a usage error when paths cannot be converted with --output-dir.
+    """
+    if args.output_dir is None:
+        parser.error("multiple paths require --output-dir")
+    if args.output is not None or args.profile:
+        parser.error("--output-dir cannot be used with --output or --profile")
+    names = [get_output_name(path, args.format) for path in paths]
+    if len(set(names)) < len(names):
+        parser.error("multiple paths would be written to the same output file")
+
+
+def filter_main(argv: Sequence[str]) -> None:
+    args = get_filter_parser().parse_args(argv)
+    filter_obo(
         args.path,
+        sys.stdout if args.output is None else args.output,
+        namespaces=args.namespaces,
+        subsets=args.subsets,
+        id_prefixes=args.id_prefixes,
         ignore_obsolete=not args.include_obsolete,
-        include_clauses=args.include_clauses,
     )
-    data = json_graph.node_link_data(graph)
-    write_json(data, args.output, indent=args.indent)
+
+
+def convert_single(
+    args: argparse.Namespace, path: str, read_options: dict[str, Any]
+) -> None:
+    stats = ReadStats() if args.profile else None
+    graph = read_obo(path, stats=stats, **read_options)
+    if stats is not None:
+        print(stats.summary(), file=sys.stderr)
+    write_output(graph, args.output, output_format=args.format, indent=args.indent)
 
 
 if __name__ == "__main__":
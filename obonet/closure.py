@@ -0,0 +1,232 @@
+"""
+Precomputed ancestor closure of a graph read by read_obo.
+
+A ClosureIndex stores the ancestors (superterms) of every node over a set of
+relations as sorted integer arrays in compressed sparse row (CSR) layout,
+so that ancestor lookups take time proportional to the number of ancestors
+and subsumption checks take logarithmic time, rather than requiring a
+traversal of the graph. ClosureIndex objects are picklable, such that an
+index stored in the graph attributes is serialized with the graph.
+"""
+
+from __future__ import annotations
+
+import bisect
+import graphlib
+from array import array
+from collections.abc import Collection, Iterable
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    import networkx
+
+# Relations that are always transitive, regardless of the typedefs
+transitive_relations = frozenset({"is_a"})
+
+
+class ClosureIndex:
+    """
+    Ancestors of every node over relations, where node order and integer
+    node indices follow the order of nodes in the graph. The ancestors of
+    the node with index i are ancestor_indices[offsets[i]:offsets[i + 1]],
+    in ascending order.
+
+    A node y is an ancestor of x when a path of edges with keys in relations
+    leads from x to y, such that every edge of a relation that is not
+    transitive is followed only by is_a edges or by edges of relations it is
+    transitive_over. Relations are transitive when they are is_a or their
+    typedef sets is_transitive to true.
+    """
+
+    def __init__(
+        self,
+        relations: tuple[str, ...],
+        nodes: list[str],
+        offsets: array[int],
+        ancestor_indices: array[int],
+    ) -> None:
+        self.relations = relations
+        self.nodes = nodes
+        self.offsets = offsets
+        self.ancestor_indices = ancestor_indices
+        self.node_to_index = {node: i for i, node in enumerate(nodes)}
+        self._descendants: tuple[array[int], array[int]] | None = None
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def __contains__(self, node: object) -> bool:
+        return node in self.node_to_index
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}(relations={self.relations!r}, "
+            f"nodes={len(self.nodes)}, ancestors={len(self.ancestor_indices)})"
+        )
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return ClosureIndex, (
+            self.relations,
+            self.nodes,
+            self.offsets,
+            self.ancestor_indices,
+        )
+
+    def ancestors(self, node: str) -> set[str]:
+        """
+        Return the ancestors (superterms) of node.
+        """
+        i = self.node_to_index[node]
+        indices = self.ancestor_indices[self.offsets[i] : self.offsets[i + 1]]
+        return {self.nodes[j] for j in indices}
+
+    def is_ancestor(self, node: str, ancestor: str) -> bool:
+        """
+        Return whether ancestor is an ancestor of node, i.e. whether node is
+        subsumed by ancestor. Nodes are not ancestors of themselves.
+        """
+        i = self.node_to_index[node]
+        j = self.node_to_index.get(ancestor)
+        if j is None:
+            return False
+        start, end = self.offsets[i], self.offsets[i + 1]
+        position = bisect.bisect_left(self.ancestor_indices, j, start, end)
+        return position < end and self.ancestor_indices[position] == j
+
+    def descendants(self, node: str) -> set[str]:
+        """
+        Return the descendants (subterms) of node. The inverse index is
+        built on the first call.
+        """
+        if self._descendants is None:
+            self._descendants = invert_csr(
+                self.offsets, self.ancestor_indices, len(self.nodes)
+            )
+        offsets, descendant_indices = self._descendants
+        i = self.node_to_index[node]
+        indices = descendant_indices[offsets[i] : offsets[i + 1]]
+        return {self.nodes[j] for j in indices}
+
+
+def get_closure_tags(relations: Iterable[str]) -> set[str]:
+    """
+    Return the tags that read_obo must parse to build the closure over
+    relations: is_a for is_a edges, and for other relations the relationship
+    tag of terms and the is_transitive and transitive_over tags of typedefs.
+    """
+    tags = set()
+    for relation in relations:
+        if relation == "is_a":
+            tags.add("is_a")
+        else:
+            tags.update(("relationship", "is_transitive", "transitive_over"))
+    return tags
+
+
+def build_closure(
+    graph: networkx.MultiDiGraph[str], relations: Iterable[str] = ("is_a",)
+) -> ClosureIndex:
+    """
+    Return a ClosureIndex of the ancestors of every node in graph over
+    relations, the keys of edges to follow, such as ("is_a", "part_of").
+    Transitivity is read from the typedefs graph attribute. Raises
+    graphlib.CycleError when the edges of relations contain a cycle.
+    """
+    relations = tuple(dict.fromkeys(relations))
+    typedefs = {
+        typedef["id"]: typedef
+        for typedef in graph.graph.get("typedefs", [])
+        if "id" in typedef
+    }
+    transitive = {
+        relation
+        for relation in relations
+        if relation in transitive_relations
+        or typedefs.get(relation, {}).get("is_transitive") == "true"
+    }
+    nodes = list(graph)
+    node_to_index = {node: i for i, node in enumerate(nodes)}
+    parents: list[list[tuple[int, str]]] = [[] for _ in nodes]
+    for source, target, key in graph.edges(keys=True):
+        if key in relations:
+            parents[node_to_index[source]].append((node_to_index[target], key))
+    sorter = graphlib.TopologicalSorter(
+        {
+            i: [parent for parent, _ in node_parents]
+            for i, node_parents in enumerate(parents)
+        }
+    )
+    # parents precede their children
+    order = list(sorter.static_order())
+
+    # relations that may follow each relation that is not transitive
+    followers = {
+        relation: frozenset(
+            {"is_a", *typedefs.get(relation, {}).get("transitive_over", [])}
+        ).intersection(relations)
+        for relation in relations
+        if relation not in transitive
+    }
+    follower_closures = {
+        keys: get_ancestor_sets(order, parents, keys)
+        for keys in set(followers.values())
+    }
+    ancestor_sets: list[set[int]] = [set() for _ in nodes]
+    for i in order:
+        ancestors = ancestor_sets[i]
+        for parent, key in parents[i]:
+            ancestors.add(parent)
+            if key in transitive:
+                ancestors |= ancestor_sets[parent]
+            else:
+                ancestors |= follower_closures[followers[key]][parent]
+    offsets, ancestor_indices = pack_csr(ancestor_sets)
+    return ClosureIndex(relations, nodes, offsets, ancestor_indices)
+
+
+def get_ancestor_sets(
+    order: list[int],
+    parents: list[list[tuple[int, str]]],
+    relations: Collection[str],
+) -> list[set[int]]:
+    """
+    Return the ancestors of each node over relations, treating all of
+    relations as transitive. order lists node indices such that parents
+    precede their children.
+    """
+    ancestor_sets: list[set[int]] = [set() for _ in parents]
+    for i in order:
+        ancestors = ancestor_sets[i]
+        for parent, key in parents[i]:
+            if key not in relations:
+                continue
+            ancestors.add(parent)
+            ancestors |= ancestor_sets[parent]
+    return ancestor_sets
+
+
+def pack_csr(sets: list[set[int]]) -> tuple[array[int], array[int]]:
+    """
+    Return (offsets, indices) arrays storing each set of integers in
+    ascending order.
+    """
+    offsets = array("q", [0])
+    indices = array("I")
+    for values in sets:
+        indices.extend(sorted(values))
+        offsets.append(len(indices))
+    return offsets, indices
+
+
+def invert_csr(
+    offsets: array[int], indices: array[int], n_rows: int
+) -> tuple[array[int], array[int]]:
+    """
+    Return the CSR arrays of the transpose of the n_rows by n_rows relation
+    stored by offsets and indices.
+    """
+    inverse_sets: list[set[int]] = [set() for _ in range(n_rows)]
+    for i in range(n_rows):
+        for j in indices[offsets[i] : offsets[i + 1]]:
+            inverse_sets[j].add(i)
+    return pack_csr(inverse_sets)
@@ -0,0 +1,116 @@
+"""
+Compact, read-only storage for node attributes.
+
+With read_obo(..., compact=True), each node's attributes are stored in a
+TagRecord rather than a dict. A TagRecord holds a tuple of values and a
+reference to a TagLayout that is shared by all records with the same tags
+in the same order. Tag names and frequently repeated values are interned
+and multi-valued tags are stored as tuples rather than lists.
+"""
+
+from __future__ import annotations
+
+import sys
+from collections.abc import Iterator, Mapping
+from typing import Any
+
+# Tags whose values repeat across many terms or refer to other terms,
+# such that interning them shares a single string object between terms.
+interned_tags = frozenset(
+    {
+        "namespace",
+        "subset",
+        "is_a",
+        "is_obsolete",
+        "replaced_by",
+        "consider",
+        "created_by",
+        "disjoint_from",
+        "union_of",
+    }
+)
+
+
+class TagLayout:
+    """
+    Ordered tag names shared by TagRecords, with the index of each tag.
+    """
+
+    __slots__ = ("tags", "index")
+
+    def __init__(self, tags: tuple[str, ...]) -> None:
+        self.tags = tags
+        self.index = {tag: i for i, tag in enumerate(tags)}
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return TagLayout, (self.tags,)
+
+
+class TagRecord(Mapping[str, Any]):
+    """
+    Read-only mapping from tags to values, stored as a shared TagLayout and
+    a tuple of values. Supports the dict methods used by networkx, where
+    copy returns a mutable dict.
+    """
+
+    __slots__ = ("_layout", "_values")
+
+    def __init__(self, layout: TagLayout, values: tuple[Any, ...]) -> None:
+        self._layout = layout
+        self._values = values
+
+    def __getitem__(self, tag: str) -> Any:
+        return self._values[self._layout.index[tag]]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._layout.tags)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __contains__(self, tag: object) -> bool:
+        return tag in self._layout.index
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({dict(self)!r})"
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return TagRecord, (self._layout, self._values)
+
+    def copy(self) -> dict[str, Any]:
+        return dict(zip(self._layout.tags, self._values, strict=True))
+
+
+class TagCompactor:
+    """
+    Convert tag dictionaries into TagRecords, reusing one TagLayout for all
+    dictionaries with the same tags in the same order.
+    """
+
+    def __init__(self) -> None:
+        self.layouts: dict[tuple[str, ...], TagLayout] = {}
+
+    def __call__(self, tags: Mapping[str, Any]) -> TagRecord:
+        keys = tuple(tags)
+        layout = self.layouts.get(keys)
+        if layout is None:
+            layout = TagLayout(tuple(sys.intern(tag) for tag in keys))
+            self.layouts[keys] = layout
+        values = tuple(compact_value(tag, value) for tag, value in tags.items())
+        return TagRecord(layout, values)
+
+
+def compact_value(tag: str, value: Any) -> Any:
+    """
+    Convert lists to tuples and intern string values of interned_tags.
+    """
+    if tag in interned_tags:
+        if isinstance(value, str):
+            return sys.intern(value)
+        if isinstance(value, (list, tuple)):
+            return tuple(
+                sys.intern(item) if isinstance(item, str) else item for item in value
+            )
+    if isinstance(value, list):
+        return tuple(value)
+    return value
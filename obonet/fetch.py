@@ -0,0 +1,423 @@
+"""
+Concurrent loading of ontologies from URLs.
+
+read_obo_many downloads and parses several ontologies in a pool of threads,
+so that waiting on the network for one URL overlaps with downloading and
+parsing the others. Responses are decompressed and parsed as they are
+received. Requests to the same host reuse persistent HTTP/1.1 connections
+held by a ConnectionPool, which uses the proxies configured by environment
+variables such as https_proxy and no_proxy, like urlopen. With a download
+directory, each response is also written to a DownloadCache while it is
+parsed, and later requests are conditional on its ETag and Last-Modified
+validators, such that unchanged ontologies are read from the local copy
+after a 304 Not Modified response.
+"""
+
+from __future__ import annotations
+
+import base64
+import contextlib
+import hashlib
+import http.client
+import io
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from typing import IO, TYPE_CHECKING, Any, TextIO, TypeVar, cast
+
+from .io import USER_AGENT, ResponseTextIOWrapper, get_opener
+from .read import read_obo
+
+if TYPE_CHECKING:
+    import networkx
+
+logger = logging.getLogger(__name__)
+
+# Maximum number of redirects followed for a single request
+max_redirects = 10
+
+redirect_statuses = frozenset({301, 302, 303, 307, 308})
+
+PathT = TypeVar("PathT", bound="str | os.PathLike[str]")
+
+
+def read_obo_many(
+    paths: Iterable[PathT],
+    workers: int = 8,
+    download_dir: str | os.PathLike[str] | None = None,
+    timeout: float | None = None,
+    **read_options: Any,
+) -> dict[PathT, networkx.MultiDiGraph[str]]:
+    """
+    Return a dictionary from each of paths, which are strings or path-like
+    objects, to the graph returned by read_obo(path, **read_options),
+    reading up to workers paths concurrently in threads. HTTP(S) URLs are
+    fetched with a ConnectionPool that reuses connections per host. When
+    download_dir is given, responses are saved there and refetched only when
+    the server reports a change. Other paths, including FTP URLs, are passed
+    to read_obo. The first exception raised while reading a path is raised
+    once all paths were attempted.
+    """
+    paths = list(dict.fromkeys(paths))
+    cache = None if download_dir is None else DownloadCache(download_dir)
+    encoding = read_options.pop("encoding", "utf-8")
+    with ConnectionPool(timeout=timeout) as pool:
+
+        def load(path: str | os.PathLike[str]) -> networkx.MultiDiGraph[str]:
+            path = os.fspath(path)
+            if not is_http_url(path):
+                return read_obo(path, encoding=encoding, **read_options)
+            source = open_url(path, pool, cache=cache, encoding=encoding)
+            if isinstance(source, str):
+                return read_obo(source, encoding=encoding, **read_options)
+            with source:
+                return read_obo(source, encoding=encoding, **read_options)
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {path: executor.submit(load, path) for path in paths}
+            return {path: future.result() for path, future in futures.items()}
+
+
+def is_http_url(path: str) -> bool:
+    return re.match("^https?://", path) is not None
+
+
+def open_url(
+    url: str,
+    pool: ConnectionPool,
+    cache: DownloadCache | None = None,
+    encoding: str | None = "utf-8",
+) -> str | TextIO:
+    """
+    Request url with pool and return a text file that streams the decoded,
+    decompressed response. When cache holds a copy of url, the request is
+    conditional and the path of the copy is returned if it is unchanged.
+    Otherwise, the response is written to cache as it is read, and the copy
+    is kept once the response was read completely.
+    """
+    headers = {"User-Agent": USER_AGENT}
+    if cache is not None:
+        headers.update(cache.conditional_headers(url))
+    response, connection = pool.request(url, headers)
+    if response.status == 304 and cache is not None:
+        pool.release(response, connection)
+        logger.info(f"{url} is not modified, reading {cache.get_path(url)}")
+        return cache.get_path(url)
+    if response.status != 200:
+        pool.release(response, connection)
+        raise urllib.error.HTTPError(
+            url, response.status, response.reason, response.headers, None
+        )
+    raw_file = ResponseReader(
+        response,
+        release=lambda: pool.release(response, connection),
+        download=None if cache is None else cache.start_download(url, response),
+    )
+    opener = cast(Callable[..., IO[bytes]], get_opener(urllib.parse.urlsplit(url).path))
+    binary_file: IO[bytes]
+    if opener is io.open:
+        if not encoding:
+            encoding = response.headers.get_content_charset(failobj="utf-8")
+        binary_file = io.BufferedReader(raw_file)
+    else:
+        binary_file = opener(raw_file, "rb")
+    return ResponseTextIOWrapper(binary_file, raw_file, encoding=encoding)
+
+
+class ConnectionPool:
+    """
+    Persistent HTTP(S) connections, one for each host and thread, so that
+    a thread reuses its connection for successive requests to the same host.
+    Requests go through the proxies returned by urllib.request.getproxies,
+    unless urllib.request.proxy_bypass excludes the host: HTTPS connections
+    are tunneled through the proxy and HTTP requests are sent to it. Use as
+    a context manager or call close to close all connections.
+    """
+
+    def __init__(self, timeout: float | None = None) -> None:
+        self.timeout = timeout
+        self.connections: dict[tuple[int, str, str], http.client.HTTPConnection] = {}
+        self.lock = threading.Lock()
+        self.proxies = urllib.request.getproxies()
+
+    def __enter__(self) -> ConnectionPool:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        with self.lock:
+            connections = list(self.connections.values())
+            self.connections.clear()
+        for connection in connections:
+            connection.close()
+
+    def get_proxy(self, scheme: str, netloc: str) -> str | None:
+        """
+        Return the URL of the proxy for requests to netloc with scheme, or
+        None for direct requests.
+        """
+        proxy = self.proxies.get(scheme)
+        if not proxy or urllib.request.proxy_bypass(netloc):
+            return None
+        return proxy if "://" in proxy else f"http://{proxy}"
+
+    def get_connection(
+        self, scheme: str, netloc: str, proxy: str | None = None
+    ) -> http.client.HTTPConnection:
+        key = (threading.get_ident(), scheme, netloc)
+        with self.lock:
+            connection = self.connections.get(key)
+            if connection is None:
+                connection = self._connect(scheme, netloc, proxy)
+                self.connections[key] = connection
+        return connection
+
+    def _connect(
+        self, scheme: str, netloc: str, proxy: str | None
+    ) -> http.client.HTTPConnection:
+        connection_class = (
+            http.client.HTTPSConnection
+            if scheme == "https"
+            else http.client.HTTPConnection
+        )
+        host = netloc
+        if proxy is not None:
+            host = urllib.parse.urlsplit(proxy).netloc.rpartition("@")[2]
+        if self.timeout is None:
+            connection = connection_class(host)
+        else:
+            connection = connection_class(host, timeout=self.timeout)
+        if proxy is not None and scheme == "https":
+            connection.set_tunnel(netloc, headers=get_proxy_headers(proxy))
+        return connection
+
+    def request(
+        self, url: str, headers: dict[str, str]
+    ) -> tuple[http.client.HTTPResponse, http.client.HTTPConnection]:
+        """
+        Send a GET request for url, following redirects, and return the
+        response with the connection it was received on. The response must
+        be passed to release once it is no longer read.
+        """
+        for _ in range(max_redirects + 1):
+            parts = urllib.parse.urlsplit(url)
+            proxy = self.get_proxy(parts.scheme, parts.netloc)
+            connection = self.get_connection(parts.scheme, parts.netloc, proxy)
+            request_headers = headers
+            target = urllib.parse.urlunsplit(
+                ("", "", parts.path or "/", parts.query, "")
+            )
+            if proxy is not None and parts.scheme == "http":
+                # requests sent to a proxy name the absolute URL
+                request_headers = {**headers, **get_proxy_headers(proxy)}
+                target = urllib.parse.urlunsplit(
+                    (parts.scheme, parts.netloc, parts.path or "/", parts.query, "")
+                )
+            response = self._send(connection, target, request_headers)
+            location = response.getheader("Location")
+            if response.status not in redirect_statuses or location is None:
+                return response, connection
+            self.release(response, connection, drain=True)
+            url = urllib.parse.urljoin(url, location)
+        raise urllib.error.HTTPError(
+            url, response.status, "too many redirects", response.headers, None
+        )
+
+    def _send(
+        self,
+        connection: http.client.HTTPConnection,
+        target: str,
+        headers: dict[str, str],
+    ) -> http.client.HTTPResponse:
+        try:
+            connection.request("GET", target, headers=headers)
+            return connection.getresponse()
+        except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+            # the server closed an idle persistent connection, so reconnect
+            connection.close()
+            connection.request("GET", target, headers=headers)
+            return connection.getresponse()
+
+    def release(
+        self,
+        response: http.client.HTTPResponse,
+        connection: http.client.HTTPConnection,
+        drain: bool = False,
+    ) -> None:
+        """
+        Finish with response. The connection remains open for the next
+        request when the response was read completely, or is drained when
+        drain is true, and is closed otherwise.
+        """
+        if drain and not response.isclosed():
+            response.read()
+        if not response.isclosed() or response.will_close:
+            connection.close()
+        response.close()
+
+
+def get_proxy_headers(proxy: str) -> dict[str, str]:
+    """
+    Return the Proxy-Authorization header for the credentials in the URL of
+    proxy, if any.
+    """
+    parts = urllib.parse.urlsplit(proxy)
+    if parts.username is None:
+        return {}
+    credentials = ":".join(
+        urllib.parse.unquote(part or "") for part in (parts.username, parts.password)
+    )
+    token = base64.b64encode(credentials.encode("utf-8")).decode("ascii")
+    return {"Proxy-Authorization": f"Basic {token}"}
+
+
+class ResponseReader(io.RawIOBase):
+    """
+    Raw binary file that reads an HTTP response, writing the bytes it reads
+    to download, and calls release when closed. The download is completed
+    when the response was read until its end, and discarded otherwise.
+    """
+
+    def __init__(
+        self,
+        response: http.client.HTTPResponse,
+        release: Callable[[], None],
+        download: Download | None = None,
+    ) -> None:
+        super().__init__()
+        self.response = response
+        self.release = release
+        self.download = download
+        self.at_end = False
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        n_bytes = self.response.readinto(buffer)
+        if n_bytes == 0:
+            self.at_end = True
+        elif self.download is not None:
+            self.download.write_file.write(memoryview(buffer)[:n_bytes])
+        return n_bytes
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        try:
+            if self.download is not None:
+                if self.at_end:
+                    self.download.complete()
+                else:
+                    self.download.discard()
+            self.release()
+        finally:
+            super().close()
+
+
+class Download:
+    """
+    Response being written to a temporary file in a DownloadCache, which
+    replaces the cached copy of url when completed.
+    """
+
+    def __init__(
+        self, cache: DownloadCache, url: str, validators: dict[str, Any]
+    ) -> None:
+        self.cache = cache
+        self.url = url
+        self.validators = validators
+        os.makedirs(cache.directory, exist_ok=True)
+        self.write_file = tempfile.NamedTemporaryFile(
+            dir=cache.directory, suffix=".tmp", delete=False
+        )
+
+    def complete(self) -> None:
+        self.write_file.close()
+        os.replace(self.write_file.name, self.cache.get_path(self.url))
+        metadata = {"url": self.url, **self.validators}
+        with open(self.cache.get_metadata_path(self.url), "w") as write_file:
+            json.dump(metadata, write_file)
+        logger.info(f"saved {self.url} to {self.cache.get_path(self.url)}")
+
+    def discard(self) -> None:
+        self.write_file.close()
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(self.write_file.name)
+
+
+class DownloadCache:
+    """
+    Directory of downloaded files, each stored with the ETag and
+    Last-Modified headers of its response in a JSON metadata file. File
+    names end with the base name of the URL path, so that compression is
+    detected from their extension.
+    """
+
+    def __init__(self, directory: str | os.PathLike[str]) -> None:
+        self.directory = os.fspath(directory)
+
+    def get_path(self, url: str) -> str:
+        digest = hashlib.sha256(url.encode("utf-8")).hexdigest()[:32]
+        name = os.path.basename(urllib.parse.urlsplit(url).path)
+        name = re.sub(r"[^\w.-]", "_", name)
+        return os.path.join(self.directory, f"{digest}-{name}")
+
+    def get_metadata_path(self, url: str) -> str:
+        return self.get_path(url) + ".json"
+
+    def get_validators(self, url: str) -> dict[str, str | None] | None:
+        """
+        Return the validators of the cached copy of url, or None when there
+        is no complete copy.
+        """
+        if not os.path.exists(self.get_path(url)):
+            return None
+        try:
+            with open(self.get_metadata_path(url)) as read_file:
+                metadata = json.load(read_file)
+        except (OSError, ValueError):
+            return None
+        if metadata.get("url") != url:
+            return None
+        return {key: metadata.get(key) for key in ("etag", "last_modified")}
+
+    def conditional_headers(self, url: str) -> dict[str, str]:
+        """
+        Return the headers that make a request for url conditional on the
+        validators of its cached copy.
+        """
+        validators = self.get_validators(url) or {}
+        etag, last_modified = validators.get("etag"), validators.get("last_modified")
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        return headers
+
+    def start_download(
+        self, url: str, response: http.client.HTTPResponse
+    ) -> Download | None:
+        """
+        Return a Download of response, or None when the response has neither
+        an ETag nor a Last-Modified header to validate a cached copy with.
+        """
+        validators = {
+            "etag": response.getheader("ETag"),
+            "last_modified": response.getheader("Last-Modified"),
+        }
+        if not any(validators.values()):
+            logger.info(f"not saving {url}: no ETag or Last-Modified header")
+            return None
+        return Download(self, url, validators)
@@ -0,0 +1,178 @@
+"""
+Streaming subsets of OBO files that are written without building a graph.
+
+filter_obo reads an ontology in chunks of text, splits them into stanzas at
+blank lines and writes the header, the Typedef and Instance stanzas, and
+the Term stanzas that match the given criteria, with their text unchanged.
+Stanzas are not parsed: the few tags used by the criteria are found with
+regular expressions, and memory use does not grow with the size of the
+ontology.
+"""
+
+from __future__ import annotations
+
+import functools
+import os
+import re
+from collections.abc import Collection, Iterable, Iterator
+from dataclasses import dataclass
+from typing import IO
+
+from .io import PathType, can_map_file, open_read_file, open_write_file
+from .read import blank_lines_pattern, iter_mapped_text
+
+# Size of the chunks of text read from files that cannot be memory mapped
+chunk_size = 2**20
+
+# Tag lines used by filters, whose values cannot contain whitespace. Tag
+# lines are matched after a newline rather than with re.MULTILINE, so that
+# stanzas are searched for the literal tag rather than at every position.
+id_pattern = re.compile(r"\nid:[ \t]*(\S+)")
+namespace_pattern = re.compile(r"\nnamespace:[ \t]*(\S+)")
+default_namespace_pattern = re.compile(r"\ndefault-namespace:[ \t]*(\S+)")
+subset_pattern = re.compile(r"\nsubset:[ \t]*(\S+)")
+obsolete_pattern = re.compile(r"\nis_obsolete:[ \t]*true\b")
+
+# Whitespace-only lines at the start or end of a block of text
+leading_blank_lines_pattern = re.compile(r"(?:[^\S\n]*\n)+")
+trailing_blank_lines_pattern = re.compile(r"(?:\n[^\S\n]*)+\Z")
+
+
+@dataclass(frozen=True)
+class TermFilter:
+    """
+    Criteria that a term must meet to be kept. Each criterion that is not
+    None must be met: namespace in namespaces, at least one subset in
+    subsets, and an id starting with one of id_prefixes. Obsolete terms are
+    dropped when ignore_obsolete is true. Terms without a namespace tag are
+    in the default-namespace of the header.
+    """
+
+    namespaces: frozenset[str] | None = None
+    subsets: frozenset[str] | None = None
+    id_prefixes: tuple[str, ...] | None = None
+    ignore_obsolete: bool = True
+
+    def keep(self, stanza: str, default_namespace: str | None = None) -> bool:
+        """
+        Return whether the Term stanza with text stanza is kept.
+        """
+        if self.ignore_obsolete and obsolete_pattern.search(stanza):
+            return False
+        if self.namespaces is not None:
+            match = namespace_pattern.search(stanza)
+            namespace = default_namespace if match is None else match.group(1)
+            if namespace not in self.namespaces:
+                return False
+        if self.subsets is not None and self.subsets.isdisjoint(
+            subset_pattern.findall(stanza)
+        ):
+            return False
+        if self.id_prefixes is not None:
+            match = id_pattern.search(stanza)
+            return match is not None and match.group(1).startswith(self.id_prefixes)
+        return True
+
+
+def filter_obo(
+    path_or_file: PathType,
+    output: str | os.PathLike[str] | IO[str],
+    namespaces: Collection[str] | None = None,
+    subsets: Collection[str] | None = None,
+    id_prefixes: Collection[str] | None = None,
+    ignore_obsolete: bool = True,
+    encoding: str | None = "utf-8",
+) -> int:
+    """
+    Write the ontology serialized by path_or_file to output, a path or a
+    text file, keeping only the Term stanzas that match the criteria of
+    TermFilter. Output paths are compressed based on their extension. The
+    header, Typedef and Instance stanzas are always written. Stanzas are
+    separated by single blank lines and their text is otherwise written as
+    read. Relationships of kept terms to dropped terms are not removed.
+    Returns the number of Term stanzas written.
+    """
+    term_filter = TermFilter(
+        namespaces=None if namespaces is None else frozenset(namespaces),
+        subsets=None if subsets is None else frozenset(subsets),
+        id_prefixes=None if id_prefixes is None else tuple(id_prefixes),
+        ignore_obsolete=ignore_obsolete,
+    )
+    stanzas = iter_obo_stanzas(path_or_file, encoding)
+    if isinstance(output, (str, os.PathLike)):
+        with open_write_file(output, "wt", encoding="utf-8") as write_file:
+            return write_filtered_stanzas(stanzas, write_file, term_filter)
+    return write_filtered_stanzas(stanzas, output, term_filter)
+
+
+def write_filtered_stanzas(
+    stanzas: Iterable[str], write_file: IO[str], term_filter: TermFilter
+) -> int:
+    """
+    Write the text of each stanza to write_file, skipping Term stanzas that
+    term_filter does not keep. Returns the number of Term stanzas written.
+    """
+    n_terms = 0
+    separator = ""
+    default_namespace = None
+    for stanza in stanzas:
+        if stanza.startswith("[Term]"):
+            if not term_filter.keep(stanza, default_namespace):
+                continue
+            n_terms += 1
+        elif not stanza.startswith("["):
+            match = default_namespace_pattern.search("\n" + stanza)
+            if match is not None:
+                default_namespace = match.group(1)
+        write_file.write(separator)
+        write_file.write(stanza)
+        separator = "\n\n"
+    if separator:
+        write_file.write("\n")
+    return n_terms
+
+
+def iter_obo_stanzas(path_or_file: PathType, encoding: str | None) -> Iterator[str]:
+    """
+    Yield the text of each block of consecutive non-blank lines of the
+    ontology serialized by path_or_file. Text is read in chunks, through a
+    memory map for local uncompressed regular files, and otherwise from
+    the file, which can be a pipe such as /dev/stdin.
+    """
+    if encoding is not None and can_map_file(path_or_file, encoding):
+        yield from iter_text_stanzas(iter_mapped_text(path_or_file, encoding))
+        return
+    with open_read_file(path_or_file, encoding=encoding) as obo_file:
+        chunks = iter(functools.partial(obo_file.read, chunk_size), "")
+        yield from iter_text_stanzas(chunks)
+
+
+def iter_text_stanzas(chunks: Iterable[str]) -> Iterator[str]:
+    """
+    Split text into blocks of consecutive non-blank lines, like
+    iter_text_blocks, but yield the text of each block without blank lines
+    at its start or end.
+    """
+    remainder = ""
+    for chunk in chunks:
+        texts = blank_lines_pattern.split(remainder + chunk)
+        remainder = texts.pop()
+        for text in texts:
+            if text and not text.isspace():
+                yield strip_blank_lines(text)
+    if remainder and not remainder.isspace():
+        yield strip_blank_lines(remainder)
+
+
+def strip_blank_lines(text: str) -> str:
+    """
+    Remove whitespace-only lines and newlines from the start and end of
+    text.
+    """
+    if text[0].isspace():
+        match = leading_blank_lines_pattern.match(text)
+        if match is not None:
+            text = text[match.end() :]
+    if text[-1].isspace():
+        text = trailing_blank_lines_pattern.sub("", text)
+    return text
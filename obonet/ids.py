@@ -0,0 +1,126 @@
+"""
+Resolution of alternative and obsolete term identifiers.
+
+With read_obo(..., id_index=True), an IdIndex is built from every term
+stanza, including obsolete terms that ignore_obsolete drops from the graph,
+and stored in the "id_index" graph attribute. It maps primary ids to
+themselves, alt_id values to their primary id, and obsolete ids to the
+term given by their replaced_by tag, such that normalizing an identifier
+is a single dictionary lookup.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+# Tags that must be parsed to build an IdIndex
+id_index_tags = frozenset({"alt_id", "is_obsolete", "replaced_by", "consider"})
+
+
+class IdIndex:
+    """
+    Mapping from term identifiers to the current primary identifier of the
+    term they refer to. Terms are added with add_term. The index is updated
+    on the first lookup after terms were added.
+
+    An obsolete term resolves to the term of its replaced_by tag (followed
+    through chains of obsolete replacements) when it has exactly one, and
+    is unresolved otherwise. Its replaced_by and consider values remain
+    available from replacements. When an alt_id of one term is the primary
+    id of another, the primary id takes precedence.
+    """
+
+    def __init__(self) -> None:
+        self.terms: set[str] = set()
+        self.obsolete: set[str] = set()
+        self.alt_ids: dict[str, str] = {}
+        self.replaced_by: dict[str, list[str]] = {}
+        self.consider: dict[str, list[str]] = {}
+        self._resolved: dict[str, str] | None = None
+
+    def __len__(self) -> int:
+        return len(self.resolved)
+
+    def __contains__(self, term_id: object) -> bool:
+        return term_id in self.resolved
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}(terms={len(self.terms)}, "
+            f"obsolete={len(self.obsolete)}, alt_ids={len(self.alt_ids)})"
+        )
+
+    def __getstate__(self) -> dict[str, Any]:
+        state = self.__dict__.copy()
+        state["_resolved"] = None
+        return state
+
+    def add_term(self, term_id: str, term: Mapping[str, Any]) -> None:
+        """
+        Add a term with its parsed tags, as returned by parse_stanza.
+        """
+        self._resolved = None
+        self.terms.add(term_id)
+        if term.get("is_obsolete", "false") == "true":
+            self.obsolete.add(term_id)
+        for alt_id in term.get("alt_id", []):
+            self.alt_ids.setdefault(alt_id, term_id)
+        if term.get("replaced_by"):
+            self.replaced_by[term_id] = list(term["replaced_by"])
+        if term.get("consider"):
+            self.consider[term_id] = list(term["consider"])
+
+    @property
+    def resolved(self) -> dict[str, str]:
+        """
+        Dictionary from every resolvable identifier to its primary id.
+        """
+        if self._resolved is None:
+            self._resolved = self._resolve()
+        return self._resolved
+
+    def _resolve(self) -> dict[str, str]:
+        resolved = {term_id: term_id for term_id in self.terms - self.obsolete}
+        for term_id in self.obsolete:
+            target = self._follow_replacements(term_id)
+            if target is not None:
+                resolved[term_id] = target
+        for alt_id, term_id in self.alt_ids.items():
+            if alt_id not in self.terms and term_id in resolved:
+                resolved[alt_id] = resolved[term_id]
+        return resolved
+
+    def _follow_replacements(self, term_id: str) -> str | None:
+        seen = set()
+        while term_id in self.obsolete:
+            if term_id in seen:
+                return None
+            seen.add(term_id)
+            targets = self.replaced_by.get(term_id, [])
+            if len(targets) != 1:
+                return None
+            term_id = targets[0]
+            if term_id not in self.terms:
+                term_id = self.alt_ids.get(term_id, term_id)
+        return term_id if term_id in self.terms else None
+
+    def resolve(self, term_id: str) -> str | None:
+        """
+        Return the primary id for term_id, or None when term_id is unknown
+        or an obsolete term without a single replacement.
+        """
+        return self.resolved.get(term_id)
+
+    def resolve_ids(self, term_ids: Iterable[str]) -> list[str | None]:
+        """
+        Return the primary id of each of term_ids, with None for identifiers
+        that cannot be resolved.
+        """
+        return list(map(self.resolved.get, term_ids))
+
+    def replacements(self, term_id: str) -> list[str]:
+        """
+        Return the replaced_by and then consider values of term_id.
+        """
+        return self.replaced_by.get(term_id, []) + self.consider.get(term_id, [])
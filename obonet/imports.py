@@ -0,0 +1,222 @@
+"""
+Resolution of the ontologies imported by an OBO file.
+
+With read_obo(..., resolve_imports=True), the "import" header tags of the
+ontology and of every ontology it imports, directly or indirectly, are
+followed. Each imported ontology is loaded once, even when imports form a
+cycle, and imported ontologies are read concurrently while the stanzas of
+the importing ontology are consumed. The stanzas of all ontologies are
+passed to build_graph as a single stream, so that the merged graph is built
+in one pass. Ontologies closer to the importing ontology take precedence:
+their Typedef and Instance stanzas replace those with the same id in
+ontologies they import, and so do the tags of their Term stanzas.
+"""
+
+from __future__ import annotations
+
+import collections
+import logging
+import os
+import re
+import urllib.parse
+from collections.abc import Collection, Iterable, Iterator
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any
+
+from .io import PathType, is_url
+from .read import Stanza, iter_stanzas
+
+logger = logging.getLogger(__name__)
+
+# Location of ontologies imported by their identifier, such as "go"
+obo_library_url = "http://purl.obolibrary.org/obo/{}.obo"
+
+# Number of threads that read imported ontologies when workers is not set
+import_threads = 4
+
+
+def iter_import_stanzas(
+    path_or_file: PathType,
+    stanzas: Iterable[Stanza],
+    encoding: str | None = "utf-8",
+    include_clauses: bool = False,
+    workers: int | None = None,
+    include_tags: Collection[str] | None = None,
+    exclude_tags: Collection[str] | None = None,
+) -> Iterator[Stanza]:
+    """
+    Yield stanzas, the stanzas of the ontology at path_or_file, followed by
+    the stanzas of the ontologies in its import closure, in breadth-first
+    order of imports. The headers of imported ontologies are not yielded,
+    and stanzas are merged as described by StanzaMerger. Imports are read
+    concurrently in a pool of import_threads threads, or of workers
+    processes when workers is greater than 1. Imports of formats other
+    than OBO, such as OWL files, are skipped with a warning.
+    """
+    base = get_import_base(path_or_file)
+    stanzas = iter(stanzas)
+    first = next(stanzas, None)
+    if first is None:
+        return
+    read_options = encoding, include_clauses, include_tags, exclude_tags
+    seen = {base} if base is not None else set()
+    pending: collections.deque[Future[list[Stanza]]] = collections.deque()
+    executor: Executor
+    if workers is not None and workers > 1:
+        executor = ProcessPoolExecutor(max_workers=workers)
+    else:
+        executor = ThreadPoolExecutor(max_workers=import_threads)
+
+    def submit_imports(header: Stanza, base: str | None) -> None:
+        if header.stanza_type != "header":
+            return
+        for location in get_import_locations(header.tags, base):
+            if location not in seen:
+                seen.add(location)
+                future = executor.submit(read_stanzas, location, *read_options)
+                pending.append(future)
+
+    with executor:
+        submit_imports(first, base)
+        yield first
+        if not pending:
+            yield from stanzas
+            return
+        merger = StanzaMerger()
+        yield from merger.merge(stanzas)
+        while pending:
+            imported = pending.popleft().result()
+            submit_imports(imported[0], imported[0].tags.pop("_location"))
+            yield from merger.merge(imported[1:])
+
+
+class StanzaMerger:
+    """
+    Merge the stanzas of the ontologies of an import closure, which are
+    passed to merge one ontology at a time, in breadth-first order of
+    imports. Typedef and Instance stanzas with the id of a stanza of an
+    earlier ontology are dropped, and so are the tags of Term stanzas that
+    an earlier ontology defines for the same term. Stanzas with the same id
+    in a single ontology are kept, and combined by build_graph.
+    """
+
+    def __init__(self) -> None:
+        self.n_ontologies = 0
+        # (stanza_type, id) of each stanza to the index of the first
+        # ontology that defines it and the tags that are defined
+        self.defined: dict[tuple[str, Any], tuple[int, frozenset[str]]] = {}
+        # distinct sets of tags, which are shared by the terms that use them
+        self.tag_sets: dict[frozenset[str], frozenset[str]] = {}
+
+    def merge(self, stanzas: Iterable[Stanza]) -> Iterator[Stanza]:
+        """
+        Yield the stanzas of the next ontology, without stanzas and tags
+        that earlier ontologies define.
+        """
+        ontology = self.n_ontologies
+        self.n_ontologies += 1
+        for stanza in stanzas:
+            key = stanza.stanza_type, stanza.tags.get("id")
+            first_ontology, tags = self.defined.get(key, (ontology, frozenset()))
+            if first_ontology < ontology:
+                if stanza.stanza_type != "Term":
+                    continue
+                stanza = Stanza(
+                    stanza.stanza_type,
+                    {
+                        tag: value
+                        for tag, value in stanza.tags.items()
+                        if tag == "id" or tag not in tags
+                    },
+                )
+            tags = tags.union(stanza.tags)
+            self.defined[key] = first_ontology, self.tag_sets.setdefault(tags, tags)
+            yield stanza
+
+
+def read_stanzas(
+    location: str,
+    encoding: str | None,
+    include_clauses: bool,
+    include_tags: Collection[str] | None,
+    exclude_tags: Collection[str] | None,
+) -> list[Stanza]:
+    """
+    Return the stanzas of the ontology at location. The location is stored
+    under "_location" in the tags of the first stanza when it is a header,
+    such that the imports of the ontology can be resolved relative to it.
+    """
+    logger.info(f"reading imported ontology {location}")
+    stanzas = list(
+        iter_stanzas(
+            location,
+            encoding=encoding,
+            include_clauses=include_clauses,
+            include_tags=include_tags,
+            exclude_tags=exclude_tags,
+        )
+    )
+    if stanzas and stanzas[0].stanza_type == "header":
+        stanzas[0].tags["_location"] = location
+    else:
+        stanzas.insert(0, Stanza("header", {"_location": location}))
+    return stanzas
+
+
+def get_import_base(path_or_file: PathType) -> str | None:
+    """
+    Return the location that imports of path_or_file are resolved relative
+    to: its URL or absolute path, or None for open file objects, whose
+    imports are resolved relative to the working directory.
+    """
+    if isinstance(path_or_file, os.PathLike):
+        path_or_file = os.fspath(path_or_file)
+    if not isinstance(path_or_file, str):
+        return None
+    if is_url(path_or_file):
+        return path_or_file
+    return os.path.abspath(path_or_file)
+
+
+def get_import_locations(header: dict[str, object], base: str | None) -> list[str]:
+    """
+    Return the locations of the OBO ontologies imported by header, which
+    was read from base.
+    """
+    values = header.get("import", [])
+    if not isinstance(values, list):
+        raise TypeError(f"import values must be a list, not {type(values)}")
+    locations = []
+    for value in values:
+        location = resolve_import(value.strip(), base)
+        if not is_obo_location(location):
+            logger.warning(f"skipping import of {location}: not an OBO file")
+            continue
+        locations.append(location)
+    return locations
+
+
+def resolve_import(value: str, base: str | None) -> str:
+    """
+    Return the location of the ontology referenced by the value of an
+    import tag. Values can be URLs, paths relative to base or absolute
+    paths, or ontology identifiers, which refer to the OBO library.
+    """
+    if is_url(value):
+        return value
+    if re.fullmatch(r"[A-Za-z][\w-]*", value):
+        return obo_library_url.format(value.lower())
+    if base is not None and is_url(base):
+        return urllib.parse.urljoin(base, value)
+    directory = os.getcwd() if base is None else os.path.dirname(base)
+    return os.path.normpath(os.path.join(directory, value))
+
+
+def is_obo_location(location: str) -> bool:
+    """
+    Return whether location refers to an OBO file, possibly compressed.
+    """
+    if is_url(location):
+        location = urllib.parse.urlsplit(location).path
+    name = re.sub(r"\.(gz|bz2|xz)$", "", location.lower())
+    return name.endswith(".obo")
@@ -1,14 +1,16 @@
 from __future__ import annotations
 
+import codecs
 import importlib
 import io
 import logging
 import mimetypes
+import mmap
 import os
 import re
-from collections.abc import Callable
-from typing import TextIO
-from urllib.request import Request, urlopen
+import stat
+from collections.abc import Callable, Iterator
+from typing import IO, Any, TextIO, TypeGuard
 
 PathType = str | os.PathLike[str] | TextIO
 
@@ -37,25 +39,135 @@ def open_read_file(path: PathType, encoding: str | None = None) -> TextIO:
     # Get opener based on file extension
     opener = get_opener(path)
 
-    # Read from URL
-    if re.match("^(http|ftp)s?://", path):
+    # Stream from URL
+    if is_url(path):
+        from urllib.request import Request, urlopen
+
         request = Request(path, headers={"User-Agent": USER_AGENT})
-        with urlopen(request) as response:
-            content = response.read()
+        response = urlopen(request)
         if opener == io.open:
             if not encoding:
                 encoding = response.headers.get_content_charset(failobj="utf-8")
             logging.info(f"Will decode content from {path} using {encoding} charset.")
-            text = content.decode(encoding)
-            return io.StringIO(text)
+            binary_file = response
         else:
-            compressed_bytes = io.BytesIO(content)
-            return opener(compressed_bytes, "rt", encoding=encoding)
+            # decompress incrementally as the response is read
+            binary_file = opener(response, "rb")
+        return ResponseTextIOWrapper(binary_file, response, encoding=encoding)
 
     # Read from file
     return opener(path, "rt", encoding=encoding)
 
 
+def open_write_file(
+    path: str | os.PathLike[str], mode: str = "wt", encoding: str | None = None
+) -> IO[Any]:
+    """
+    Return a file object for writing to path in mode ("wt" or "wb").
+    Compression is inferred from the file extension, like get_opener.
+    """
+    path = os.fspath(path)
+    opener = get_opener(path)
+    return opener(path, mode, encoding=encoding)
+
+
+class ResponseTextIOWrapper(io.TextIOWrapper):
+    """
+    Text file that decodes a (possibly decompressed) binary stream read from
+    an HTTP response, closing the response when the file is closed.
+    """
+
+    def __init__(
+        self,
+        binary_file: IO[bytes],
+        response: IO[bytes] | io.IOBase,
+        encoding: str | None = None,
+    ) -> None:
+        super().__init__(binary_file, encoding=encoding)
+        self.response = response
+
+    def close(self) -> None:
+        try:
+            super().close()
+        finally:
+            self.response.close()
+
+
+def is_url(path: str) -> bool:
+    """
+    Return whether path is an HTTP(S) or FTP(S) URL rather than a local path.
+    """
+    return re.match("^(http|ftp)s?://", path) is not None
+
+
+def is_local_uncompressed(path: PathType) -> bool:
+    """
+    Return whether path refers to a local file path without compression,
+    whose bytes can be read directly with seek and mmap.
+    """
+    if isinstance(path, os.PathLike):
+        path = os.fspath(path)
+    if not isinstance(path, str) or is_url(path):
+        return False
+    return get_opener(path) is io.open
+
+
+# Encodings in which newline and carriage return bytes always encode those
+# characters, so that encoded text can be split into lines before decoding.
+ascii_compatible_encodings = frozenset({"utf-8", "ascii", "iso8859-1", "cp1252"})
+
+
+def is_regular_file(path: PathType) -> bool:
+    """
+    Return whether path is the path of an existing regular file. Pipes and
+    character devices, such as /dev/stdin, report a size of zero and cannot
+    be memory mapped or seeked.
+    """
+    if not isinstance(path, (str, os.PathLike)):
+        return False
+    try:
+        return stat.S_ISREG(os.stat(path).st_mode)
+    except OSError:
+        return False
+
+
+def can_map_file(path: PathType, encoding: str) -> TypeGuard[str | os.PathLike[str]]:
+    """
+    Return whether path is a local uncompressed regular file in an
+    ASCII-compatible encoding, which can be read with iter_mapped_chunks.
+    """
+    if not is_local_uncompressed(path) or not is_regular_file(path):
+        return False
+    try:
+        return codecs.lookup(encoding).name in ascii_compatible_encodings
+    except LookupError:
+        return False
+
+
+def iter_mapped_chunks(
+    path: str | os.PathLike[str],
+    start: int = 0,
+    end: int | None = None,
+    chunk_bytes: int = 2**20,
+) -> Iterator[bytes]:
+    """
+    Memory-map the file at path and yield its bytes from start to end in
+    chunks of roughly chunk_bytes that end immediately after a newline
+    (or at end).
+    """
+    with open(path, "rb") as read_file:
+        size = os.fstat(read_file.fileno()).st_size
+        end = size if end is None else min(end, size)
+        if start >= end:
+            return
+        with mmap.mmap(read_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            while start < end:
+                newline = mapped.find(b"\n", min(start + chunk_bytes, end) - 1, end)
+                chunk_end = end if newline == -1 else newline + 1
+                yield mapped[start:chunk_end]
+                start = chunk_end
+
+
 compression_to_module = {
     "gzip": "gzip",
     "bzip2": "bz2",
@@ -0,0 +1,279 @@
+"""
+Point lookups of stanzas by identifier without parsing the whole ontology.
+
+A StanzaIndex maps the id of every Term, Typedef and Instance stanza of a
+local uncompressed OBO file to the byte offset and length of the stanza.
+It is built by scanning the file once and persisted in a sidecar file next
+to the ontology, which is rebuilt when the size or modification time of the
+ontology changes. The sidecar stores one line per stanza, sorted by id, and
+is searched by bisection through a memory map, so opening an index and
+looking up a term take milliseconds regardless of the size of the ontology.
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import re
+import tempfile
+from collections.abc import Iterator
+from typing import Any
+
+from .io import is_local_uncompressed
+from .read import (
+    Stanza,
+    parse_stanza,
+    paused_gc,
+    split_tag_line,
+    stanza_types,
+    strip_blank_lines,
+)
+
+index_suffix = ".obonet-index"
+
+# Increment when the layout of sidecar files changes
+index_format_version = 2
+
+# Start of a stanza at the start of a line, followed by its id line when id
+# is the first tag. Matching the preceding newline, rather than using ^ in
+# multiline mode, lets the regex engine scan for the literal prefix quickly.
+# Like parse_stanza, which takes the text before the first colon as the tag,
+# lines with whitespace around "id" are not id lines.
+stanza_start_pattern = re.compile(
+    rb"\n(\[(Term|Typedef|Instance)\][^\n]*\n(?:id:[^\n]*)?)"
+)
+id_line_pattern = re.compile(rb"^id:.*$", re.MULTILINE)
+blank_line_pattern = re.compile(rb"\n[ \t\r]*\n")
+
+
+class StanzaIndex:
+    """
+    Sidecar index of the stanzas of the OBO file at path. Use StanzaIndex.open
+    to load the index, building it first when it is missing or outdated.
+    Close the index, or use it as a context manager, to release its memory
+    map.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        index_path: str | os.PathLike[str],
+        encoding: str = "utf-8",
+    ) -> None:
+        self.path = os.fspath(path)
+        self.index_path = os.fspath(index_path)
+        self.encoding = encoding
+        with open(self.index_path, "rb") as read_file:
+            self.metadata: dict[str, Any] = json.loads(read_file.readline())
+            self.start = read_file.tell()
+            size = os.fstat(read_file.fileno()).st_size
+            self.mapped = (
+                mmap.mmap(read_file.fileno(), 0, access=mmap.ACCESS_READ)
+                if size > self.start
+                else b""
+            )
+
+    @classmethod
+    def open(
+        cls,
+        path: str | os.PathLike[str],
+        index_path: str | os.PathLike[str] | None = None,
+        encoding: str = "utf-8",
+    ) -> StanzaIndex:
+        """
+        Return the index of the OBO file at path stored at index_path, which
+        defaults to path followed by ".obonet-index". The index is built
+        when index_path does not exist or was built for a different size or
+        modification time of path.
+        """
+        if not is_local_uncompressed(path):
+            raise ValueError(f"{path} is not a local uncompressed file")
+        if index_path is None:
+            index_path = os.fspath(path) + index_suffix
+        if not is_index_current(path, index_path):
+            build_stanza_index(path, index_path)
+        return cls(path, index_path, encoding=encoding)
+
+    def __enter__(self) -> StanzaIndex:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if isinstance(self.mapped, mmap.mmap):
+            self.mapped.close()
+
+    def __len__(self) -> int:
+        return int(self.metadata["stanzas"])
+
+    def __contains__(self, stanza_id: object) -> bool:
+        return isinstance(stanza_id, str) and bool(self.locate(stanza_id))
+
+    def locate(self, stanza_id: str) -> list[tuple[str, int, int]]:
+        """
+        Return (stanza_type, offset, length) of each stanza with stanza_id,
+        in file order.
+        """
+        key = stanza_id.encode(self.encoding)
+        mapped = self.mapped
+        # find the first line whose id is not less than key by bisection
+        # over byte positions, moving each position to the start of a line
+        low, high = self.start, len(mapped)
+        while low < high:
+            middle = (low + high) // 2
+            line_start = mapped.rfind(b"\n", self.start - 1, middle) + 1
+            line_end = mapped.find(b"\n", line_start)
+            if mapped[line_start : mapped.find(b"\t", line_start)] < key:
+                low = line_end + 1
+            else:
+                high = line_start
+        locations = []
+        while low < len(mapped):
+            line_end = mapped.find(b"\n", low)
+            line_id, stanza_type, offset, length = mapped[low:line_end].split(b"\t")
+            if line_id != key:
+                break
+            locations.append((stanza_type.decode(), int(offset), int(length)))
+            low = line_end + 1
+        return locations
+
+    def get_stanzas(
+        self, stanza_id: str, include_clauses: bool = False
+    ) -> list[Stanza]:
+        """
+        Return the parsed stanzas with stanza_id, in file order.
+        """
+        stanzas = []
+        with open(self.path, "rb") as read_file:
+            for stanza_type, offset, length in self.locate(stanza_id):
+                read_file.seek(offset)
+                data = read_file.read(length)
+                # translate newlines like iter_mapped_text, and only split
+                # lines at newlines, which str.splitlines does not
+                if b"\r" in data:
+                    data = data.replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+                lines = strip_blank_lines(data.decode(self.encoding).split("\n"))
+                tag_singularity = stanza_tag_singularity[stanza_type]
+                tags = parse_stanza(
+                    lines[1:], tag_singularity, include_clauses=include_clauses
+                )
+                stanzas.append(Stanza(stanza_type, tags))
+        return stanzas
+
+
+stanza_tag_singularity = {
+    stanza_type: tag_singularity for _, stanza_type, tag_singularity in stanza_types
+}
+
+
+def get_term(
+    path: str | os.PathLike[str],
+    term_id: str,
+    encoding: str = "utf-8",
+    index_path: str | os.PathLike[str] | None = None,
+) -> dict[str, Any] | None:
+    """
+    Return the tags of the term with term_id in the local uncompressed OBO
+    file at path, as they are stored as node attributes by read_obo, or
+    None when there is no such term. Tags of terms defined by several
+    stanzas are combined. Obsolete terms are returned. The sidecar index at
+    index_path is built on the first lookup, and when path changes, as
+    described in StanzaIndex.open.
+    """
+    with StanzaIndex.open(path, index_path=index_path, encoding=encoding) as index:
+        stanzas = [s for s in index.get_stanzas(term_id) if s.stanza_type == "Term"]
+    if not stanzas:
+        return None
+    term: dict[str, Any] = {}
+    for stanza in stanzas:
+        stanza.tags.pop("id", None)
+        term.update(stanza.tags)
+    return term
+
+
+def is_index_current(
+    path: str | os.PathLike[str], index_path: str | os.PathLike[str]
+) -> bool:
+    """
+    Return whether the sidecar at index_path was built for the current size
+    and modification time of path.
+    """
+    try:
+        with open(index_path, "rb") as read_file:
+            metadata = json.loads(read_file.readline())
+    except (OSError, ValueError):
+        return False
+    stat = os.stat(path)
+    return (
+        isinstance(metadata, dict)
+        and metadata.get("version") == index_format_version
+        and metadata.get("size") == stat.st_size
+        and metadata.get("mtime_ns") == stat.st_mtime_ns
+    )
+
+
+def build_stanza_index(
+    path: str | os.PathLike[str], index_path: str | os.PathLike[str]
+) -> int:
+    """
+    Scan the OBO file at path and write the sidecar index of its stanzas to
+    index_path, replacing any existing index. Returns the number of
+    indexed stanzas.
+    """
+    stat = os.stat(path)
+    with paused_gc():
+        entries = sorted(iter_stanza_offsets(path))
+    metadata = {
+        "version": index_format_version,
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "stanzas": len(entries),
+    }
+    directory = os.path.dirname(os.path.abspath(index_path))
+    with tempfile.NamedTemporaryFile(
+        dir=directory, suffix=".tmp", delete=False
+    ) as write_file:
+        write_file.write(json.dumps(metadata).encode() + b"\n")
+        write_file.writelines(b"%s\t%s\t%d\t%d\n" % entry for entry in entries)
+    os.replace(write_file.name, index_path)
+    return len(entries)
+
+
+def iter_stanza_offsets(
+    path: str | os.PathLike[str],
+) -> Iterator[tuple[bytes, bytes, int, int]]:
+    """
+    Yield (id, stanza_type, offset, length) for each Term, Typedef and
+    Instance stanza with an id in the file at path. A stanza ends at the
+    first blank line or at the start of the next stanza, like the blocks
+    parsed by iter_stanzas.
+    """
+    with open(path, "rb") as read_file:
+        if os.fstat(read_file.fileno()).st_size == 0:
+            return
+        with mmap.mmap(read_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            # prefix a newline to match a stanza at the start of the file
+            first = stanza_start_pattern.match(b"\n" + mapped[:4096])
+            matches = [(0, first.group(1), first.group(2))] if first else []
+            matches.extend(
+                (match.start(1), match.group(1), match.group(2))
+                for match in stanza_start_pattern.finditer(mapped, 1)
+            )
+            ends = [start for start, _, _ in matches[1:]] + [len(mapped)]
+            for (start, lines, stanza_type), end in zip(matches, ends, strict=True):
+                blank_line = blank_line_pattern.search(mapped, start, end)
+                if blank_line is not None:
+                    end = blank_line.start() + 1
+                id_line = lines.partition(b"\n")[2]
+                if not id_line:
+                    id_match = id_line_pattern.search(mapped, start, end)
+                    if id_match is None:
+                        continue
+                    id_line = id_match.group()
+                # latin-1 maps bytes to characters one to one, so the id is
+                # stored with the bytes it has in the encoding of the file
+                _, stanza_id, _, _ = split_tag_line(id_line.decode("latin-1"))
+                if "\t" not in stanza_id:
+                    yield stanza_id.encode("latin-1"), stanza_type, start, end - start
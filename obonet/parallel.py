@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import collections
+import io
+import itertools
+import os
+from collections.abc import Callable, Collection, Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any
+
+from .io import (
+    PathType,
+    can_map_file,
+    is_local_uncompressed,
+    is_regular_file,
+    open_read_file,
+)
+from .read import (
+    Stanza,
+    get_tag_filters,
+    iter_block_stanzas,
+    iter_mapped_text,
+    iter_sections,
+    iter_text_blocks,
+)
+
+# Upper bound on the number of bytes (or lines, when reading from a stream)
+# parsed by a single task. Smaller chunks balance load across workers and
+# bound the memory held by pending results.
+max_chunk_bytes = 4 * 2**20
+max_chunk_lines = 100_000
+
+
+def iter_stanzas_parallel(
+    path_or_file: PathType,
+    workers: int,
+    encoding: str | None = "utf-8",
+    include_clauses: bool = False,
+    include_tags: Collection[str] | None = None,
+    exclude_tags: Collection[str] | None = None,
+) -> Iterator[Stanza]:
+    """
+    Yield stanzas parsed by a pool of worker processes, in the same order as
+    they appear in the file. Local uncompressed regular files are split
+    into byte ranges at blank lines, which workers read and parse
+    independently. Other inputs, including pipes, are read by the calling
+    process and sent to workers in batches of lines.
+    """
+    include_tags, exclude_tags = get_tag_filters(include_tags, exclude_tags)
+    parse_options = include_clauses, include_tags, exclude_tags
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        if is_local_uncompressed(path_or_file) and is_regular_file(path_or_file):
+            path = os.fspath(path_or_file)  # type: ignore [arg-type]
+            tasks: Iterable[tuple[Any, ...]] = (
+                (path, start, end, encoding, *parse_options)
+                for start, end in get_byte_chunks(path, workers)
+            )
+            yield from _map_ordered(executor, _parse_byte_range, tasks, workers)
+            return
+        with open_read_file(path_or_file, encoding=encoding) as obo_file:
+            tasks = (
+                (lines, *parse_options)
+                for lines in iter_line_chunks(obo_file, max_chunk_lines)
+            )
+            yield from _map_ordered(executor, _parse_lines, tasks, workers)
+
+
+def get_byte_chunks(path: str, n_chunks: int) -> list[tuple[int, int]]:
+    """
+    Return (start, end) byte offsets that split the file at path into
+    approximately n_chunks ranges (more if ranges would exceed
+    max_chunk_bytes). Every range ends immediately after a blank line or at
+    the end of the file, so no stanza spans two ranges.
+    """
+    size = os.path.getsize(path)
+    chunk_size = max(1, min(max_chunk_bytes, -(-size // max(n_chunks, 1))))
+    boundaries = [0]
+    with open(path, "rb") as read_file:
+        while boundaries[-1] < size:
+            read_file.seek(boundaries[-1] + chunk_size)
+            # discard the remainder of the line containing the target offset
+            read_file.readline()
+            while True:
+                line = read_file.readline()
+                if not line or not line.strip():
+                    break
+            boundaries.append(min(read_file.tell(), size))
+    return list(itertools.pairwise(boundaries))
+
+
+def iter_line_chunks(lines: Iterable[str], chunk_lines: int) -> Iterator[list[str]]:
+    """
+    Group lines into lists of at least chunk_lines lines (except for the
+    last list), splitting only after blank lines.
+    """
+    chunk: list[str] = []
+    for line in lines:
+        chunk.append(line)
+        if len(chunk) >= chunk_lines and not line.strip():
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _parse_byte_range(
+    path: str,
+    start: int,
+    end: int,
+    encoding: str | None,
+    *parse_options: Any,
+) -> list[Stanza]:
+    if encoding is not None and can_map_file(path, encoding):
+        blocks = iter_text_blocks(iter_mapped_text(path, encoding, start, end))
+        return list(iter_block_stanzas(blocks, *parse_options))
+    with open(path, "rb") as read_file:
+        read_file.seek(start)
+        data = read_file.read(end - start)
+    lines = io.TextIOWrapper(io.BytesIO(data), encoding=encoding)
+    return _parse_lines(lines, *parse_options)
+
+
+def _parse_lines(
+    lines: Iterable[str],
+    include_clauses: bool,
+    include_tags: frozenset[str] | None,
+    exclude_tags: frozenset[str] | None,
+) -> list[Stanza]:
+    stanzas = iter_sections(
+        lines,
+        include_clauses=include_clauses,
+        include_tags=include_tags,
+        exclude_tags=exclude_tags,
+    )
+    return list(stanzas)
+
+
+def _map_ordered(
+    executor: ProcessPoolExecutor,
+    function: Callable[..., list[Stanza]],
+    tasks: Iterable[tuple[Any, ...]],
+    workers: int,
+) -> Iterator[Stanza]:
+    """
+    Submit tasks to executor, keeping at most twice as many tasks pending as
+    there are workers, and yield stanzas from the results in task order.
+    """
+    pending: collections.deque[Future[list[Stanza]]] = collections.deque()
+    for task in tasks:
+        pending.append(executor.submit(function, *task))
+        if len(pending) >= 2 * workers:
+            yield from pending.popleft().result()
+    while pending:
+        yield from pending.popleft().result()
@@ -0,0 +1,163 @@
+"""
+Timing and size statistics for read_obo.
+
+Pass a ReadStats to read_obo(..., stats=ReadStats()) to record where the
+time of a load is spent: reading (including download and decompression),
+parsing stanzas, and building the graph.
+"""
+
+from __future__ import annotations
+
+import collections
+import sys
+import time
+from collections.abc import Collection, Iterable, Iterator
+from dataclasses import dataclass, field
+from typing import Any
+
+from .read import Stanza, keep_tag, uses_tag_line_regex
+
+# Phases in the order they occur, with the seconds spent in each stored in
+# ReadStats.phase_seconds. "parse" excludes the time spent reading the lines
+# being parsed and "build" excludes the time spent producing stanzas.
+phases = ("cache", "read", "parse", "build", "total")
+
+
+@dataclass
+class ReadStats:
+    """
+    Statistics of a single read_obo call, filled in as the ontology is read.
+    When read_obo parses with workers, lines are split and parsed in worker
+    processes, such that characters, lines, tag_lines and regex_fallbacks
+    are not counted and read time is included in parse time.
+    peak_memory_bytes is the peak resident set size of the process, or None
+    on platforms without the resource module.
+    """
+
+    phase_seconds: dict[str, float] = field(default_factory=dict)
+    characters: int = 0
+    lines: int = 0
+    tag_lines: int = 0
+    regex_fallbacks: int = 0
+    stanzas: collections.Counter[str] = field(default_factory=collections.Counter)
+    nodes: int = 0
+    edges: int = 0
+    peak_memory_bytes: int | None = None
+
+    def add_seconds(self, phase: str, seconds: float) -> None:
+        self.phase_seconds[phase] = self.phase_seconds.get(phase, 0.0) + seconds
+
+    def count_block(
+        self,
+        block: list[str],
+        include_tags: Collection[str] | None = None,
+        exclude_tags: Collection[str] | None = None,
+    ) -> None:
+        """
+        Count the lines of a stanza, given as a block of non-blank lines,
+        the tag lines that are parsed rather than skipped by include_tags
+        and exclude_tags, and those that split_tag_line parses with the
+        regex.
+        """
+        self.lines += len(block)
+        filter_tags = include_tags is not None or exclude_tags is not None
+        for line in block:
+            if line.startswith(("!", "[")):
+                continue
+            if filter_tags and not keep_tag(
+                line.partition(":")[0], include_tags, exclude_tags
+            ):
+                continue
+            self.tag_lines += 1
+            if uses_tag_line_regex(line):
+                self.regex_fallbacks += 1
+
+    def finish(self, graph: Any, total_seconds: float) -> None:
+        """
+        Record graph size, memory use and total time once the graph is built.
+        Parse time is reduced by the nested read time, and build time is the
+        remainder of the total.
+        """
+        seconds = self.phase_seconds
+        seconds["total"] = total_seconds
+        if "parse" in seconds:
+            seconds["parse"] = max(0.0, seconds["parse"] - seconds.get("read", 0.0))
+            other = sum(seconds.get(phase, 0.0) for phase in ("cache", "read", "parse"))
+            seconds["build"] = max(0.0, total_seconds - other)
+        self.nodes = graph.number_of_nodes()
+        self.edges = graph.number_of_edges()
+        self.peak_memory_bytes = get_peak_memory_bytes()
+
+    def summary(self) -> str:
+        """
+        Return a human-readable multi-line summary of the statistics.
+        """
+        lines = []
+        for phase in phases:
+            if phase in self.phase_seconds:
+                lines.append(f"{phase} time: {self.phase_seconds[phase]:.3f} s")
+        if self.characters:
+            parse_seconds = self.phase_seconds.get("parse", 0.0)
+            read_seconds = self.phase_seconds.get("read", 0.0)
+            rate = self.characters / max(parse_seconds + read_seconds, 1e-9)
+            lines.append(
+                f"characters: {self.characters:,} ({rate / 1e6:.1f} M characters/s)"
+            )
+        if self.lines:
+            lines.append(f"lines: {self.lines:,}")
+            lines.append(
+                f"tag lines: {self.tag_lines:,} "
+                f"({self.regex_fallbacks:,} regex fallbacks)"
+            )
+        for stanza_type, count in self.stanzas.items():
+            lines.append(f"{stanza_type} stanzas: {count:,}")
+        lines.append(f"nodes: {self.nodes:,}")
+        lines.append(f"edges: {self.edges:,}")
+        if self.peak_memory_bytes is not None:
+            lines.append(f"peak memory: {self.peak_memory_bytes / 2**20:,.1f} MiB")
+        return "\n".join(lines)
+
+
+def iter_timed_text(chunks: Iterable[str], stats: ReadStats) -> Iterator[str]:
+    """
+    Yield lines or chunks of text, adding the time spent producing them to
+    the read phase and their length to stats.characters.
+    """
+    iterator = iter(chunks)
+    while True:
+        start = time.perf_counter()
+        chunk = next(iterator, None)
+        stats.add_seconds("read", time.perf_counter() - start)
+        if chunk is None:
+            return
+        stats.characters += len(chunk)
+        yield chunk
+
+
+def iter_timed_stanzas(stanzas: Iterable[Stanza], stats: ReadStats) -> Iterator[Stanza]:
+    """
+    Yield stanzas, adding the time spent producing them to the parse phase
+    and counting them by stanza type.
+    """
+    iterator = iter(stanzas)
+    while True:
+        start = time.perf_counter()
+        stanza = next(iterator, None)
+        stats.add_seconds("parse", time.perf_counter() - start)
+        if stanza is None:
+            return
+        stats.stanzas[stanza.stanza_type] += 1
+        yield stanza
+
+
+def get_peak_memory_bytes() -> int | None:
+    """
+    Return the peak resident set size of the current process in bytes.
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
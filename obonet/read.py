@@ -1,15 +1,25 @@
 from __future__ import annotations
 
+import contextlib
+import gc
 import itertools
 import logging
+import os
 import re
-from collections.abc import Iterator
-from dataclasses import asdict, dataclass
-from typing import Any
+import sys
+import time
+from collections.abc import Callable, Collection, Iterable, Iterator, Mapping
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
 
-import networkx
+from .io import PathType, can_map_file, iter_mapped_chunks, open_read_file
 
-from .io import PathType, open_read_file
+if TYPE_CHECKING:
+    import networkx
+
+    from .ids import IdIndex
+    from .profile import ReadStats
+    from .search import SearchIndex
 
 logger = logging.getLogger(__name__)
 
@@ -19,6 +29,16 @@ def read_obo(
     ignore_obsolete: bool = True,
     encoding: str | None = "utf-8",
     include_clauses: bool = False,
+    workers: int | None = None,
+    cache_dir: str | os.PathLike[str] | None = None,
+    include_tags: Collection[str] | None = None,
+    exclude_tags: Collection[str] | None = None,
+    compact: bool = False,
+    closure: Collection[str] | None = None,
+    id_index: bool = False,
+    stats: ReadStats | None = None,
+    resolve_imports: bool = False,
+    search_index: bool = False,
 ) -> networkx.MultiDiGraph[str]:
     """
     Return a networkx.MultiDiGraph of the ontology serialized by the
@@ -39,46 +59,634 @@ def read_obo(
         The character set encoding to use for path_or_file when path_or_file
         is a path/URL. Set to None for platform-dependent locale default.
     include_clauses : boolean
-        When true, include full parsed OBO clauses under the "_clauses" key.
+        When true, include full parsed OBO clauses under the "_clauses" key,
+        as a read-only obonet.read.Clauses mapping whose lines are parsed
+        when it is first accessed.
+    workers : int or None
+        When greater than 1, parse stanzas in a pool of this many worker
+        processes. The resulting graph is identical to the one produced by
+        serial parsing. Local uncompressed files benefit most, since workers
+        read their share of the file directly.
+    cache_dir : str, pathlike, or None
+        Directory for a persistent cache of parsed graphs. When set, the
+        graph for a path or URL is loaded from the cache if the source is
+        unchanged, and otherwise parsed and stored in the cache. Local files
+        with the size and modification time of the cached file are assumed
+        unchanged without reading them, so an edit that keeps both, such as
+        within the timestamp resolution of the filesystem, returns the stale
+        cached graph. When only the modification time differs, the content
+        hash is compared. URLs are validated by the ETag and Last-Modified
+        headers of a HEAD request, and are not cached when it fails. Open
+        file objects and paths that are not regular files, such as pipes,
+        are never cached.
+    include_tags : collection of str or None
+        When set, only parse and store these tags from Term, Typedef and
+        Instance stanzas. Other tag lines are skipped before parsing. The
+        header is always fully parsed. The "id" tag is always included, as
+        is "is_obsolete" when ignore_obsolete is true. Edges are only
+        created for "is_a" and "relationship" tags that are parsed.
+    exclude_tags : collection of str or None
+        Tags to skip in Term, Typedef and Instance stanzas, such as "def"
+        or "xref". Applied after include_tags.
+    compact : boolean
+        When true, store node attributes in read-only obonet.compact.TagRecord
+        mappings, which use much less memory than dicts. Multi-valued tags
+        are stored as tuples, and tag names, term identifiers, edge keys and
+        repeated values such as namespaces are interned.
+    closure : collection of str or None
+        Relations, such as ["is_a", "part_of"], over which to precompute the
+        ancestors of every term. When set, an obonet.closure.ClosureIndex is
+        stored in the "closure" graph attribute. See build_closure. Raises
+        ValueError when include_tags or exclude_tags skip the tags that the
+        closure needs, such as is_a, or relationship for other relations.
+    id_index : boolean
+        When true, store an obonet.ids.IdIndex in the "id_index" graph
+        attribute, which resolves alt_id values and obsolete terms with a
+        replaced_by tag to primary ids, including obsolete terms that are
+        not added to the graph. When include_tags or exclude_tags are set,
+        the alt_id, is_obsolete, replaced_by and consider tags are parsed
+        to build the index, but only stored as attributes when they pass
+        the filters.
+    stats : obonet.profile.ReadStats or None
+        When set, record the time spent reading, parsing and building the
+        graph, together with counts of characters, lines, stanzas, nodes and
+        edges, in stats. Profiling adds some overhead to reading and parsing.
+    resolve_imports : boolean
+        When true, also read the ontologies listed by "import" header tags,
+        recursively, and add their terms, typedefs and instances to the
+        graph. Imports are paths relative to the importing file, URLs, or
+        ontology identifiers, which are read from the OBO library. Each
+        ontology is read once, even when imports form a cycle, and imports
+        other than OBO files are skipped. Imports are read concurrently, in
+        threads or in worker processes when workers is greater than 1. The
+        typedefs, instances and term tags of an ontology take precedence
+        over those of the ontologies it imports. Graph attributes are taken
+        from the header of path_or_file. Graphs with imports are not cached.
+    search_index : boolean
+        When true, store an obonet.search.SearchIndex in the "search_index"
+        graph attribute, for exact, prefix and fuzzy text queries over the
+        name, synonym and alt_id tags of the terms in the graph. When
+        include_tags or exclude_tags are set, these tags are parsed to build
+        the index, but only stored as attributes when they pass the filters.
+        See build_search_index.
     """
-    with open_read_file(path_or_file, encoding=encoding) as obo_file:
-        typedefs, terms, instances, header = get_sections(
-            obo_file, include_clauses=include_clauses
+    start = time.perf_counter()
+    if closure:
+        check_closure_tags(closure, include_tags, exclude_tags)
+    required_tags = get_required_tags(ignore_obsolete, id_index, search_index)
+    index_only_tags = get_index_only_tags(
+        required_tags, include_tags, exclude_tags, ignore_obsolete
+    )
+    include_tags, exclude_tags = keep_tags(include_tags, exclude_tags, required_tags)
+    cache_entry = None
+    if cache_dir is not None and not resolve_imports:
+        from .cache import load_cache_entry
+
+        options = {
+            "ignore_obsolete": ignore_obsolete,
+            "encoding": encoding,
+            "include_clauses": include_clauses,
+            "include_tags": include_tags,
+            "exclude_tags": exclude_tags,
+            "compact": compact,
+            "closure": closure,
+            "id_index": id_index,
+            "search_index": search_index,
+        }
+        cache_entry, graph = load_cache_entry(cache_dir, path_or_file, options)
+        if stats is not None:
+            stats.add_seconds("cache", time.perf_counter() - start)
+        if graph is not None:
+            if stats is not None:
+                stats.finish(graph, time.perf_counter() - start)
+            return graph
+    stanzas = iter_stanzas(
+        path_or_file,
+        encoding=encoding,
+        include_clauses=include_clauses,
+        workers=workers,
+        include_tags=include_tags,
+        exclude_tags=exclude_tags,
+        stats=stats,
+    )
+    if resolve_imports:
+        from .imports import iter_import_stanzas
+
+        stanzas = iter_import_stanzas(
+            path_or_file,
+            stanzas,
+            encoding=encoding,
+            include_clauses=include_clauses,
+            workers=workers,
+            include_tags=include_tags,
+            exclude_tags=exclude_tags,
+        )
+    if stats is not None:
+        from .profile import iter_timed_stanzas
+
+        stanzas = iter_timed_stanzas(stanzas, stats)
+    graph = build_graph(
+        stanzas,
+        ignore_obsolete=ignore_obsolete,
+        compact=compact,
+        closure=closure,
+        id_index=id_index,
+        search_index=search_index,
+        index_only_tags=index_only_tags,
+    )
+    if cache_entry is not None:
+        cache_entry.store(graph)
+    if stats is not None:
+        stats.finish(graph, time.perf_counter() - start)
+    return graph
+
+
+def get_required_tags(
+    ignore_obsolete: bool, id_index: bool, search_index: bool
+) -> set[str]:
+    """
+    Return the tags that read_obo must parse for these options.
+    """
+    required_tags = {"is_obsolete"} if ignore_obsolete else set()
+    if id_index:
+        from .ids import id_index_tags
+
+        required_tags |= id_index_tags
+    if search_index:
+        from .search import search_index_tags
+
+        required_tags |= search_index_tags
+    return required_tags
+
+
+def check_closure_tags(
+    closure: Collection[str],
+    include_tags: Collection[str] | None,
+    exclude_tags: Collection[str] | None,
+) -> None:
+    """
+    Raise ValueError when include_tags and exclude_tags skip tags that are
+    needed to build the closure over the relations of closure.
+    """
+    from .closure import get_closure_tags
+
+    skipped = sorted(
+        tag
+        for tag in get_closure_tags(closure)
+        if not keep_tag(tag, include_tags, exclude_tags)
+    )
+    if skipped:
+        message = (
+            f"closure={sorted(closure)} requires the {', '.join(skipped)} tags, "
+            "which include_tags and exclude_tags skip"
         )
+        raise ValueError(message)
+
+
+def get_index_only_tags(
+    required_tags: Collection[str],
+    include_tags: Collection[str] | None,
+    exclude_tags: Collection[str] | None,
+    ignore_obsolete: bool,
+) -> frozenset[str]:
+    """
+    Return the tags of required_tags that are only parsed to build indexes,
+    since include_tags or exclude_tags skip them. is_obsolete is always
+    kept when ignore_obsolete is true.
+    """
+    return frozenset(
+        tag
+        for tag in required_tags
+        if not keep_tag(tag, include_tags, exclude_tags)
+        and not (ignore_obsolete and tag == "is_obsolete")
+    )
+
+
+def keep_tags(
+    include_tags: Collection[str] | None,
+    exclude_tags: Collection[str] | None,
+    tags: Collection[str],
+) -> tuple[Collection[str] | None, Collection[str] | None]:
+    """
+    Return include_tags and exclude_tags adjusted such that tags are parsed.
+    """
+    if include_tags is not None:
+        include_tags = {*include_tags, *tags}
+    if exclude_tags is not None:
+        exclude_tags = set(exclude_tags).difference(tags)
+    return include_tags, exclude_tags
+
+
+def build_graph(
+    stanzas: Iterable[Stanza],
+    ignore_obsolete: bool = True,
+    compact: bool = False,
+    closure: Collection[str] | None = None,
+    id_index: bool = False,
+    search_index: bool = False,
+    index_only_tags: Collection[str] = (),
+) -> networkx.MultiDiGraph[str]:
+    """
+    Return a networkx.MultiDiGraph from an iterable of stanzas, such as
+    those yielded by iter_stanzas. Terms are added to the graph as they are
+    consumed, so the full list of parsed terms is never held in memory.
+    Edges are added after all terms, such that node order matches the
+    order of terms in the ontology. See read_obo for compact, closure,
+    id_index and search_index. index_only_tags are removed from the tags
+    of terms, typedefs and instances once the indexes are updated.
+    """
+    import networkx
+
+    typedefs: list[dict[str, Any]] = []
+    instances: list[dict[str, Any]] = []
+    header = None
+    graph = networkx.MultiDiGraph(typedefs=typedefs, instances=instances)
+    compactor = None
+    if compact:
+        from .compact import TagCompactor
+
+        compactor = TagCompactor()
+    ids, texts = add_term_indexes(graph, id_index, search_index)
+
+    edge_tuples: list[tuple[str, str, str]] = []
+
+    with paused_gc():
+        for stanza in stanzas:
+            if stanza.stanza_type == "header":
+                header = stanza.tags
+                continue
+            if stanza.stanza_type == "Typedef":
+                typedefs.append(remove_tags(stanza.tags, index_only_tags))
+                continue
+            if stanza.stanza_type == "Instance":
+                instances.append(remove_tags(stanza.tags, index_only_tags))
+                continue
+            term = stanza.tags
+            if ids is not None:
+                ids.add_term(term["id"], term)
+            is_obsolete = term.get("is_obsolete", "false") == "true"
+            if ignore_obsolete and is_obsolete:
+                continue
+            term_id = term.pop("id")
+            if texts is not None:
+                texts.add_term(term_id, term)
+            remove_tags(term, index_only_tags)
+            add_node_data(graph, term_id, term, compactor=compactor)
+            edge_tuples.extend(get_term_edges(term_id, term, intern=compact))
+
+        graph.graph.update(get_graph_attributes(header))
+        add_edge_keys(graph, edge_tuples)
+
+    if closure:
+        from .closure import build_closure
+
+        graph.graph["closure"] = build_closure(graph, closure)
+    return graph
+
 
+def remove_tags(tags: dict[str, Any], removed_tags: Collection[str]) -> dict[str, Any]:
+    """
+    Remove removed_tags from tags, and from their clauses, and return tags.
+    """
+    if not removed_tags:
+        return tags
+    for tag in removed_tags:
+        tags.pop(tag, None)
+    clauses = tags.get("_clauses")
+    if isinstance(clauses, Clauses):
+        lines = clauses.text.split("\n")
+        tags["_clauses"] = Clauses(
+            "\n".join(
+                line for line in lines if line.partition(":")[0] not in removed_tags
+            )
+        )
+    return tags
+
+
+def add_term_indexes(
+    graph: networkx.MultiDiGraph[str], id_index: bool, search_index: bool
+) -> tuple[IdIndex | None, SearchIndex | None]:
+    """
+    Create the requested indexes of terms, store them as graph attributes
+    and return them, with None for indexes that are not requested.
+    """
+    ids = texts = None
+    if id_index:
+        from .ids import IdIndex
+
+        ids = graph.graph["id_index"] = IdIndex()
+    if search_index:
+        from .search import SearchIndex
+
+        texts = graph.graph["search_index"] = SearchIndex()
+    return ids, texts
+
+
+def get_term_edges(
+    term_id: str, term: Mapping[str, Any], intern: bool = False
+) -> list[tuple[str, str, str]]:
+    """
+    Return (source, target, key) edges for the is_a and relationship tags
+    of a term. When intern is true, targets and relationship types are
+    interned.
+    """
+    edge_tuples = []
+    for target_term in term.get("is_a", []):
+        edge_tuple = term_id, target_term, "is_a"
+        edge_tuples.append(edge_tuple)
+
+    for relationship in term.get("relationship", []):
+        typedef, target_term = relationship.split(" ")
+        edge_tuple = term_id, target_term, typedef
+        edge_tuples.append(edge_tuple)
+
+    if intern:
+        edge_tuples = [
+            (term_id, sys.intern(target), sys.intern(key))
+            for _, target, key in edge_tuples
+        ]
+    return edge_tuples
+
+
+# The following functions write to the adjacency dictionaries of a
+# networkx.MultiDiGraph directly, mirroring MultiDiGraph.add_node and
+# MultiDiGraph.add_edge without their per-call overhead and attribute copies.
+
+
+def add_node_data(
+    graph: networkx.MultiDiGraph[str],
+    node: str,
+    data: dict[str, Any],
+    compactor: Callable[[Mapping[str, Any]], Mapping[str, Any]] | None = None,
+) -> None:
+    """
+    Add node to graph using data as its attribute dictionary, without
+    copying data. If node is already in graph, update its attributes.
+    When compactor is set, store compactor(data) instead of data.
+    """
+    node_data = graph._node
+    if node in node_data:
+        if compactor is None:
+            node_data[node].update(data)
+        else:
+            node_data[node] = compactor({**node_data[node], **data})
+        return
+    if compactor is not None:
+        node = sys.intern(node)
+    graph._succ[node] = graph.adjlist_inner_dict_factory()
+    graph._pred[node] = graph.adjlist_inner_dict_factory()
+    node_data[node] = data if compactor is None else compactor(data)
+
+
+def add_edge_keys(
+    graph: networkx.MultiDiGraph[str], edge_tuples: Iterable[tuple[str, str, str]]
+) -> None:
+    """
+    Add (source, target, key) edges without attributes to graph. Nodes that
+    are not yet in graph are added without attributes. Adding an edge that
+    already exists with the same key has no effect.
+    """
+    node_data, succ, pred = graph._node, graph._succ, graph._pred
+    for source, target, key in edge_tuples:
+        key_dict = succ[source].get(target)
+        if key_dict is None:
+            if target not in succ:
+                succ[target] = graph.adjlist_inner_dict_factory()
+                pred[target] = graph.adjlist_inner_dict_factory()
+                node_data[target] = graph.node_attr_dict_factory()
+            key_dict = graph.edge_key_dict_factory()
+            succ[source][target] = key_dict
+            pred[target][source] = key_dict
+        if key not in key_dict:
+            key_dict[key] = graph.edge_attr_dict_factory()
+
+
+@contextlib.contextmanager
+def paused_gc() -> Iterator[None]:
+    """
+    Disable cyclic garbage collection within the context. Parsing allocates
+    many containers but creates no reference cycles, so collection passes
+    triggered by the allocations only cost time.
+    """
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+
+def get_graph_attributes(header: dict[str, Any] | None) -> dict[str, Any]:
+    """
+    Return graph-level attributes from the parsed header, setting "name"
+    from the ontology tag when available.
+    """
+    if header is None:
+        logger.warning("got no header information")
+        header = {}
     if "ontology" in header:
         header["name"] = header.get("ontology")
     if "name" not in header:
         logging.warning("name and ontology keys are both missing")
-    graph = networkx.MultiDiGraph(typedefs=typedefs, instances=instances, **header)
+    return header
 
-    edge_tuples = []
 
-    for term in terms:
-        is_obsolete = term.get("is_obsolete", "false") == "true"
-        if ignore_obsolete and is_obsolete:
-            continue
-        term_id = term.pop("id")
-        graph.add_node(term_id, **term)
+@dataclass(frozen=True)
+class Stanza:
+    """
+    A single parsed OBO stanza. stanza_type is "Term", "Typedef" or
+    "Instance" for the corresponding stanzas and "header" for the header
+    frame. tags is the dictionary returned by parse_stanza.
+    """
+
+    stanza_type: str
+    tags: dict[str, Any]
+
+
+def iter_stanzas(
+    path_or_file: PathType,
+    encoding: str | None = "utf-8",
+    include_clauses: bool = False,
+    workers: int | None = None,
+    include_tags: Collection[str] | None = None,
+    exclude_tags: Collection[str] | None = None,
+    stats: ReadStats | None = None,
+) -> Iterator[Stanza]:
+    """
+    Yield the stanzas of the ontology serialized by the specified path or
+    file one at a time, without building a graph or materializing the list
+    of terms. See read_obo for a description of the parameters. When stats
+    is set, the time spent reading is recorded, together with counts of
+    characters and lines.
+    """
+    if stats is not None:
+        from .profile import iter_timed_text
+    if workers is not None and workers > 1:
+        from .parallel import iter_stanzas_parallel
 
-        for target_term in term.pop("is_a", []):
-            edge_tuple = term_id, "is_a", target_term
-            edge_tuples.append(edge_tuple)
+        yield from iter_stanzas_parallel(
+            path_or_file,
+            workers=workers,
+            encoding=encoding,
+            include_clauses=include_clauses,
+            include_tags=include_tags,
+            exclude_tags=exclude_tags,
+        )
+        return
+    if encoding is not None and can_map_file(path_or_file, encoding):
+        chunks: Iterable[str] = iter_mapped_text(path_or_file, encoding)
+        if stats is not None:
+            chunks = iter_timed_text(chunks, stats)
+        yield from iter_block_stanzas(
+            iter_text_blocks(chunks),
+            include_clauses=include_clauses,
+            include_tags=include_tags,
+            exclude_tags=exclude_tags,
+            stats=stats,
+        )
+        return
+    open_start = time.perf_counter()
+    with open_read_file(path_or_file, encoding=encoding) as obo_file:
+        lines: Iterable[str] = obo_file
+        if stats is not None:
+            stats.add_seconds("read", time.perf_counter() - open_start)
+            lines = iter_timed_text(obo_file, stats)
+        yield from iter_sections(
+            lines,
+            include_clauses=include_clauses,
+            include_tags=include_tags,
+            exclude_tags=exclude_tags,
+            stats=stats,
+        )
 
-        for relationship in term.pop("relationship", []):
-            typedef, target_term = relationship.split(" ")
-            edge_tuple = term_id, typedef, target_term
-            edge_tuples.append(edge_tuple)
 
-    for term0, typedef, term1 in edge_tuples:
-        graph.add_edge(term0, term1, key=typedef)
+def iter_mapped_text(
+    path: str | os.PathLike[str],
+    encoding: str,
+    start: int = 0,
+    end: int | None = None,
+) -> Iterator[str]:
+    """
+    Yield the decoded text of the local uncompressed file at path from byte
+    offset start to end in chunks that end with a newline, reading the file
+    through a memory map. Newlines are translated like a text file in
+    universal newlines mode.
+    """
+    for chunk in iter_mapped_chunks(path, start=start, end=end):
+        if b"\r" in chunk:
+            chunk = chunk.replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+        yield chunk.decode(encoding)
 
-    return graph
+
+# one or more blank lines, including the newline that ends the preceding line
+blank_lines_pattern = re.compile(r"\n(?:[^\S\n]*\n)+")
+
+
+def iter_text_blocks(chunks: Iterable[str]) -> Iterator[list[str]]:
+    """
+    Split text into blocks of consecutive non-blank lines, yielding each
+    block as a list of lines without newlines. Stanza boundaries are
+    located by splitting each chunk at blank lines, rather than testing
+    every line, and lines of a block that spans chunks are carried over.
+    """
+    remainder = ""
+    for chunk in chunks:
+        texts = blank_lines_pattern.split(remainder + chunk)
+        remainder = texts.pop()
+        for text in texts:
+            block = strip_blank_lines(text.split("\n"))
+            if block:
+                yield block
+    block = strip_blank_lines(remainder.split("\n"))
+    if block:
+        yield block
+
+
+def strip_blank_lines(lines: list[str]) -> list[str]:
+    """
+    Remove blank lines from the start and end of lines.
+    """
+    while lines and not lines[-1].strip():
+        lines.pop()
+    while lines and not lines[0].strip():
+        del lines[0]
+    return lines
+
+
+def iter_line_blocks(lines: Iterable[str]) -> Iterator[list[str]]:
+    """
+    Group lines into blocks of consecutive non-blank lines.
+    """
+    groups = itertools.groupby(lines, lambda line: line.strip() == "")
+    for is_blank, block in groups:
+        if not is_blank:
+            yield list(block)
+
+
+def iter_sections(
+    lines: Iterable[str],
+    include_clauses: bool = False,
+    include_tags: Collection[str] | None = None,
+    exclude_tags: Collection[str] | None = None,
+    stats: ReadStats | None = None,
+) -> Iterator[Stanza]:
+    """
+    Separates an obo file into stanzas and process.
+    Yields a Stanza for each stanza as soon as its lines are read.
+    include_tags and exclude_tags restrict the tags parsed from Term,
+    Typedef and Instance stanzas, see get_tag_filters.
+    """
+    yield from iter_block_stanzas(
+        iter_line_blocks(lines),
+        include_clauses=include_clauses,
+        include_tags=include_tags,
+        exclude_tags=exclude_tags,
+        stats=stats,
+    )
+
+
+def iter_block_stanzas(
+    blocks: Iterable[list[str]],
+    include_clauses: bool = False,
+    include_tags: Collection[str] | None = None,
+    exclude_tags: Collection[str] | None = None,
+    stats: ReadStats | None = None,
+) -> Iterator[Stanza]:
+    """
+    Yield a Stanza for each block of non-blank lines.
+    When stats is set, count the lines of each block.
+    """
+    include_tags, exclude_tags = get_tag_filters(include_tags, exclude_tags)
+    for block in blocks:
+        stanza_type_line = block[0]
+        for prefix, stanza_type, tag_singularity in stanza_types:
+            if stanza_type_line.startswith(prefix):
+                if stats is not None:
+                    stats.count_block(block, include_tags, exclude_tags)
+                stanza = parse_stanza(
+                    block[1:],
+                    tag_singularity,
+                    include_clauses=include_clauses,
+                    include_tags=include_tags,
+                    exclude_tags=exclude_tags,
+                )
+                yield Stanza(stanza_type, stanza)
+                break
+        else:
+            if stats is not None:
+                stats.count_block(block)
+            header = parse_stanza(
+                block, header_tag_singularity, include_clauses=include_clauses
+            )
+            yield Stanza("header", header)
 
 
 def get_sections(
-    lines: Iterator[str],
+    lines: Iterable[str],
     include_clauses: bool = False,
+    include_tags: Collection[str] | None = None,
+    exclude_tags: Collection[str] | None = None,
 ) -> tuple[
     list[dict[str, Any]], list[dict[str, Any]], list[dict[str, Any]], dict[str, Any]
 ]:
@@ -90,37 +698,44 @@ def get_sections(
     """
     typedefs, terms, instances = [], [], []
     header = None
-    groups = itertools.groupby(lines, lambda line: line.strip() == "")
-    for is_blank, stanza_lines_iter in groups:
-        if is_blank:
-            continue
-        stanza_type_line, *stanza_lines = stanza_lines_iter
-        if stanza_type_line.startswith("[Typedef]"):
-            typedef = parse_stanza(
-                stanza_lines, typedef_tag_singularity, include_clauses=include_clauses
-            )
-            typedefs.append(typedef)
-        elif stanza_type_line.startswith("[Term]"):
-            term = parse_stanza(
-                stanza_lines, term_tag_singularity, include_clauses=include_clauses
-            )
-            terms.append(term)
-        elif stanza_type_line.startswith("[Instance]"):
-            instance = parse_stanza(
-                stanza_lines, instance_tag_singularity, include_clauses=include_clauses
-            )
-            instances.append(instance)
+    stanzas = iter_sections(
+        lines,
+        include_clauses=include_clauses,
+        include_tags=include_tags,
+        exclude_tags=exclude_tags,
+    )
+    for stanza in stanzas:
+        if stanza.stanza_type == "Typedef":
+            typedefs.append(stanza.tags)
+        elif stanza.stanza_type == "Term":
+            terms.append(stanza.tags)
+        elif stanza.stanza_type == "Instance":
+            instances.append(stanza.tags)
         else:
-            stanza_lines = [stanza_type_line] + stanza_lines
-            header = parse_stanza(
-                stanza_lines, header_tag_singularity, include_clauses=include_clauses
-            )
+            header = stanza.tags
     if header is None:
         logger.warning("got no header information")
         header = {}
     return typedefs, terms, instances, header
 
 
+def get_tag_filters(
+    include_tags: Collection[str] | None,
+    exclude_tags: Collection[str] | None,
+) -> tuple[frozenset[str] | None, frozenset[str] | None]:
+    """
+    Return include_tags and exclude_tags as frozensets (or None when not
+    set). When include_tags is set, only those tags are parsed. Tags in
+    exclude_tags are never parsed. The "id" tag is always parsed, since
+    stanzas are identified by it.
+    """
+    if include_tags is not None:
+        include_tags = frozenset(include_tags) | {"id"}
+    if exclude_tags is not None:
+        exclude_tags = frozenset(exclude_tags) - {"id"}
+    return include_tags, exclude_tags
+
+
 # regular expression to parse key-value pair lines.
 tag_line_pattern = re.compile(
     r"""^
@@ -155,12 +770,64 @@ class TagLine:
     comment: str | None
 
 
+TagLineParts = tuple[str, str, str | None, str | None]
+
+
 def parse_tag_line(line: str) -> TagLine:
     """
     Take a line representing a single tag-value pair and parse
     the line into a TagLine(tag, value, trailing_modifier, comment).
     """
-    match = re.match(tag_line_pattern, line)
+    return TagLine(*split_tag_line(line))
+
+
+def split_tag_line(line: str) -> TagLineParts:
+    """
+    Split a tag line into a (tag, value, trailing_modifier, comment) tuple.
+    Lines whose value cannot contain a trailing modifier, comment or escape
+    sequence are split on the first colon by split_simple_tag_line. Other
+    lines fall back to split_tag_line_regex. Both paths return identical
+    results.
+    """
+    parts = split_simple_tag_line(line)
+    return split_tag_line_regex(line) if parts is None else parts
+
+
+def split_simple_tag_line(line: str) -> TagLineParts | None:
+    """
+    Split a tag line on the first colon, or return None when the value may
+    contain a trailing modifier, comment or escape sequence and the line
+    must be split with split_tag_line_regex.
+    """
+    tag, separator, value = line.partition(":")
+    if (
+        tag
+        and separator
+        and "{" not in value
+        and "!" not in value
+        and "\\" not in value
+        and "\n" not in tag
+    ):
+        value = value.strip()
+        if "\n" not in value:
+            return tag, value, None, None
+    return None
+
+
+def uses_tag_line_regex(line: str) -> bool:
+    """
+    Return whether split_tag_line splits line with split_tag_line_regex
+    rather than on the first colon.
+    """
+    return split_simple_tag_line(line) is None
+
+
+def split_tag_line_regex(line: str) -> TagLineParts:
+    """
+    Split a tag line into a (tag, value, trailing_modifier, comment) tuple
+    using tag_line_pattern.
+    """
+    match = tag_line_pattern.match(line)
     if match is None:
         message = f"Tag-value pair parsing failed for:\n{line}"
         raise ValueError(message)
@@ -172,39 +839,133 @@ def parse_tag_line(line: str) -> TagLine:
     comment = match.group("comment")
     if comment:
         comment = comment.lstrip("! ")
-    return TagLine(
-        tag=tag,
-        value=value,
-        trailing_modifier=trailing_modifier,
-        comment=comment,
-    )
+    return tag, value, trailing_modifier, comment
 
 
 def parse_stanza(
     lines: list[str],
     tag_singularity: dict[str, bool],
     include_clauses: bool = False,
+    include_tags: Collection[str] | None = None,
+    exclude_tags: Collection[str] | None = None,
 ) -> dict[str, Any]:
     """
     Returns a dictionary representation of a stanza.
+    When include_tags is set, lines with other tags are skipped.
+    Lines with tags in exclude_tags are skipped. Skipped lines are
+    identified by the text before the first colon and are not parsed.
     """
     stanza: dict[str, Any] = {}
-    clauses: dict[str, list[dict[str, str | None]]] = {}
+    filter_tags = include_tags is not None or exclude_tags is not None
+    # lines of clauses, which are only collected when lines are skipped
+    kept_lines = []
     for line in lines:
         if line.startswith("!"):
             continue
-        tag_line = parse_tag_line(line)
-        if include_clauses:
-            clauses.setdefault(tag_line.tag, []).append(asdict(tag_line))
-        if tag_singularity.get(tag_line.tag, False):
-            stanza[tag_line.tag] = tag_line.value
+        if filter_tags and not keep_tag(
+            line.partition(":")[0], include_tags, exclude_tags
+        ):
+            continue
+        tag, value, _, _ = split_tag_line(line)
+        if include_clauses and filter_tags:
+            kept_lines.append(line)
+        if tag_singularity.get(tag, False):
+            stanza[tag] = value
         else:
-            stanza.setdefault(tag_line.tag, []).append(tag_line.value)
+            stanza.setdefault(tag, []).append(value)
     if include_clauses:
-        stanza["_clauses"] = clauses
+        stanza["_clauses"] = Clauses("\n".join(kept_lines if filter_tags else lines))
     return stanza
 
 
+class Clauses(Mapping[str, list[dict[str, str | None]]]):
+    """
+    Read-only mapping from each tag of a stanza to its clauses, stored under
+    the "_clauses" key by parse_stanza with include_clauses. A clause is a
+    dict with tag, value, trailing_modifier and comment keys. The tag lines
+    of the stanza are kept as a single string and split into clauses on
+    first access, since the clauses of most stanzas are never read. Use
+    dict(clauses) for a dict that can be serialized with json or marshal.
+    """
+
+    __slots__ = ("text", "_clauses")
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+        self._clauses: dict[str, list[dict[str, str | None]]] | None = None
+
+    def __getitem__(self, tag: str) -> list[dict[str, str | None]]:
+        return self.parsed[tag]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.parsed)
+
+    def __len__(self) -> int:
+        return len(self.parsed)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Clauses) and self.text == other.text:
+            return True
+        return super().__eq__(other)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.parsed!r})"
+
+    def __reduce__(self) -> tuple[type[Clauses], tuple[str]]:
+        # pickle the text rather than the parsed clauses
+        return type(self), (self.text,)
+
+    @property
+    def parsed(self) -> dict[str, list[dict[str, str | None]]]:
+        """
+        The clauses as a dict, which is built on first access.
+        """
+        if self._clauses is None:
+            clauses: dict[str, list[dict[str, str | None]]] = {}
+            for line in self.text.split("\n"):
+                if not line or line.startswith("!"):
+                    continue
+                tag, value, trailing_modifier, comment = split_tag_line(line)
+                clauses.setdefault(tag, []).append(
+                    {
+                        "tag": tag,
+                        "value": value,
+                        "trailing_modifier": trailing_modifier,
+                        "comment": comment,
+                    }
+                )
+            self._clauses = clauses
+        return self._clauses
+
+
+def plain_clauses(value: Any) -> Any:
+    """
+    Return value with Clauses, including those in nested dicts, lists and
+    tuples, converted to dicts, for serializers such as marshal that only
+    accept built-in types.
+    """
+    if isinstance(value, Clauses):
+        return dict(value)
+    if isinstance(value, dict):
+        return {key: plain_clauses(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return type(value)(plain_clauses(item) for item in value)
+    return value
+
+
+def keep_tag(
+    tag: str,
+    include_tags: Collection[str] | None,
+    exclude_tags: Collection[str] | None,
+) -> bool:
+    """
+    Return whether tag passes the include_tags and exclude_tags filters.
+    """
+    if include_tags is not None and tag not in include_tags:
+        return False
+    return exclude_tags is None or tag not in exclude_tags
+
+
 header_tag_singularity = {
     "format-version": True,
     "data-version": True,
@@ -303,3 +1064,11 @@ instance_tag_singularity = {
     "replaced_by": False,
     "consider": False,
 }
+
+# stanza type line prefix, stanza type, and tag singularity of each stanza
+# type other than the header
+stanza_types = [
+    ("[Typedef]", "Typedef", typedef_tag_singularity),
+    ("[Term]", "Term", term_tag_singularity),
+    ("[Instance]", "Instance", instance_tag_singularity),
+]
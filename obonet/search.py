@@ -0,0 +1,286 @@
+"""
+Text search over term names, synonyms and alternative identifiers.
+
+With read_obo(..., search_index=True), a SearchIndex is built while terms
+are added to the graph and stored in the "search_index" graph attribute.
+build_search_index creates the same index from an existing graph. Text is
+case folded, with runs of whitespace collapsed to single spaces, and looked
+up in a dictionary for exact matches, by bisection of the sorted texts for
+prefix matches and through an inverted index of character n-grams for
+fuzzy matches, so queries do not scan the terms of the ontology.
+"""
+
+from __future__ import annotations
+
+import bisect
+import heapq
+import itertools
+import math
+import re
+from collections import Counter, defaultdict
+from collections.abc import Iterator, Mapping
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from .read import paused_gc
+
+if TYPE_CHECKING:
+    import networkx
+
+# Tags that must be parsed to build a SearchIndex
+search_index_tags = frozenset(
+    {
+        "name",
+        "synonym",
+        "alt_id",
+        "exact_synonym",
+        "narrow_synonym",
+        "broad_synonym",
+        "related_synonym",
+    }
+)
+
+# Scopes implied by the synonym tags deprecated in OBO 1.4
+deprecated_synonym_scopes = {
+    "exact_synonym": "EXACT",
+    "narrow_synonym": "NARROW",
+    "broad_synonym": "BROAD",
+    "related_synonym": "RELATED",
+}
+synonym_scopes = frozenset(deprecated_synonym_scopes.values())
+synonym_pattern = re.compile(r'"((?:[^"\\]|\\.)*)"\s*([A-Za-z_]*)')
+escape_pattern = re.compile(r"\\(.)")
+
+# Length of the character n-grams of the fuzzy index. Trigrams occur in too
+# many texts of large ontologies for queries to count them quickly.
+ngram_size = 4
+# Maximum number of n-gram occurrences counted by a fuzzy query
+fuzzy_budget = 2_000
+
+
+@dataclass(frozen=True)
+class SearchMatch:
+    """
+    A text of a term that matches a query. field is "name", "synonym" or
+    "alt_id". scope is the scope of a synonym, such as "EXACT", or None.
+    """
+
+    term_id: str
+    text: str
+    field: str
+    scope: str | None = None
+
+
+class SearchIndex:
+    """
+    Index of the names, synonyms and alt_id values of terms. Terms are
+    added with add_term. The sorted texts used by prefix queries are
+    updated on the first prefix query after terms were added.
+    """
+
+    def __init__(self) -> None:
+        # folded texts and the matches for each, indexed by text number
+        self.texts: list[str] = []
+        self.matches: list[list[SearchMatch]] = []
+        self.text_numbers: dict[str, int] = {}
+        # n-gram counts of each text and the text numbers of each n-gram
+        self.ngram_counts: list[int] = []
+        self.postings: defaultdict[str, list[int]] = defaultdict(list)
+        self._sorted: list[tuple[str, int]] | None = None
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}(texts={len(self.texts)}, "
+            f"ngrams={len(self.postings)})"
+        )
+
+    def __getstate__(self) -> dict[str, Any]:
+        state = self.__dict__.copy()
+        state["_sorted"] = None
+        return state
+
+    def add_term(self, term_id: str, term: Mapping[str, Any]) -> None:
+        """
+        Add a term with its parsed tags, as returned by parse_stanza.
+        """
+        self._sorted = None
+        if term.get("name"):
+            self.add_text(SearchMatch(term_id, term["name"], "name"))
+        for tag in "synonym", *deprecated_synonym_scopes:
+            for value in term.get(tag, []):
+                text, scope = parse_synonym(value)
+                scope = deprecated_synonym_scopes.get(tag, scope)
+                self.add_text(SearchMatch(term_id, text, "synonym", scope))
+        for alt_id in term.get("alt_id", []):
+            self.add_text(SearchMatch(term_id, alt_id, "alt_id"))
+
+    def add_text(self, match: SearchMatch) -> None:
+        folded = fold_text(match.text)
+        if not folded:
+            return
+        number = self.text_numbers.get(folded)
+        if number is not None:
+            self.matches[number].append(match)
+            return
+        self._sorted = None
+        number = self.text_numbers[folded] = len(self.texts)
+        self.texts.append(folded)
+        self.matches.append([match])
+        ngrams = get_ngrams(folded)
+        self.ngram_counts.append(len(ngrams))
+        postings = self.postings
+        for ngram in ngrams:
+            postings[ngram].append(number)
+
+    def exact(self, query: str) -> list[SearchMatch]:
+        """
+        Return the matches whose text equals query, ignoring case and
+        whitespace differences.
+        """
+        number = self.text_numbers.get(fold_text(query))
+        return [] if number is None else list(self.matches[number])
+
+    def prefix(self, query: str, limit: int | None = 10) -> list[SearchMatch]:
+        """
+        Return up to limit matches whose text starts with query, ignoring
+        case, in order of their folded text. Set limit to None for all
+        matches.
+        """
+        return list(itertools.islice(self.iter_prefix(query), limit))
+
+    def iter_prefix(self, query: str) -> Iterator[SearchMatch]:
+        """
+        Yield the matches whose text starts with query, like prefix.
+        """
+        folded = fold_text(query)
+        if self._sorted is None:
+            self._sorted = sorted((text, i) for i, text in enumerate(self.texts))
+        sorted_texts = self._sorted
+        position = bisect.bisect_left(sorted_texts, (folded, -1))
+        while position < len(sorted_texts):
+            text, number = sorted_texts[position]
+            if not text.startswith(folded):
+                break
+            yield from self.matches[number]
+            position += 1
+
+    def fuzzy(
+        self, query: str, limit: int = 10, threshold: float = 0.3
+    ) -> list[tuple[float, SearchMatch]]:
+        """
+        Return up to limit (similarity, match) pairs, most similar first,
+        for texts whose n-gram similarity to query is at least threshold.
+        Similarity is the number of n-grams shared by the folded texts
+        divided by the number of n-grams in either, which is 1 for
+        identical texts. See iter_similar for how candidates are chosen.
+        """
+        similar = self.iter_similar(fold_text(query), threshold, 5 * limit)
+        scores = heapq.nlargest(limit, similar, key=lambda x: x[0])
+        return [
+            (score, match) for score, number in scores for match in self.matches[number]
+        ][:limit]
+
+    def iter_similar(
+        self, folded: str, threshold: float, n_candidates: int
+    ) -> Iterator[tuple[float, int]]:
+        """
+        Yield (similarity, text number) for candidate texts whose n-gram
+        similarity to the folded query is at least threshold.
+
+        A text reaching threshold shares at least `needed` n-grams with the
+        query, so it occurs in at least one of the len(ngrams) - needed + 1
+        rarest posting lists of the query. Occurrences are counted in those
+        lists, rarest first, up to fuzzy_budget occurrences in total, and
+        the n_candidates texts with most occurrences are scored. The time
+        of a query thereby does not grow with the size of the index, at the
+        cost of missing similar texts when the query consists of n-grams
+        that occur in many texts.
+        """
+        ngrams = get_ngrams(folded)
+        if not ngrams:
+            return
+        postings = sorted((self.postings.get(ngram, []) for ngram in ngrams), key=len)
+        needed = max(1, math.ceil(threshold * len(ngrams) - 1e-9))
+        counts = Counter[int]()
+        counted = 0
+        for posting in postings[: len(ngrams) - needed + 1]:
+            if counted and counted + len(posting) > fuzzy_budget:
+                break
+            counts.update(posting)
+            counted += len(posting)
+        for number, _ in counts.most_common(n_candidates):
+            shared = len(ngrams & get_ngrams(self.texts[number]))
+            score = shared / (len(ngrams) + self.ngram_counts[number] - shared)
+            if score >= threshold:
+                yield score, number
+
+    def iter_fuzzy(self, query: str, limit: int) -> Iterator[SearchMatch]:
+        for _, match in self.fuzzy(query, limit=limit):
+            yield match
+
+    def search(self, query: str, limit: int = 10) -> list[SearchMatch]:
+        """
+        Return up to limit matches for autocompletion of query: exact
+        matches, then prefix matches, then fuzzy matches, including each
+        term once. Fuzzy matching only runs when there are fewer than limit
+        exact and prefix matches.
+        """
+        matches: dict[str, SearchMatch] = {}
+        candidates = itertools.chain(
+            self.exact(query),
+            self.iter_prefix(query),
+            self.iter_fuzzy(query, limit),
+        )
+        for match in candidates:
+            matches.setdefault(match.term_id, match)
+            if len(matches) >= limit:
+                break
+        return list(matches.values())
+
+
+def build_search_index(graph: networkx.MultiDiGraph[str]) -> SearchIndex:
+    """
+    Return a SearchIndex of the terms in graph, as created by read_obo.
+    """
+    index = SearchIndex()
+    with paused_gc():
+        for term_id, term in graph.nodes(data=True):
+            index.add_term(term_id, term)
+    return index
+
+
+def fold_text(text: str) -> str:
+    """
+    Return text case folded with whitespace runs collapsed to single spaces.
+    """
+    return " ".join(text.casefold().split())
+
+
+def get_ngrams(folded: str) -> set[str]:
+    """
+    Return the character n-grams of folded text, padded with spaces such
+    that the start of the text contributes one n-gram per prefix.
+    """
+    padded = " " * (ngram_size - 1) + folded + " "
+    n_ngrams = len(padded) - ngram_size + 1
+    return {padded[i : i + ngram_size] for i in range(n_ngrams)} if folded else set()
+
+
+def parse_synonym(value: str) -> tuple[str, str | None]:
+    """
+    Return the text and scope of a synonym value, such as
+    '"term 49" EXACT []'. The scope is None when it is missing or not one of
+    EXACT, BROAD, NARROW and RELATED. Values without a quoted text are
+    returned unchanged.
+    """
+    match = synonym_pattern.match(value)
+    if match is None:
+        return value, None
+    text = match.group(1)
+    if "\\" in text:
+        text = escape_pattern.sub(r"\1", text)
+    scope = match.group(2)
+    return text, scope if scope in synonym_scopes else None
@@ -0,0 +1,413 @@
+"""
+Read-only ontologies shared between processes without copying.
+
+SharedOntology stores the node identifiers, node attributes and the edges
+of each relation of an ontology in a single flat buffer, placed either in
+a multiprocessing.shared_memory block or in a file that is memory-mapped.
+Edges are stored as CSR arrays (see obonet.arrays) in both directions, and
+node attributes are marshal-encoded per node and only decoded when they
+are accessed. One process creates the buffer, for example a server before
+forking its workers, and other processes attach to it by name or path,
+which only decodes a small header. Memory use is therefore independent of
+the number of attached processes, apart from the attributes each process
+decodes.
+"""
+
+from __future__ import annotations
+
+import marshal
+import mmap
+import os
+import sys
+from array import array
+from collections.abc import Collection, Iterable, Iterator
+from multiprocessing import resource_tracker, shared_memory
+from typing import TYPE_CHECKING, Any
+
+from .arrays import OntologyArrays, read_obo_arrays, to_csr
+from .io import PathType
+from .read import plain_clauses
+
+if TYPE_CHECKING:
+    import networkx
+
+magic = b"OBONET-SHARED\n\0\0"
+
+# Increment when the layout of the buffer changes
+shared_format_version = 1
+
+# The buffer starts with magic followed by the offset and length of the
+# marshal-encoded header as unsigned 64-bit integers. Sections start at
+# multiples of section_alignment bytes.
+preamble_size = len(magic) + 16
+section_alignment = 8
+
+
+class SharedOntology:
+    """
+    Read-only ontology stored in a shared buffer. Create one with
+    SharedOntology.create or share_obo, and attach to it from other
+    processes with SharedOntology.attach or SharedOntology.open, or by
+    passing it to another process, which pickles it as a reference to the
+    buffer. Nodes are identified by their id or their index, and follow the
+    order of the graph returned by read_obo.
+
+    Close the ontology in every process once it is no longer used, and
+    unlink it in the creating process to free a shared memory block.
+    """
+
+    def __init__(self, buffer: Any, source: Any, location: tuple[str, str]) -> None:
+        self._source = source
+        self.location = location
+        self._views: list[memoryview] = []
+        try:
+            self._load(memoryview(buffer))
+        except BaseException:
+            self._release()
+            raise
+
+    def _load(self, view: memoryview) -> None:
+        self._views.append(view)
+        if bytes(view[: len(magic)]) != magic:
+            raise ValueError("not an obonet shared ontology")
+        preamble = array("Q")
+        preamble.frombytes(view[len(magic) : preamble_size])
+        header_offset, header_length = preamble
+        header = marshal.loads(view[header_offset : header_offset + header_length])
+        if header["version"] != shared_format_version:
+            raise ValueError(
+                f"unsupported obonet shared format version {header['version']}"
+            )
+        self.graph: dict[str, Any] = header["graph"]
+        self.relations: list[str] = header["relations"]
+        self._sections = {
+            name: self._cast(view, offset, length, typecode)
+            for name, (offset, length, typecode) in header["sections"].items()
+        }
+        self._id_offsets = self._sections["id_offsets"]
+        self._id_bytes = self._sections["id_bytes"]
+        self._id_order = self._sections["id_order"]
+        self._data_offsets = self._sections["data_offsets"]
+        self._data_bytes = self._sections["data_bytes"]
+
+    def _cast(
+        self, view: memoryview, offset: int, length: int, typecode: str
+    ) -> memoryview:
+        # sections hold integers of the array typecode, or bytes ("B")
+        section: memoryview = view[offset : offset + length].cast(typecode)  # type: ignore[call-overload]
+        self._views.append(section)
+        return section
+
+    @classmethod
+    def create(
+        cls,
+        arrays: OntologyArrays,
+        name: str | None = None,
+        path: str | os.PathLike[str] | None = None,
+    ) -> SharedOntology:
+        """
+        Store arrays in a new shared memory block, named name or a random
+        name, or in a new file at path, and return the ontology backed by
+        it. Node attributes are taken from arrays.node_data when set.
+        """
+        parts, size = layout_buffer(arrays)
+        if path is not None:
+            with open(path, "wb") as write_file:
+                for offset, part in parts:
+                    write_file.seek(offset)
+                    write_file.write(part)
+            return cls.open(path)
+        block = shared_memory.SharedMemory(name=name, create=True, size=size)
+        created_blocks.add(block.name)
+        buffer = block.buf
+        assert buffer is not None
+        for offset, part in parts:
+            buffer[offset : offset + len(part)] = part
+        return cls(buffer, block, ("shared_memory", block.name))
+
+    @classmethod
+    def from_graph(
+        cls,
+        graph: networkx.MultiDiGraph[str],
+        name: str | None = None,
+        path: str | os.PathLike[str] | None = None,
+    ) -> SharedOntology:
+        """
+        Store a graph returned by read_obo, including its node attributes,
+        like SharedOntology.create.
+        """
+        arrays = to_csr(graph)
+        arrays.graph = plain_clauses(arrays.graph)
+        arrays.node_data = [plain_clauses(dict(data)) for data in graph._node.values()]
+        return cls.create(arrays, name=name, path=path)
+
+    @classmethod
+    def attach(cls, name: str) -> SharedOntology:
+        """
+        Return the ontology stored in the shared memory block named name.
+        """
+        block = attach_shared_memory(name)
+        return cls(block.buf, block, ("shared_memory", name))
+
+    @classmethod
+    def open(cls, path: str | os.PathLike[str]) -> SharedOntology:
+        """
+        Return the ontology stored in the file at path by create, which is
+        memory-mapped read-only, such that processes that open the same file
+        share its pages.
+        """
+        with open(path, "rb") as read_file:
+            mapped = mmap.mmap(read_file.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(mapped, mapped, ("file", os.fspath(path)))
+
+    def __reduce__(self) -> tuple[Any, tuple[str]]:
+        kind, location = self.location
+        if kind == "shared_memory":
+            return SharedOntology.attach, (location,)
+        return SharedOntology.open, (location,)
+
+    def __enter__(self) -> SharedOntology:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Release the buffer in this process.
+        """
+        self._release()
+
+    def _release(self) -> None:
+        for view in reversed(self._views):
+            view.release()
+        self._views.clear()
+        self._source.close()
+
+    def unlink(self) -> None:
+        """
+        Free the shared memory block once all processes have closed it.
+        Has no effect for ontologies stored in files.
+        """
+        if isinstance(self._source, shared_memory.SharedMemory):
+            if sys.version_info < (3, 13):
+                # processes that attached with a resource tracker shared with
+                # this process removed its registration of the block, which
+                # unlink removes again
+                resource_tracker.register(self._source._name, "shared_memory")  # type: ignore [attr-defined]
+            self._source.unlink()
+
+    def __len__(self) -> int:
+        return len(self._id_order)
+
+    def __contains__(self, node: object) -> bool:
+        return isinstance(node, str) and self.index(node) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        return map(self.node, range(len(self)))
+
+    def node(self, i: int) -> str:
+        """
+        Return the id of the node with index i.
+        """
+        start, end = self._id_offsets[i], self._id_offsets[i + 1]
+        return bytes(self._id_bytes[start:end]).decode("utf-8")
+
+    def index(self, node: str) -> int | None:
+        """
+        Return the index of node, or None when node is not in the ontology.
+        Nodes are found by bisection over the ids in sorted order.
+        """
+        key = node.encode("utf-8")
+        id_offsets, id_bytes, id_order = (
+            self._id_offsets,
+            self._id_bytes,
+            self._id_order,
+        )
+        low, high = 0, len(id_order)
+        while low < high:
+            middle = (low + high) // 2
+            i = id_order[middle]
+            value = bytes(id_bytes[id_offsets[i] : id_offsets[i + 1]])
+            if value < key:
+                low = middle + 1
+            elif value == key:
+                return int(i)
+            else:
+                high = middle
+        return None
+
+    def _get_index(self, node: str) -> int:
+        i = self.index(node)
+        if i is None:
+            raise KeyError(node)
+        return i
+
+    def node_data(self, node: str) -> dict[str, Any]:
+        """
+        Return a new dictionary of the attributes of node.
+        """
+        i = self._get_index(node)
+        start, end = self._data_offsets[i], self._data_offsets[i + 1]
+        if start == end:
+            return {}
+        data: dict[str, Any] = marshal.loads(self._data_bytes[start:end])
+        return data
+
+    def _row(self, direction: str, relation: str, i: int) -> list[int]:
+        offsets = self._sections.get(f"{direction}:{relation}:offsets")
+        if offsets is None:
+            return []
+        indices = self._sections[f"{direction}:{relation}:indices"]
+        return indices[offsets[i] : offsets[i + 1]].tolist()
+
+    def successors(self, node: str, relation: str) -> list[str]:
+        """
+        Return the targets of relation edges from node, such as the
+        superterms of node when relation is "is_a".
+        """
+        i = self._get_index(node)
+        return [self.node(j) for j in self._row("out", relation, i)]
+
+    def predecessors(self, node: str, relation: str) -> list[str]:
+        """
+        Return the sources of relation edges to node, such as the subterms
+        of node when relation is "is_a".
+        """
+        i = self._get_index(node)
+        return [self.node(j) for j in self._row("in", relation, i)]
+
+    def out_edges(self, node: str) -> list[tuple[str, str, str]]:
+        """
+        Return (node, target, key) for the edges from node, by relation.
+        """
+        i = self._get_index(node)
+        return [
+            (node, self.node(j), relation)
+            for relation in self.relations
+            for j in self._row("out", relation, i)
+        ]
+
+    def in_edges(self, node: str) -> list[tuple[str, str, str]]:
+        """
+        Return (source, node, key) for the edges to node, by relation.
+        """
+        i = self._get_index(node)
+        return [
+            (self.node(j), node, relation)
+            for relation in self.relations
+            for j in self._row("in", relation, i)
+        ]
+
+
+# Names of the shared memory blocks created by this process. Processes
+# forked from it inherit the set together with its resource tracker.
+created_blocks: set[str] = set()
+
+
+def attach_shared_memory(name: str) -> shared_memory.SharedMemory:
+    """
+    Attach to an existing shared memory block without registering it with
+    the resource tracker, which would unlink the block when the attaching
+    process exits. Only the creating process should unlink the block.
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    # Before Python 3.13, SharedMemory always registers the block, so the
+    # registration is removed again, except in the creating process and
+    # processes forked from it, which share its resource tracker.
+    block = shared_memory.SharedMemory(name=name)
+    if block.name not in created_blocks:
+        resource_tracker.unregister(block._name, "shared_memory")  # type: ignore [attr-defined]
+    return block
+
+
+def share_obo(
+    path_or_file: PathType,
+    name: str | None = None,
+    path: str | os.PathLike[str] | None = None,
+    node_tags: Collection[str] | None = None,
+    ignore_obsolete: bool = True,
+    encoding: str | None = "utf-8",
+    workers: int | None = None,
+) -> SharedOntology:
+    """
+    Read an ontology and store it in a new shared memory block or file, as
+    described in SharedOntology.create. When node_tags is None, all tags
+    are stored as node attributes, like read_obo. Otherwise, only node_tags
+    are parsed and stored, which is faster and uses less memory while
+    reading, see read_obo_arrays.
+    """
+    if node_tags is None:
+        from .read import read_obo
+
+        graph = read_obo(
+            path_or_file,
+            ignore_obsolete=ignore_obsolete,
+            encoding=encoding,
+            workers=workers,
+        )
+        return SharedOntology.from_graph(graph, name=name, path=path)
+    arrays = read_obo_arrays(
+        path_or_file,
+        ignore_obsolete=ignore_obsolete,
+        encoding=encoding,
+        workers=workers,
+        node_tags=node_tags,
+    )
+    return SharedOntology.create(arrays, name=name, path=path)
+
+
+def layout_buffer(arrays: OntologyArrays) -> tuple[list[tuple[int, bytes]], int]:
+    """
+    Return the (offset, content) parts of the buffer storing arrays and the
+    total size of the buffer.
+    """
+    encoded_ids = [node.encode("utf-8") for node in arrays.ids]
+    sections: dict[str, array[int] | bytes] = {
+        "id_offsets": get_offsets(map(len, encoded_ids)),
+        "id_bytes": b"".join(encoded_ids),
+        "id_order": array(
+            "I", sorted(range(len(encoded_ids)), key=encoded_ids.__getitem__)
+        ),
+    }
+    node_data = arrays.node_data or [{}] * len(arrays.ids)
+    encoded_data = [marshal.dumps(data) if data else b"" for data in node_data]
+    sections["data_offsets"] = get_offsets(map(len, encoded_data))
+    sections["data_bytes"] = b"".join(encoded_data)
+    for relation, csr in arrays.relations.items():
+        for direction, matrix in ("out", csr), ("in", csr.transpose()):
+            sections[f"{direction}:{relation}:offsets"] = matrix.offsets
+            sections[f"{direction}:{relation}:indices"] = matrix.indices
+
+    parts: list[tuple[int, bytes]] = []
+    locations = {}
+    offset = preamble_size
+    for section_name, content in sections.items():
+        offset = -(-offset // section_alignment) * section_alignment
+        typecode = content.typecode if isinstance(content, array) else "B"
+        data = content.tobytes() if isinstance(content, array) else content
+        parts.append((offset, data))
+        locations[section_name] = offset, len(data), typecode
+        offset += len(data)
+    header = marshal.dumps(
+        {
+            "version": shared_format_version,
+            "graph": arrays.graph,
+            "relations": list(arrays.relations),
+            "sections": locations,
+        }
+    )
+    preamble = magic + array("Q", [offset, len(header)]).tobytes()
+    parts.insert(0, (0, preamble))
+    parts.append((offset, header))
+    return parts, offset + len(header)
+
+
+def get_offsets(lengths: Iterable[int]) -> array[int]:
+    offsets = array("q", [0])
+    total = 0
+    for length in lengths:
+        total += length
+        offsets.append(total)
+    return offsets
@@ -0,0 +1,234 @@
+"""
+Update a graph read by read_obo in place from a newer ontology release.
+
+update_graph parses the new release stanza by stanza, compares each term
+with the corresponding node of the existing graph, and applies only the
+differences, so that long-lived graphs need not be rebuilt and downstream
+caches can invalidate only the terms that changed.
+"""
+
+from __future__ import annotations
+
+import collections
+from collections.abc import Callable, Collection, Iterable, Mapping
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from .io import PathType
+from .read import (
+    Stanza,
+    add_edge_keys,
+    add_node_data,
+    get_graph_attributes,
+    get_term_edges,
+    iter_stanzas,
+    keep_tags,
+    paused_gc,
+)
+
+if TYPE_CHECKING:
+    import networkx
+
+EdgeKey = tuple[str, str, str]
+
+
+@dataclass
+class GraphChanges:
+    """
+    Differences applied to a graph by update_graph. Nodes and edges are
+    listed in the order they appear in the new release (or in the graph, for
+    removals). Typedefs are identified by their id tag. header_changed is
+    true when graph attributes other than typedefs and instances changed.
+    """
+
+    added_nodes: list[str] = field(default_factory=list)
+    removed_nodes: list[str] = field(default_factory=list)
+    changed_nodes: list[str] = field(default_factory=list)
+    added_edges: list[EdgeKey] = field(default_factory=list)
+    removed_edges: list[EdgeKey] = field(default_factory=list)
+    added_typedefs: list[str] = field(default_factory=list)
+    removed_typedefs: list[str] = field(default_factory=list)
+    changed_typedefs: list[str] = field(default_factory=list)
+    header_changed: bool = False
+
+    def __bool__(self) -> bool:
+        return any(
+            (
+                self.added_nodes,
+                self.removed_nodes,
+                self.changed_nodes,
+                self.added_edges,
+                self.removed_edges,
+                self.added_typedefs,
+                self.removed_typedefs,
+                self.changed_typedefs,
+                self.header_changed,
+            )
+        )
+
+
+def update_graph(
+    graph: networkx.MultiDiGraph[str],
+    path_or_file: PathType,
+    ignore_obsolete: bool = True,
+    encoding: str | None = "utf-8",
+    include_clauses: bool = False,
+    workers: int | None = None,
+    include_tags: Collection[str] | None = None,
+    exclude_tags: Collection[str] | None = None,
+    compact: bool = False,
+) -> GraphChanges:
+    """
+    Update graph, as returned by read_obo, in place to match the ontology
+    serialized by path_or_file and return the changes. The parameters must
+    match those graph was read with, see read_obo for their description.
+
+    After updating, graph has the same nodes, node attributes, edges and
+    graph attributes as read_obo(path_or_file) would return. Nodes and
+    edges that are added are appended, such that their order may differ.
+    Attributes of changed nodes are replaced rather than updated in place.
+    Closure and id indexes stored in the graph attributes are removed,
+    since they no longer match the graph.
+    """
+    if ignore_obsolete:
+        include_tags, exclude_tags = keep_tags(
+            include_tags, exclude_tags, {"is_obsolete"}
+        )
+    stanzas = iter_stanzas(
+        path_or_file,
+        encoding=encoding,
+        include_clauses=include_clauses,
+        workers=workers,
+        include_tags=include_tags,
+        exclude_tags=exclude_tags,
+    )
+    compactor = None
+    if compact:
+        from .compact import TagCompactor
+
+        compactor = TagCompactor()
+    with paused_gc():
+        release = diff_release(graph, stanzas, ignore_obsolete, compactor)
+        changes = apply_release(graph, release, compactor)
+    update_graph_attributes(graph, release, changes)
+    return changes
+
+
+@dataclass
+class Release:
+    """
+    A new ontology release compared to an existing graph. data holds the
+    attributes of nodes that are added or changed, nodes all nodes of the
+    release and edges all (source, target, key) edges of the release.
+    sections holds the tags of non-Term stanzas by stanza type.
+    """
+
+    data: dict[str, Any] = field(default_factory=dict)
+    nodes: set[str] = field(default_factory=set)
+    edges: dict[EdgeKey, None] = field(default_factory=dict)
+    sections: collections.defaultdict[str, list[dict[str, Any]]] = field(
+        default_factory=lambda: collections.defaultdict(list)
+    )
+
+
+def diff_release(
+    graph: networkx.MultiDiGraph[str],
+    stanzas: Iterable[Stanza],
+    ignore_obsolete: bool,
+    compactor: Callable[[Mapping[str, Any]], Mapping[str, Any]] | None,
+) -> Release:
+    """
+    Compare the terms of a new release, given as stanzas, with the nodes of
+    graph, without modifying graph. Terms are processed as in build_graph.
+    """
+    release = Release()
+    node_data = graph._node
+    for stanza in stanzas:
+        if stanza.stanza_type != "Term":
+            release.sections[stanza.stanza_type].append(stanza.tags)
+            continue
+        term = stanza.tags
+        if ignore_obsolete and term.get("is_obsolete", "false") == "true":
+            continue
+        term_id = term.pop("id")
+        if term_id in release.nodes:
+            # repeated stanzas for the same term are merged
+            previous = release.data.get(term_id)
+            if previous is None:
+                previous = node_data[term_id]
+            term = {**previous, **term}
+        release.nodes.add(term_id)
+        data = term if compactor is None else compactor(term)
+        if node_data.get(term_id) != data:
+            release.data[term_id] = data
+        release.edges.update(dict.fromkeys(get_term_edges(term_id, term)))
+    # targets of edges that are not terms are nodes without attributes
+    for _, target, _ in release.edges:
+        if target not in release.nodes:
+            release.nodes.add(target)
+            if node_data.get(target) != {}:
+                release.data[target] = graph.node_attr_dict_factory()
+    return release
+
+
+def apply_release(
+    graph: networkx.MultiDiGraph[str],
+    release: Release,
+    compactor: Callable[[Mapping[str, Any]], Mapping[str, Any]] | None,
+) -> GraphChanges:
+    """
+    Apply the node and edge differences of release to graph.
+    """
+    changes = GraphChanges()
+    changes.removed_edges = [
+        edge for edge in graph.edges(keys=True) if edge not in release.edges
+    ]
+    changes.added_edges = [edge for edge in release.edges if not graph.has_edge(*edge)]
+    changes.removed_nodes = [node for node in graph if node not in release.nodes]
+    for node in release.data:
+        nodes = changes.changed_nodes if node in graph else changes.added_nodes
+        nodes.append(node)
+
+    graph.remove_edges_from(changes.removed_edges)
+    graph.remove_nodes_from(changes.removed_nodes)
+    for node in changes.changed_nodes:
+        graph._node[node] = release.data[node]
+    for node in changes.added_nodes:
+        add_node_data(graph, node, release.data[node], compactor=compactor)
+    add_edge_keys(graph, changes.added_edges)
+    return changes
+
+
+def update_graph_attributes(
+    graph: networkx.MultiDiGraph[str],
+    release: Release,
+    changes: GraphChanges,
+) -> None:
+    """
+    Replace the graph attributes of graph with those of release,
+    recording typedef and header changes in changes.
+    """
+    typedefs = release.sections["Typedef"]
+    instances = release.sections["Instance"]
+    headers = release.sections["header"]
+    header = headers[-1] if headers else None
+    old_typedefs = {typedef["id"]: typedef for typedef in graph.graph["typedefs"]}
+    new_typedefs = {typedef["id"]: typedef for typedef in typedefs}
+    for typedef_id, typedef in new_typedefs.items():
+        if typedef_id not in old_typedefs:
+            changes.added_typedefs.append(typedef_id)
+        elif old_typedefs[typedef_id] != typedef:
+            changes.changed_typedefs.append(typedef_id)
+    changes.removed_typedefs = [
+        typedef_id for typedef_id in old_typedefs if typedef_id not in new_typedefs
+    ]
+    old_header = {
+        key: value
+        for key, value in graph.graph.items()
+        if key not in {"typedefs", "instances"}
+    }
+    new_header = get_graph_attributes(header)
+    changes.header_changed = old_header != new_header
+    graph.graph.clear()
+    graph.graph.update(typedefs=typedefs, instances=instances)
+    graph.graph.update(new_header)
@@ -0,0 +1,136 @@
+import contextlib
+import functools
+import http
+import http.server
+import os
+import pathlib
+import shutil
+import threading
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from typing import Any
+
+import pytest
+
+directory = os.path.dirname(os.path.abspath(__file__))
+
+
+class QuietRequestHandler(http.server.SimpleHTTPRequestHandler):
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+
+@pytest.fixture
+def serve_directory() -> Iterator[Callable[[str | os.PathLike[str]], str]]:
+    """
+    Return a function that serves a directory from a local HTTP server
+    running in a background thread and returns the server's base URL.
+    """
+    servers: list[http.server.ThreadingHTTPServer] = []
+
+    def serve(path: str | os.PathLike[str]) -> str:
+        handler = functools.partial(QuietRequestHandler, directory=os.fspath(path))
+        server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        host, port = server.server_address[:2]
+        return f"http://{host!s}:{port}/"
+
+    yield serve
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def data_url(serve_directory: Callable[[str], str]) -> str:
+    """
+    Base URL of a local HTTP server serving tests/data.
+    """
+    return serve_directory(os.path.join(directory, "data"))
+
+
+@pytest.fixture
+def pipe_file(tmp_path: pathlib.Path) -> Callable[[str | os.PathLike[str]], str]:
+    """
+    Return a function that creates a named pipe with the same file name as
+    path, writes the contents of path to it from a background thread and
+    returns the path of the pipe.
+    """
+    if not hasattr(os, "mkfifo"):
+        pytest.skip("named pipes are not supported on this platform")
+    n_pipes = 0
+
+    def write_pipe(fifo_path: pathlib.Path, content: bytes) -> None:
+        # opening the pipe blocks until it is opened for reading
+        with contextlib.suppress(BrokenPipeError), open(fifo_path, "wb") as pipe:
+            pipe.write(content)
+
+    def make_pipe(path: str | os.PathLike[str]) -> str:
+        nonlocal n_pipes
+        fifo_dir = tmp_path / f"pipe-{n_pipes}"
+        n_pipes += 1
+        fifo_dir.mkdir()
+        fifo_path = fifo_dir / os.path.basename(path)
+        os.mkfifo(fifo_path)
+        content = pathlib.Path(path).read_bytes()
+        args = fifo_path, content
+        threading.Thread(target=write_pipe, args=args, daemon=True).start()
+        return os.fspath(fifo_path)
+
+    return make_pipe
+
+
+class ETagRequestHandler(QuietRequestHandler):
+    """
+    Request handler that keeps connections alive, sends an ETag with each
+    file and answers requests with a matching If-None-Match header with
+    304 Not Modified. Each request is recorded in the server's requests list
+    as the client port, path and request headers.
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def send_head(self) -> Any:
+        self.server.requests.append(  # type: ignore[attr-defined]
+            (self.client_address[1], self.path, dict(self.headers))
+        )
+        path = self.translate_path(self.path)
+        if not os.path.isfile(path):
+            return super().send_head()
+        stat = os.stat(path)
+        self.etag = f'"{stat.st_size}-{stat.st_mtime_ns}"'
+        if self.headers.get("If-None-Match") == self.etag:
+            self.send_response(http.HTTPStatus.NOT_MODIFIED)
+            self.end_headers()
+            return None
+        return super().send_head()
+
+    def end_headers(self) -> None:
+        if getattr(self, "etag", None):
+            self.send_header("ETag", self.etag)
+        super().end_headers()
+
+
+@dataclass
+class ETagServer:
+    url: str
+    requests: list[tuple[int, str, dict[str, str]]]
+
+
+@pytest.fixture
+def etag_server(tmp_path: pathlib.Path) -> Iterator[ETagServer]:
+    """
+    Local HTTP/1.1 server with ETag support serving a copy of tests/data
+    from a temporary directory, which tests can modify.
+    """
+    root = tmp_path / "served"
+    shutil.copytree(os.path.join(directory, "data"), root)
+    handler = functools.partial(ETagRequestHandler, directory=os.fspath(root))
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.requests = []  # type: ignore[attr-defined]
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address[:2]
+    yield ETagServer(f"http://{host!s}:{port}/", server.requests)  # type: ignore[attr-defined]
+    server.shutdown()
+    server.server_close()
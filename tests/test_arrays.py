@@ -0,0 +1,90 @@
+import io
+import os
+from array import array
+
+import pytest
+
+import obonet
+from obonet.arrays import build_csr, read_obo_arrays, to_csr
+
+directory = os.path.dirname(os.path.abspath(__file__))
+
+obo_text = """\
+format-version: 1.4
+ontology: arrays-test
+
+[Term]
+id: T:1
+
+[Term]
+id: T:2
+is_a: T:1
+relationship: part_of EXT:1
+
+[Term]
+id: T:3
+is_a: T:2
+is_a: T:1
+relationship: part_of T:2
+
+[Term]
+id: T:4
+is_a: T:3
+is_obsolete: true
+
+[Term]
+id: T:3
+is_a: T:2
+
+[Typedef]
+id: part_of
+is_transitive: true
+"""
+
+
+@pytest.mark.parametrize("ignore_obsolete", [True, False])
+def test_read_obo_arrays_matches_read_obo(ignore_obsolete: bool) -> None:
+    graph = obonet.read_obo(io.StringIO(obo_text), ignore_obsolete=ignore_obsolete)
+    arrays = read_obo_arrays(io.StringIO(obo_text), ignore_obsolete=ignore_obsolete)
+    assert arrays.ids == list(graph)
+    assert len(arrays) == len(graph)
+    assert sorted(arrays.relations) == ["is_a", "part_of"]
+    assert sorted(arrays.edges()) == sorted(graph.edges(keys=True))
+    assert arrays.n_edges == graph.number_of_edges()
+    assert arrays.graph == graph.graph
+    assert arrays.node_data is None
+    assert arrays.successors("T:3", "is_a") == ["T:1", "T:2"]
+    assert arrays.successors("T:2", "part_of") == ["EXT:1"]
+    assert arrays.successors("T:1", "has_part") == []
+
+
+def test_to_csr_matches_read_obo_arrays() -> None:
+    path = os.path.join(directory, "data", "taxrank.obo")
+    arrays = read_obo_arrays(path, node_tags=["name"])
+    from_graph = to_csr(obonet.read_obo(path))
+    assert arrays.ids == from_graph.ids
+    assert arrays.relations == from_graph.relations
+    assert arrays.node_data is not None
+    i = arrays.id_to_index["TAXRANK:0000006"]
+    assert arrays.node_data[i] == {"name": "species"}
+    assert arrays.successors("TAXRANK:0000006", "is_a") == ["TAXRANK:0000000"]
+
+
+def test_build_csr() -> None:
+    rows = array("I", [2, 0, 2, 0, 2])
+    columns = array("I", [1, 2, 0, 2, 1])
+    csr = build_csr(3, rows, columns)
+    assert list(csr.offsets) == [0, 1, 1, 3]
+    assert list(csr.indices) == [2, 0, 1]
+    assert list(csr.row(2)) == [0, 1]
+    transpose = csr.transpose()
+    assert [list(transpose.row(i)) for i in range(3)] == [[2], [2], [0]]
+
+
+def test_csr_to_numpy() -> None:
+    numpy = pytest.importorskip("numpy")
+    csr = read_obo_arrays(io.StringIO(obo_text)).relations["is_a"]
+    offsets, indices = csr.to_numpy()
+    assert offsets.dtype == numpy.int64
+    assert offsets.tolist() == list(csr.offsets)
+    assert indices.tolist() == list(csr.indices)
@@ -0,0 +1,59 @@
+import io
+import os
+import pathlib
+from typing import Any
+
+import networkx
+import pytest
+
+import obonet
+from obonet.binary import magic
+
+directory = os.path.dirname(os.path.abspath(__file__))
+
+
+def graph_contents(graph: Any) -> tuple[Any, ...]:
+    return (
+        list(graph.nodes(data=True)),
+        list(graph.edges(keys=True, data=True)),
+        graph.graph,
+    )
+
+
+@pytest.mark.parametrize("include_clauses", [False, True])
+def test_binary_round_trip(tmp_path: pathlib.Path, include_clauses: bool) -> None:
+    path = os.path.join(directory, "data", "brenda-subset.obo")
+    graph = obonet.read_obo(path, include_clauses=include_clauses)
+    output = tmp_path / "brenda.obonet"
+    obonet.write_binary(graph, output)
+    assert output.read_bytes().startswith(magic)
+    assert graph_contents(obonet.read_binary(output)) == graph_contents(graph)
+
+
+def test_binary_round_trip_compact_file_object() -> None:
+    path = os.path.join(directory, "data", "taxrank.obo")
+    graph = obonet.read_obo(path, compact=True)
+    binary_file = io.BytesIO()
+    obonet.write_binary(graph, binary_file)
+    binary_file.seek(0)
+    loaded = obonet.read_binary(binary_file)
+    assert list(loaded) == list(graph)
+    assert loaded.nodes["TAXRANK:0000006"] == dict(graph.nodes["TAXRANK:0000006"])
+    assert list(loaded.edges(keys=True)) == list(graph.edges(keys=True))
+
+
+def test_binary_round_trip_edge_data() -> None:
+    graph = networkx.MultiDiGraph(name="edge data")
+    graph.add_edge("a", "b", key="is_a", weight=1)
+    graph.add_edge("a", "b", key="part_of")
+    binary_file = io.BytesIO()
+    obonet.write_binary(graph, binary_file)
+    binary_file.seek(0)
+    assert graph_contents(obonet.read_binary(binary_file)) == graph_contents(graph)
+
+
+def test_read_binary_invalid() -> None:
+    with pytest.raises(ValueError, match="not a file"):
+        obonet.read_binary(io.BytesIO(b"format-version: 1.2\n"))
+    with pytest.raises(ValueError, match="version"):
+        obonet.read_binary(io.BytesIO(magic + bytes([255])))
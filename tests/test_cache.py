@@ -0,0 +1,156 @@
+import functools
+import http
+import http.server
+import os
+import pathlib
+import shutil
+import threading
+from collections.abc import Callable, Iterator
+
+import pytest
+
+import obonet
+import obonet.read
+from obonet.cache import cache_suffix, prune_cache
+
+from .conftest import QuietRequestHandler
+
+directory = os.path.dirname(os.path.abspath(__file__))
+
+
+def fail_build_graph(*args: object, **kwargs: object) -> None:
+    raise AssertionError("graph was parsed instead of loaded from cache")
+
+
+@pytest.fixture
+def obo_path(tmp_path: pathlib.Path) -> pathlib.Path:
+    path = tmp_path / "taxrank.obo"
+    shutil.copy(os.path.join(directory, "data", "taxrank.obo"), path)
+    return path
+
+
+def test_read_obo_cache_hit(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: pathlib.Path, obo_path: pathlib.Path
+) -> None:
+    cache_dir = tmp_path / "cache"
+    graph = obonet.read_obo(obo_path, cache_dir=cache_dir)
+    assert len(list(cache_dir.glob("*" + cache_suffix))) == 1
+    monkeypatch.setattr(obonet.read, "build_graph", fail_build_graph)
+    cached = obonet.read_obo(obo_path, cache_dir=cache_dir)
+    assert list(cached.nodes(data=True)) == list(graph.nodes(data=True))
+    assert list(cached.edges(keys=True)) == list(graph.edges(keys=True))
+    assert cached.graph == graph.graph
+
+
+def test_read_obo_cache_options_are_keyed(
+    tmp_path: pathlib.Path, obo_path: pathlib.Path
+) -> None:
+    cache_dir = tmp_path / "cache"
+    obonet.read_obo(obo_path, cache_dir=cache_dir)
+    graph = obonet.read_obo(obo_path, cache_dir=cache_dir, include_clauses=True)
+    assert "_clauses" in graph.graph
+    assert len(list(cache_dir.glob("*" + cache_suffix))) == 2
+
+
+def test_read_obo_cache_invalidated_by_change(
+    tmp_path: pathlib.Path, obo_path: pathlib.Path
+) -> None:
+    cache_dir = tmp_path / "cache"
+    graph = obonet.read_obo(obo_path, cache_dir=cache_dir)
+    assert graph.nodes["TAXRANK:0000001"]["name"] == "phylum"
+    text = obo_path.read_text().replace("name: phylum\n", "name: phylum renamed\n")
+    obo_path.write_text(text)
+    graph = obonet.read_obo(obo_path, cache_dir=cache_dir)
+    assert graph.nodes["TAXRANK:0000001"]["name"] == "phylum renamed"
+
+
+def test_read_obo_cache_same_size_change(
+    tmp_path: pathlib.Path, obo_path: pathlib.Path
+) -> None:
+    """
+    A change that preserves the file size, with a modification time that
+    differs by a single nanosecond, is detected through the content hash.
+    """
+    cache_dir = tmp_path / "cache"
+    stat = obo_path.stat()
+    obonet.read_obo(obo_path, cache_dir=cache_dir)
+    text = obo_path.read_text().replace("name: phylum\n", "name: phylun\n")
+    obo_path.write_text(text)
+    os.utime(obo_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+    graph = obonet.read_obo(obo_path, cache_dir=cache_dir)
+    assert graph.nodes["TAXRANK:0000001"]["name"] == "phylun"
+
+
+def test_read_obo_cache_touched_file(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: pathlib.Path, obo_path: pathlib.Path
+) -> None:
+    """
+    Changing only the modification time should not require parsing.
+    """
+    cache_dir = tmp_path / "cache"
+    obonet.read_obo(obo_path, cache_dir=cache_dir)
+    stat = obo_path.stat()
+    os.utime(obo_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    monkeypatch.setattr(obonet.read, "build_graph", fail_build_graph)
+    graph = obonet.read_obo(obo_path, cache_dir=cache_dir)
+    assert len(graph) == 61
+
+
+def test_read_obo_cache_pipe(
+    tmp_path: pathlib.Path,
+    obo_path: pathlib.Path,
+    pipe_file: Callable[[pathlib.Path], str],
+) -> None:
+    """
+    Pipes are read once and not cached, since their content cannot be
+    hashed without consuming it.
+    """
+    cache_dir = tmp_path / "cache"
+    graph = obonet.read_obo(pipe_file(obo_path), cache_dir=cache_dir)
+    assert len(graph) == 61
+    assert not list(cache_dir.glob("*" + cache_suffix))
+
+
+class RejectHeadRequestHandler(QuietRequestHandler):
+    def do_HEAD(self) -> None:
+        self.send_error(http.HTTPStatus.METHOD_NOT_ALLOWED)
+
+
+@pytest.fixture
+def reject_head_url() -> Iterator[str]:
+    """
+    Base URL of a local HTTP server serving tests/data that answers HEAD
+    requests with 405 Method Not Allowed.
+    """
+    handler = functools.partial(
+        RejectHeadRequestHandler, directory=os.path.join(directory, "data")
+    )
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address[:2]
+    yield f"http://{host!s}:{port}/"
+    server.shutdown()
+    server.server_close()
+
+
+def test_read_obo_cache_url_rejecting_head(
+    tmp_path: pathlib.Path, reject_head_url: str
+) -> None:
+    cache_dir = tmp_path / "cache"
+    graph = obonet.read_obo(reject_head_url + "taxrank.obo", cache_dir=cache_dir)
+    assert len(graph) == 61
+    assert not list(cache_dir.glob("*" + cache_suffix))
+
+
+def test_prune_cache(tmp_path: pathlib.Path) -> None:
+    for i in range(4):
+        path = tmp_path / f"{i}{cache_suffix}"
+        path.write_bytes(b"x" * 100)
+        os.utime(path, ns=(i * 10**9, i * 10**9))
+    (tmp_path / "unrelated.txt").write_bytes(b"x" * 1000)
+    deleted = prune_cache(tmp_path, max_bytes=250)
+    assert sorted(os.path.basename(path) for path in deleted) == [
+        f"0{cache_suffix}",
+        f"1{cache_suffix}",
+    ]
+    assert (tmp_path / "unrelated.txt").exists()
@@ -1,8 +1,26 @@
+import bz2
+import gzip
+import io
+import json
+import lzma
+import multiprocessing
 import os
 import pathlib
+import shutil
 from typing import Any
 
-from obonet.cli import main
+import pytest
+from networkx.readwrite import json_graph
+
+import obonet
+import obonet.cli
+from obonet.cli import (
+    convert_files,
+    get_output_name,
+    json_default,
+    main,
+    write_node_link,
+)
 
 directory = os.path.dirname(os.path.abspath(__file__))
 
@@ -17,6 +35,13 @@ def test_cli_stdout(capsys: Any) -> None:
     assert '"taxonomic_rank"' in captured.out
 
 
+def test_cli_version(capsys: Any) -> None:
+    with pytest.raises(SystemExit) as excinfo:
+        main(["--version"])
+    assert excinfo.value.code == 0
+    assert capsys.readouterr().out.startswith("obonet ")
+
+
 def test_cli_output_file(tmp_path: pathlib.Path) -> None:
     path = os.path.join(directory, "data", "taxrank.obo")
     output = tmp_path / "taxrank.json"
@@ -25,3 +50,181 @@ def test_cli_output_file(tmp_path: pathlib.Path) -> None:
     assert '"directed": true' in text
     assert '"TAXRANK:0000060"' in text
     assert '"_clauses"' not in text
+
+
+def test_cli_tags(tmp_path: pathlib.Path) -> None:
+    path = os.path.join(directory, "data", "taxrank.obo")
+    output = tmp_path / "taxrank.json"
+    main([path, "--output", str(output), "--tags", "name,is_a"])
+    data = json.loads(output.read_text())
+    node = next(node for node in data["nodes"] if node["id"] == "TAXRANK:0000017")
+    assert node == {"name": "kingdom", "is_a": ["TAXRANK:0000000"], "id": node["id"]}
+    main([path, "--output", str(output), "--exclude-tags", "xref"])
+    assert '"xref"' not in output.read_text()
+
+
+def test_cli_resolve_imports(tmp_path: pathlib.Path) -> None:
+    path = os.path.join(directory, "data", "imports", "root.obo")
+    output = tmp_path / "root.json"
+    main([path, "--output", str(output), "--resolve-imports"])
+    graph = json_graph.node_link_graph(json.loads(output.read_text()))
+    assert graph.nodes["LEAF:1"] == {"name": "leaf term"}
+
+
+def test_cli_ndjson(tmp_path: pathlib.Path) -> None:
+    path = os.path.join(directory, "data", "taxrank.obo")
+    output = tmp_path / "taxrank.ndjson"
+    main([path, "--output", str(output), "--format", "ndjson"])
+    records = [json.loads(line) for line in output.read_text().splitlines()]
+    assert records[0]["directed"] is True
+    assert records[0]["graph"]["name"] == "taxrank"
+    nodes = [record["node"] for record in records if "node" in record]
+    links = [record["link"] for record in records if "link" in record]
+    assert len(nodes) + len(links) + 1 == len(records)
+    assert len(nodes) == 61
+    assert {
+        "source": "TAXRANK:0000006",
+        "target": "TAXRANK:0000000",
+        "key": "is_a",
+    } in links
+
+
+def test_cli_binary(tmp_path: pathlib.Path) -> None:
+    path = os.path.join(directory, "data", "taxrank.obo")
+    output = tmp_path / "taxrank.obonet"
+    main([path, "--output", str(output), "--format", "binary"])
+    graph = obonet.read_binary(output)
+    expected = obonet.read_obo(path)
+    assert list(graph.nodes(data=True)) == list(expected.nodes(data=True))
+    assert list(graph.edges(keys=True)) == list(expected.edges(keys=True))
+
+
+@pytest.mark.parametrize("indent", [None, 0, 2])
+def test_write_node_link_matches_node_link_data(indent: int | None) -> None:
+    path = os.path.join(directory, "data", "brenda-subset.obo")
+    graph = obonet.read_obo(path, include_clauses=True)
+    write_file = io.StringIO()
+    write_node_link(graph, write_file, indent=indent)
+    data = json_graph.node_link_data(graph)
+    expected = json.dumps(data, ensure_ascii=False, indent=indent, default=json_default)
+    assert write_file.getvalue() == expected + "\n"
+
+
+@pytest.mark.parametrize("extension", [".gz", ".bz2", ".xz"])
+@pytest.mark.parametrize("output_format", ["json", "ndjson", "binary"])
+def test_cli_compressed_output(
+    tmp_path: pathlib.Path, extension: str, output_format: str
+) -> None:
+    path = os.path.join(directory, "data", "taxrank.obo")
+    uncompressed = tmp_path / f"taxrank.{output_format}"
+    compressed = tmp_path / f"taxrank.{output_format}{extension}"
+    for output in uncompressed, compressed:
+        main([path, "--output", str(output), "--format", output_format])
+    module = {".gz": gzip, ".bz2": bz2, ".xz": lzma}[extension]
+    assert module.decompress(compressed.read_bytes()) == uncompressed.read_bytes()
+    if output_format == "binary":
+        graph = obonet.read_binary(compressed)
+        assert list(graph) == list(obonet.read_binary(uncompressed))
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_cli_batch(tmp_path: pathlib.Path, capsys: Any, jobs: int) -> None:
+    data_dir = os.path.join(directory, "data")
+    manifest = tmp_path / "manifest.txt"
+    manifest.write_text(
+        "# ontologies\n"
+        f"{os.path.join(data_dir, 'brenda-subset.obo')}\n"
+        "\n"
+        f"{os.path.join(data_dir, 'missing.obo')}\n"
+    )
+    output_dir = tmp_path / "output"
+    args = [
+        os.path.join(data_dir, "taxrank.obo.gz"),
+        "--manifest",
+        str(manifest),
+        "--output-dir",
+        str(output_dir),
+        "--jobs",
+        str(jobs),
+    ]
+    with pytest.raises(SystemExit) as exit_info:
+        main(args)
+    assert exit_info.value.code == 1
+    assert sorted(os.listdir(output_dir)) == ["brenda-subset.json", "taxrank.json"]
+    data = json.loads((output_dir / "taxrank.json").read_text())
+    assert len(data["nodes"]) == 61
+    lines = capsys.readouterr().err.splitlines()
+    assert lines[0].startswith(os.path.join(data_dir, "taxrank.obo.gz") + ": 61 nodes")
+    assert "missing.obo: failed after" in lines[2]
+    assert "FileNotFoundError" in lines[2]
+    assert lines[3] == "converted 2 of 3 files"
+
+
+def read_obo_or_exit(path: str, **kwargs: Any) -> Any:
+    """
+    Read path with obonet.read_obo, exiting the process for crash.obo.
+    """
+    if os.path.basename(path) == "crash.obo":
+        os._exit(1)
+    return obonet.read_obo(path, **kwargs)
+
+
+def test_convert_files_terminated_worker(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: pathlib.Path
+) -> None:
+    """
+    A worker process that is killed only fails the conversion it was running.
+    """
+    if multiprocessing.get_start_method() != "fork":
+        pytest.skip("workers only inherit the patched read_obo when forked")
+    monkeypatch.setattr(obonet.cli, "read_obo", read_obo_or_exit)
+    data_dir = os.path.join(directory, "data")
+    crash_path = tmp_path / "crash.obo"
+    shutil.copy(os.path.join(data_dir, "taxrank.obo"), crash_path)
+    paths = [
+        os.path.join(data_dir, "taxrank.obo"),
+        str(crash_path),
+        os.path.join(data_dir, "brenda-subset.obo"),
+    ]
+    results = convert_files(paths, str(tmp_path / "output"), jobs=2)
+    assert [result.path for result in results] == paths
+    assert [result.error is None for result in results] == [True, False, True]
+    assert "terminated" in str(results[1].error)
+    assert results[0].nodes == 61
+    assert sorted(os.listdir(tmp_path / "output")) == [
+        "brenda-subset.json",
+        "taxrank.json",
+    ]
+
+
+@pytest.mark.parametrize(
+    ("args", "message"),
+    [
+        ([], "no paths to convert"),
+        (["{path}", "{path}.gz"], "multiple paths require --output-dir"),
+        (
+            ["{path}", "{path}.gz", "--output-dir", "{tmp_path}"],
+            "same output file",
+        ),
+        (
+            ["{path}", "--output-dir", "{tmp_path}", "--output", "x.json"],
+            "--output-dir cannot be used with --output",
+        ),
+    ],
+)
+def test_cli_batch_usage_errors(
+    tmp_path: pathlib.Path, capsys: Any, args: list[str], message: str
+) -> None:
+    path = os.path.join(directory, "data", "taxrank.obo")
+    args = [arg.format(path=path, tmp_path=tmp_path) for arg in args]
+    with pytest.raises(SystemExit) as exit_info:
+        main(args)
+    assert exit_info.value.code == 2
+    assert message in capsys.readouterr().err
+
+
+def test_get_output_name() -> None:
+    assert get_output_name("data/go.obo", "json") == "go.json"
+    assert get_output_name("data/go.obo.xz", "ndjson") == "go.ndjson"
+    assert get_output_name("https://example.org/hp.obo?x=1", "binary") == "hp.obonet"
+    assert get_output_name("data/go-basic.txt", "json") == "go-basic.txt.json"
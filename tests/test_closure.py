@@ -0,0 +1,124 @@
+import graphlib
+import io
+import os
+import pickle
+
+import networkx
+import pytest
+
+import obonet
+from obonet.closure import ClosureIndex, build_closure
+
+directory = os.path.dirname(os.path.abspath(__file__))
+
+obo_text = """\
+format-version: 1.4
+ontology: closure-test
+
+[Term]
+id: T:1
+
+[Term]
+id: T:2
+is_a: T:1
+
+[Term]
+id: T:3
+relationship: part_of T:2
+
+[Term]
+id: T:4
+relationship: adjacent_to T:3
+
+[Term]
+id: T:5
+is_a: T:4
+
+[Term]
+id: T:6
+relationship: regulates T:3
+
+[Typedef]
+id: part_of
+is_transitive: true
+
+[Typedef]
+id: adjacent_to
+
+[Typedef]
+id: regulates
+transitive_over: part_of
+"""
+
+
+def read_test_graph() -> networkx.MultiDiGraph:
+    return obonet.read_obo(io.StringIO(obo_text))
+
+
+def test_build_closure_taxrank_matches_descendants() -> None:
+    path = os.path.join(directory, "data", "taxrank.obo")
+    graph = obonet.read_obo(path)
+    closure = build_closure(graph)
+    assert len(closure) == len(graph)
+    for node in graph:
+        assert closure.ancestors(node) == networkx.descendants(graph, node)
+        assert closure.descendants(node) == networkx.ancestors(graph, node)
+    assert closure.is_ancestor("TAXRANK:0000006", "TAXRANK:0000000")
+    assert not closure.is_ancestor("TAXRANK:0000000", "TAXRANK:0000006")
+    assert not closure.is_ancestor("TAXRANK:0000006", "TAXRANK:0000006")
+    assert not closure.is_ancestor("TAXRANK:0000006", "not a node")
+
+
+def test_build_closure_transitivity() -> None:
+    closure = build_closure(
+        read_test_graph(), ["is_a", "part_of", "adjacent_to", "regulates"]
+    )
+    assert closure.ancestors("T:3") == {"T:2", "T:1"}
+    # adjacent_to is not transitive, but is followed by is_a edges
+    assert closure.ancestors("T:4") == {"T:3"}
+    assert closure.ancestors("T:5") == {"T:4", "T:3"}
+    # regulates is transitive_over part_of
+    assert closure.ancestors("T:6") == {"T:3", "T:2", "T:1"}
+    assert closure.descendants("T:3") == {"T:4", "T:5", "T:6"}
+
+
+def test_build_closure_relations() -> None:
+    closure = build_closure(read_test_graph(), ["part_of"])
+    assert closure.relations == ("part_of",)
+    assert closure.ancestors("T:3") == {"T:2"}
+    assert closure.ancestors("T:2") == set()
+
+
+def test_build_closure_cycle() -> None:
+    graph = read_test_graph()
+    graph.add_edge("T:1", "T:5", key="is_a")
+    build_closure(graph, ["is_a"])
+    with pytest.raises(graphlib.CycleError):
+        build_closure(graph, ["is_a", "part_of", "adjacent_to"])
+
+
+def test_read_obo_closure_pickle() -> None:
+    graph = obonet.read_obo(io.StringIO(obo_text), closure=["is_a", "part_of"])
+    closure = graph.graph["closure"]
+    assert isinstance(closure, ClosureIndex)
+    graph = pickle.loads(pickle.dumps(graph))
+    closure = graph.graph["closure"]
+    assert closure.ancestors("T:3") == {"T:2", "T:1"}
+    assert closure.descendants("T:1") == {"T:2", "T:3"}
+    assert "T:6" in closure
+
+
+def test_read_obo_closure_tag_filters() -> None:
+    graph = obonet.read_obo(
+        io.StringIO(obo_text), closure=["is_a"], include_tags=["name", "is_a"]
+    )
+    assert graph.graph["closure"].ancestors("T:5") == {"T:4"}
+    assert graph.graph["closure"].ancestors("T:2") == {"T:1"}
+    with pytest.raises(ValueError, match="requires the is_a tags"):
+        obonet.read_obo(io.StringIO(obo_text), closure=["is_a"], include_tags=["name"])
+    with pytest.raises(ValueError, match="relationship"):
+        obonet.read_obo(
+            io.StringIO(obo_text),
+            closure=["is_a", "part_of"],
+            exclude_tags=["relationship"],
+        )
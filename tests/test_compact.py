@@ -0,0 +1,92 @@
+import io
+import os
+import pickle
+import sys
+from typing import Any
+
+import pytest
+from networkx.readwrite import json_graph
+
+import obonet
+from obonet.compact import TagCompactor, TagRecord
+
+directory = os.path.dirname(os.path.abspath(__file__))
+
+
+def tuples_to_lists(data: Any) -> dict[str, Any]:
+    return {
+        key: list(value) if isinstance(value, tuple) else value
+        for key, value in data.items()
+    }
+
+
+@pytest.mark.parametrize("filename", ["taxrank.obo", "brenda-subset.obo"])
+def test_read_obo_compact_matches_default(filename: str) -> None:
+    path = os.path.join(directory, "data", filename)
+    graph = obonet.read_obo(path, ignore_obsolete=False)
+    compact = obonet.read_obo(path, ignore_obsolete=False, compact=True)
+    assert list(compact) == list(graph)
+    for node, data in compact.nodes(data=True):
+        assert tuples_to_lists(data) == graph.nodes[node]
+    assert list(compact.edges(keys=True)) == list(graph.edges(keys=True))
+    assert compact.graph == graph.graph
+
+
+def test_read_obo_compact_records() -> None:
+    path = os.path.join(directory, "data", "taxrank.obo")
+    graph = obonet.read_obo(path, compact=True)
+    data = graph.nodes["TAXRANK:0000017"]
+    assert isinstance(data, TagRecord)
+    assert data["name"] == "kingdom"
+    assert isinstance(data["xref"], tuple)
+    assert "NCBITaxon:kingdom" in data["xref"]
+    assert data.get("namespace") is None
+    with pytest.raises(TypeError):
+        data["name"] = "renamed"  # type: ignore [index]
+    # records with the same tags share a layout
+    other = graph.nodes["TAXRANK:0000018"]
+    assert list(other) == list(data)
+    assert other._layout is data._layout
+    # identifiers are interned so edges and attributes share strings
+    (target,) = data["is_a"]
+    assert target is sys.intern("TAXRANK:0000000")
+
+
+def test_read_obo_compact_networkx_operations() -> None:
+    path = os.path.join(directory, "data", "taxrank.obo")
+    graph = obonet.read_obo(path, compact=True)
+    copied = graph.copy()
+    copied.nodes["TAXRANK:0000017"]["name"] = "renamed"
+    assert graph.nodes["TAXRANK:0000017"]["name"] == "kingdom"
+    subgraph = graph.subgraph(["TAXRANK:0000017", "TAXRANK:0000000"])
+    assert subgraph.nodes["TAXRANK:0000017"]["name"] == "kingdom"
+    data = json_graph.node_link_data(graph, edges="links")
+    assert any(node["id"] == "TAXRANK:0000017" for node in data["nodes"])
+    unpickled = pickle.loads(pickle.dumps(graph))
+    assert unpickled.nodes["TAXRANK:0000017"] == graph.nodes["TAXRANK:0000017"]
+
+
+def test_tag_compactor_duplicate_merge() -> None:
+    lines = [
+        "[Term]\n",
+        "id: T:1\n",
+        "name: one\n",
+        "\n",
+        "[Term]\n",
+        "id: T:1\n",
+        "subset: slim\n",
+    ]
+    graph = obonet.read_obo(io.StringIO("".join(lines)), compact=True)
+    assert dict(graph.nodes["T:1"]) == {"name": "one", "subset": ("slim",)}
+
+
+def test_tag_compactor() -> None:
+    compactor = TagCompactor()
+    record = compactor({"name": "a", "subset": ["x", "y"]})
+    assert record == {"name": "a", "subset": ("x", "y")}
+    assert record.copy() == {"name": "a", "subset": ("x", "y")}
+    assert len(record) == 2
+    assert "subset" in record
+    assert "def" not in record
+    assert repr(record) == "TagRecord({'name': 'a', 'subset': ('x', 'y')})"
+    assert len(compactor.layouts) == 1
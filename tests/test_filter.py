@@ -0,0 +1,161 @@
+import gzip
+import io
+import os
+import pathlib
+from collections.abc import Callable
+
+import pytest
+
+import obonet
+from obonet.cli import main
+from obonet.filter import filter_obo
+
+directory = os.path.dirname(os.path.abspath(__file__))
+taxrank_path = os.path.join(directory, "data", "taxrank.obo")
+
+obo_text = """\
+format-version: 1.4
+default-namespace: process
+subsetdef: slim "Slim"
+ontology: filter-test
+
+[Term]
+id: A:1
+name: one
+subset: slim
+! a comment line
+
+[Term]
+id: A:2
+name: two ! with a comment
+namespace: function
+is_a: A:1 {source="x"}
+
+
+[Term]
+id: B:3
+name: three
+subset: other
+subset: slim
+relationship: part_of A:2
+
+[Term]
+id: A:4
+name: four
+is_obsolete: true
+subset: slim
+
+[Typedef]
+id: part_of
+name: part of
+
+[Instance]
+id: I:1
+instance_of: A:1
+"""
+
+
+def filter_text(**kwargs: object) -> str:
+    output = io.StringIO()
+    filter_obo(io.StringIO(obo_text), output, **kwargs)  # type: ignore[arg-type]
+    return output.getvalue()
+
+
+def get_term_ids(text: str) -> list[str]:
+    return [line[4:] for line in text.splitlines() if line.startswith("id: ")]
+
+
+@pytest.mark.parametrize(
+    ("kwargs", "expected"),
+    [
+        ({}, ["A:1", "A:2", "B:3"]),
+        ({"ignore_obsolete": False}, ["A:1", "A:2", "B:3", "A:4"]),
+        # terms without a namespace tag are in the default-namespace
+        ({"namespaces": ["process"]}, ["A:1", "B:3"]),
+        ({"namespaces": ["function", "other"]}, ["A:2"]),
+        ({"subsets": ["slim"]}, ["A:1", "B:3"]),
+        ({"subsets": ["slim"], "ignore_obsolete": False}, ["A:1", "B:3", "A:4"]),
+        ({"id_prefixes": ["B:"]}, ["B:3"]),
+        ({"id_prefixes": ["A:", "C:"], "subsets": ["slim"]}, ["A:1"]),
+        ({"namespaces": []}, []),
+    ],
+)
+def test_filter_obo(kwargs: dict[str, object], expected: list[str]) -> None:
+    text = filter_text(**kwargs)
+    # the typedef and instance are always kept
+    assert get_term_ids(text) == [*expected, "part_of", "I:1"]
+
+
+def test_filter_obo_writes_stanzas_verbatim() -> None:
+    text = filter_text(id_prefixes=["A:"])
+    blocks = obo_text.replace("\n\n\n", "\n\n").split("\n\n")
+    kept = [
+        block for block in blocks if "id: B:3" not in block and "id: A:4" not in block
+    ]
+    assert text == "\n\n".join(kept)
+    assert "! a comment line\n\n[Term]\nid: A:2\nname: two ! with a comment" in text
+    # the output is read like the input, without the dropped terms
+    graph = obonet.read_obo(io.StringIO(text))
+    assert list(graph) == ["A:1", "A:2"]
+    assert graph.graph["subsetdef"] == ['slim "Slim"']
+
+
+def test_filter_obo_leading_whitespace_line() -> None:
+    """
+    A whitespace-only first line does not make the first term a header.
+    """
+    text = "  \n[Term]\nid: A:1\n\n[Term]\nid: B:1\n \t"
+    output = io.StringIO()
+    assert filter_obo(io.StringIO(text), output, id_prefixes=["B:"]) == 1
+    assert output.getvalue() == "[Term]\nid: B:1\n"
+    assert list(obonet.read_obo(io.StringIO(text))) == ["A:1", "B:1"]
+
+
+def test_filter_obo_paths(tmp_path: pathlib.Path) -> None:
+    output = tmp_path / "taxrank-slim.obo.gz"
+    n_terms = filter_obo(taxrank_path, output, id_prefixes=["TAXRANK:000000"])
+    with gzip.open(output, "rt", encoding="utf-8") as read_file:
+        graph = obonet.read_obo(read_file)
+    assert n_terms == len(graph) == 10
+    assert graph.graph == obonet.read_obo(taxrank_path).graph
+    assert filter_obo(taxrank_path, io.StringIO(), namespaces=["taxonomic_rank"]) == 61
+
+
+def test_filter_obo_pipe(
+    tmp_path: pathlib.Path, pipe_file: Callable[[str], str]
+) -> None:
+    expected = io.StringIO()
+    filter_obo(taxrank_path, expected, id_prefixes=["TAXRANK:000000"])
+    output = io.StringIO()
+    n_terms = filter_obo(
+        pipe_file(taxrank_path), output, id_prefixes=["TAXRANK:000000"]
+    )
+    assert n_terms == 10
+    assert output.getvalue() == expected.getvalue()
+    # obonet filter reading from a pipe, as with <(zcat go.obo.gz)
+    cli_output = tmp_path / "filtered.obo"
+    args = ["--output", str(cli_output), "--id-prefix", "TAXRANK:000000"]
+    main(["filter", pipe_file(taxrank_path), *args])
+    assert cli_output.read_text() == expected.getvalue()
+
+
+def test_filter_obo_empty() -> None:
+    output = io.StringIO()
+    assert filter_obo(io.StringIO(""), output) == 0
+    assert output.getvalue() == ""
+
+
+def test_cli_filter(tmp_path: pathlib.Path, capsys: pytest.CaptureFixture[str]) -> None:
+    path = tmp_path / "filter-test.obo"
+    path.write_text(obo_text)
+    main(["filter", str(path), "--subset", "slim", "--include-obsolete"])
+    assert get_term_ids(capsys.readouterr().out) == [
+        "A:1",
+        "B:3",
+        "A:4",
+        "part_of",
+        "I:1",
+    ]
+    output = tmp_path / "filtered.obo"
+    main(["filter", str(path), "--output", str(output), "--id-prefix", "B:"])
+    assert get_term_ids(output.read_text()) == ["B:3", "part_of", "I:1"]
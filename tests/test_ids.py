@@ -0,0 +1,103 @@
+import io
+import pickle
+
+import obonet
+from obonet.ids import IdIndex
+
+obo_text = """\
+format-version: 1.4
+ontology: ids-test
+
+[Term]
+id: T:1
+name: one
+alt_id: T:10
+alt_id: T:11
+
+[Term]
+id: T:2
+name: two
+alt_id: T:1
+
+[Term]
+id: T:3
+name: three (obsolete)
+alt_id: T:30
+is_obsolete: true
+replaced_by: T:4
+
+[Term]
+id: T:4
+name: four (obsolete)
+is_obsolete: true
+replaced_by: T:11
+
+[Term]
+id: T:5
+name: five (obsolete)
+is_obsolete: true
+consider: T:1
+consider: T:2
+
+[Term]
+id: T:6
+name: six (obsolete)
+is_obsolete: true
+replaced_by: T:1
+replaced_by: T:2
+
+[Term]
+id: T:8
+name: eight (obsolete)
+is_obsolete: true
+replaced_by: T:1
+"""
+
+
+def test_read_obo_id_index() -> None:
+    graph = obonet.read_obo(io.StringIO(obo_text), id_index=True)
+    assert list(graph) == ["T:1", "T:2"]
+    index = graph.graph["id_index"]
+    assert isinstance(index, IdIndex)
+    assert index.resolve("T:1") == "T:1"
+    assert index.resolve("T:10") == "T:1"
+    # primary ids take precedence over alt_id values
+    assert index.resolve("T:2") == "T:2"
+    # T:3 is replaced by T:4, which is replaced by an alt_id of T:1
+    assert index.resolve("T:3") == "T:1"
+    assert index.resolve("T:30") == "T:1"
+    # a replacement that is the primary id of a term is not an alt_id
+    assert index.resolve("T:8") == "T:1"
+    assert index.resolve("T:5") is None
+    assert index.resolve("T:6") is None
+    assert index.resolve("T:7") is None
+    assert index.resolve_ids(["T:11", "T:4", "T:5", "T:2"]) == [
+        "T:1",
+        "T:1",
+        None,
+        "T:2",
+    ]
+    assert index.replacements("T:5") == ["T:1", "T:2"]
+    assert index.replacements("T:1") == []
+    assert "T:30" in index
+    assert "T:6" not in index
+
+
+def test_read_obo_id_index_tags() -> None:
+    graph = obonet.read_obo(
+        io.StringIO(obo_text),
+        id_index=True,
+        include_tags=["name"],
+        exclude_tags=["alt_id"],
+    )
+    assert graph.graph["id_index"].resolve("T:30") == "T:1"
+    # tags parsed only for the index are not stored on nodes
+    assert graph.nodes["T:1"] == {"name": "one"}
+
+
+def test_id_index_pickle() -> None:
+    graph = obonet.read_obo(io.StringIO(obo_text), id_index=True, compact=True)
+    index = pickle.loads(pickle.dumps(graph.graph["id_index"]))
+    assert index.resolve("T:3") == "T:1"
+    index.add_term("T:7", {"alt_id": ["T:70"]})
+    assert index.resolve("T:70") == "T:7"
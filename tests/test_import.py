@@ -0,0 +1,66 @@
+import os
+import subprocess
+import sys
+
+directory = os.path.dirname(os.path.abspath(__file__))
+root_directory = os.path.dirname(directory)
+
+# Modules that are slow to import and only needed by some functions
+deferred_modules = {"networkx", "importlib.metadata", "urllib.request", "numpy"}
+
+
+def get_imported_modules(code: str) -> dict[str, int]:
+    """
+    Run code in a new interpreter with python -X importtime and return the
+    cumulative import time in microseconds of each imported module.
+    """
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=root_directory,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        modules[name.strip()] = int(cumulative)
+    return modules
+
+
+def test_import_obonet_defers_networkx() -> None:
+    modules = get_imported_modules("import obonet")
+    assert "obonet" in modules
+    assert not deferred_modules & modules.keys()
+
+
+def test_import_cli_defers_networkx() -> None:
+    modules = get_imported_modules("import obonet.cli")
+    assert "obonet.cli" in modules
+    assert not deferred_modules & modules.keys()
+
+
+def test_stanza_api_without_networkx() -> None:
+    path = os.path.join(directory, "data", "taxrank.obo")
+    code = f"""
+import sys
+
+sys.modules["networkx"] = None
+import obonet
+from obonet.read import get_sections
+
+stanzas = list(obonet.iter_stanzas({path!r}))
+assert stanzas[0].stanza_type == "header"
+with open({path!r}) as read_file:
+    typedefs, terms, instances, header = get_sections(read_file)
+assert len(terms) == len(stanzas) - len(typedefs) - 1
+try:
+    obonet.read_obo({path!r})
+except ImportError:
+    pass
+else:
+    raise AssertionError("read_obo did not require networkx")
+"""
+    subprocess.run([sys.executable, "-c", code], cwd=root_directory, check=True)
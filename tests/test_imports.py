@@ -0,0 +1,130 @@
+import io
+import os
+import pathlib
+
+import pytest
+
+import obonet
+from obonet.imports import resolve_import
+
+directory = os.path.dirname(os.path.abspath(__file__))
+imports_dir = os.path.join(directory, "data", "imports")
+
+
+@pytest.mark.parametrize("workers", [None, 2])
+def test_read_obo_resolve_imports_chain(workers: int | None) -> None:
+    path = os.path.join(imports_dir, "root.obo")
+    graph = obonet.read_obo(path, resolve_imports=True, workers=workers)
+    assert list(graph) == ["ROOT:1", "ROOT:2", "MID:1", "LEAF:1"]
+    assert graph.nodes["LEAF:1"] == {"name": "leaf term"}
+    assert sorted(graph.edges(keys=True)) == [
+        ("MID:1", "LEAF:1", "is_a"),
+        ("ROOT:1", "MID:1", "is_a"),
+        ("ROOT:2", "LEAF:1", "part_of"),
+    ]
+    assert graph.graph["name"] == "root"
+    assert graph.graph["import"] == [
+        "middle.obo",
+        "http://purl.obolibrary.org/obo/ro.owl",
+    ]
+    assert [typedef["id"] for typedef in graph.graph["typedefs"]] == ["part_of"]
+
+
+def test_read_obo_imports_not_resolved_by_default() -> None:
+    graph = obonet.read_obo(os.path.join(imports_dir, "root.obo"))
+    assert list(graph) == ["ROOT:1", "ROOT:2", "MID:1", "LEAF:1"]
+    assert graph.nodes["MID:1"] == {}
+
+
+def test_read_obo_resolve_imports_cycle() -> None:
+    path = os.path.join(imports_dir, "cycle-a.obo")
+    graph = obonet.read_obo(path, resolve_imports=True)
+    assert list(graph) == ["A:1", "B:1"]
+    # tags of a term defined by several ontologies are combined
+    assert graph.nodes["A:1"] == {
+        "name": "a term",
+        "is_a": ["B:1"],
+        "def": '"A term defined in cycle-a." []',
+    }
+    assert graph.graph["name"] == "cycle-a"
+
+
+def test_read_obo_resolve_imports_precedence(tmp_path: pathlib.Path) -> None:
+    """
+    Typedefs and term tags of an ontology replace those of its imports.
+    """
+    files = {
+        "main.obo": (
+            "import: a.obo\nimport: b.obo\n\n"
+            "[Term]\nid: X:1\nname: main name\n\n"
+            "[Typedef]\nid: has_part\nname: main has part\n"
+        ),
+        "a.obo": (
+            "import: c.obo\n\n"
+            '[Term]\nid: X:1\nname: a name\ndef: "a def" []\nis_a: X:2\n\n'
+            "[Typedef]\nid: has_part\nname: a has part\n\n"
+            "[Typedef]\nid: part_of\nname: a part of\n"
+        ),
+        "b.obo": (
+            "[Term]\nid: X:2\nname: b name\n\n[Typedef]\nid: part_of\nname: b part of\n"
+        ),
+        "c.obo": '[Term]\nid: X:1\ndef: "c def" []\ncomment: c comment\n',
+    }
+    for name, text in files.items():
+        (tmp_path / name).write_text(text)
+    graph = obonet.read_obo(tmp_path / "main.obo", resolve_imports=True)
+    assert list(graph) == ["X:1", "X:2"]
+    assert graph.nodes["X:1"] == {
+        "name": "main name",
+        "def": '"a def" []',
+        "is_a": ["X:2"],
+        "comment": "c comment",
+    }
+    assert graph.graph["typedefs"] == [
+        {"id": "has_part", "name": "main has part"},
+        {"id": "part_of", "name": "a part of"},
+    ]
+
+
+def test_read_obo_resolve_imports_url(data_url: str) -> None:
+    # data_url serves tests/data, which contains the imports directory
+    graph = obonet.read_obo(data_url + "imports/root.obo", resolve_imports=True)
+    local = obonet.read_obo(os.path.join(imports_dir, "root.obo"), resolve_imports=True)
+    assert list(graph.nodes(data=True)) == list(local.nodes(data=True))
+
+
+def test_read_obo_resolve_imports_file_object(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.chdir(imports_dir)
+    text = "format-version: 1.4\nimport: nested/leaf.obo\n\n[Term]\nid: X:1\n"
+    graph = obonet.read_obo(io.StringIO(text), resolve_imports=True)
+    assert list(graph) == ["X:1", "LEAF:1"]
+
+
+def test_read_obo_resolve_imports_not_cached(tmp_path: pathlib.Path) -> None:
+    path = os.path.join(imports_dir, "root.obo")
+    cache_dir = tmp_path / "cache"
+    obonet.read_obo(path, resolve_imports=True, cache_dir=cache_dir)
+    assert not cache_dir.exists()
+
+
+@pytest.mark.parametrize(
+    ("value", "base", "expected"),
+    [
+        ("go", None, "http://purl.obolibrary.org/obo/go.obo"),
+        ("http://example.org/a.obo", "/data/b.obo", "http://example.org/a.obo"),
+        ("imports/a.obo", "/data/b.obo", "/data/imports/a.obo"),
+        ("../a.obo", "/data/sub/b.obo", "/data/a.obo"),
+        ("a.obo", "http://example.org/obo/b.obo", "http://example.org/obo/a.obo"),
+    ],
+)
+def test_resolve_import(value: str, base: str | None, expected: str) -> None:
+    assert resolve_import(value, base) == expected
+
+
+def test_resolve_import_relative_to_working_directory(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: pathlib.Path
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    assert resolve_import("a.obo", None) == os.path.join(os.getcwd(), "a.obo")
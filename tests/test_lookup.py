@@ -0,0 +1,131 @@
+import os
+import pathlib
+import shutil
+
+import pytest
+
+import obonet
+from obonet.lookup import StanzaIndex, get_term, index_suffix
+
+directory = os.path.dirname(os.path.abspath(__file__))
+
+obo_text = """\
+format-version: 1.4
+ontology: lookup-test
+
+[Term]
+id: T:2
+name: second
+is_a: T:1
+
+[Term]
+id: T:1
+name: first
+def: "The first term." []
+
+[Typedef]
+id: part_of
+name: part of
+
+[Term]
+id: T:10 ! a comment
+name: tenth
+is_obsolete: true
+! a comment after the stanza
+
+[Term]
+id: T:2
+name: second, repeated
+
+[Instance]
+id: I:1
+instance_of: T:1
+"""
+
+
+@pytest.fixture
+def obo_path(tmp_path: pathlib.Path) -> pathlib.Path:
+    path = tmp_path / "lookup.obo"
+    path.write_text(obo_text)
+    return path
+
+
+@pytest.mark.parametrize("filename", ["taxrank.obo", "brenda-subset.obo"])
+def test_get_term_matches_read_obo(tmp_path: pathlib.Path, filename: str) -> None:
+    path = tmp_path / filename
+    shutil.copy(os.path.join(directory, "data", filename), path)
+    graph = obonet.read_obo(path, ignore_obsolete=False)
+    for node, data in graph.nodes(data=True):
+        if data:
+            assert get_term(path, node) == data
+    assert get_term(path, "missing") is None
+    assert os.path.exists(str(path) + index_suffix)
+
+
+def test_stanza_index(obo_path: pathlib.Path) -> None:
+    with StanzaIndex.open(obo_path) as index:
+        assert len(index) == 6
+        assert "T:10" in index
+        assert "T:3" not in index
+        assert [stanza_type for stanza_type, _, _ in index.locate("T:2")] == [
+            "Term",
+            "Term",
+        ]
+        (typedef,) = index.get_stanzas("part_of")
+        assert typedef.stanza_type == "Typedef"
+        assert typedef.tags == {"id": "part_of", "name": "part of"}
+        (instance,) = index.get_stanzas("I:1")
+        assert instance.stanza_type == "Instance"
+    assert get_term(obo_path, "T:2") == {"name": "second, repeated", "is_a": ["T:1"]}
+    assert get_term(obo_path, "T:10") == {"name": "tenth", "is_obsolete": "true"}
+    assert get_term(obo_path, "part_of") is None
+
+
+def test_stanza_index_rebuilt_when_source_changes(
+    obo_path: pathlib.Path, tmp_path: pathlib.Path
+) -> None:
+    index_path = tmp_path / "custom-index"
+    assert get_term(obo_path, "T:3", index_path=index_path) is None
+    built = index_path.read_bytes()
+    # an unchanged source reuses the index
+    assert get_term(obo_path, "T:1", index_path=index_path) is not None
+    assert index_path.read_bytes() == built
+    with obo_path.open("a") as write_file:
+        write_file.write("\n[Term]\nid: T:3\nname: third\n")
+    assert get_term(obo_path, "T:3", index_path=index_path) == {"name": "third"}
+    assert get_term(obo_path, "T:1", index_path=index_path) == {
+        "name": "first",
+        "def": '"The first term." []',
+    }
+
+
+def test_stanza_index_crlf_and_empty(tmp_path: pathlib.Path) -> None:
+    path = tmp_path / "crlf.obo"
+    path.write_bytes(obo_text.replace("\n", "\r\n").encode())
+    assert get_term(path, "T:1") == {"name": "first", "def": '"The first term." []'}
+    empty = tmp_path / "empty.obo"
+    empty.touch()
+    with StanzaIndex.open(empty) as index:
+        assert len(index) == 0
+        assert index.locate("T:1") == []
+
+
+def test_get_term_line_separators(tmp_path: pathlib.Path) -> None:
+    """
+    Only newlines separate lines, as in read_obo, and a tag with whitespace
+    before "id" is not an id.
+    """
+    path = tmp_path / "separators.obo"
+    text = "[Term]\nid: S:1\nname: a\u2028b\x0cc\x85d\n\n[Term]\n id: S:2\nid: S:3\n"
+    path.write_text(text, encoding="utf-8")
+    graph = obonet.read_obo(path)
+    assert get_term(path, "S:1") == graph.nodes["S:1"]
+    assert get_term(path, "S:1") == {"name": "a\u2028b\x0cc\x85d"}
+    assert get_term(path, "S:2") is None
+    assert get_term(path, "S:3") == graph.nodes["S:3"] == {" id": ["S:2"]}
+
+
+def test_stanza_index_requires_uncompressed_file() -> None:
+    path = os.path.join(directory, "data", "taxrank.obo.gz")
+    with pytest.raises(ValueError, match="not a local uncompressed file"):
+        get_term(path, "TAXRANK:0000001")
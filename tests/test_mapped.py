@@ -0,0 +1,133 @@
+import io
+import os
+import pathlib
+from collections.abc import Callable
+from typing import Any
+
+import pytest
+
+import obonet
+from obonet.io import can_map_file, iter_mapped_chunks
+from obonet.read import (
+    iter_line_blocks,
+    iter_mapped_text,
+    iter_sections,
+    iter_stanzas,
+    iter_text_blocks,
+)
+
+directory = os.path.dirname(os.path.abspath(__file__))
+
+tricky_text = (
+    "format-version: 1.2\r\n"
+    "remark: header ☃\r\n"
+    "\r\n"
+    "[Term]\r\n"
+    "id: T:1\r\n"
+    "name: first term\r\n"
+    'def: "a definition" [] ! comment\r\n'
+    'xref: X:1 {source="x"}\r\n'
+    " \n"
+    "\n"
+    "[Term]\r"
+    "id: T:2\r"
+    "name: lone carriage returns\r"
+    "is_a: T:1 ! first\r"
+    "\r"
+    "[Typedef]\n"
+    "id: part_of\n"
+    "name: part of\n"
+    "\n"
+    "[Term]\n"
+    "id: T:3\n"
+    "is_a: T:2"
+)
+
+
+@pytest.fixture
+def tricky_path(tmp_path: pathlib.Path) -> pathlib.Path:
+    path = tmp_path / "tricky.obo"
+    path.write_bytes(tricky_text.encode("utf-8"))
+    return path
+
+
+def test_iter_mapped_text_matches_text_file(tricky_path: pathlib.Path) -> None:
+    with open(tricky_path, encoding="utf-8") as read_file:
+        expected = read_file.read()
+    chunks = list(iter_mapped_text(tricky_path, "utf-8"))
+    assert "".join(chunks) == expected
+
+
+@pytest.mark.parametrize("text", [tricky_text, " \t\n\n" + tricky_text + "\n \n"])
+def test_iter_text_blocks_matches_line_blocks(text: str) -> None:
+    text = text.replace("\r\n", "\n").replace("\r", "\n")
+    expected = [
+        [line.rstrip("\n") for line in block]
+        for block in iter_line_blocks(io.StringIO(text))
+    ]
+    assert list(iter_text_blocks([text])) == expected
+    # blocks and blank lines spanning chunks
+    for i in range(len(text)):
+        assert list(iter_text_blocks([text[:i], "", text[i:]])) == expected
+
+
+@pytest.mark.parametrize(
+    "tag_filters",
+    [
+        {},
+        {"include_tags": ["name"]},
+        {"exclude_tags": ["name", "def", "remark"]},
+        {"include_tags": ["is_a", "xref"], "exclude_tags": ["xref"]},
+    ],
+)
+def test_iter_stanzas_mapped_matches_text_file(
+    tricky_path: pathlib.Path, tag_filters: dict[str, Any]
+) -> None:
+    with open(tricky_path, encoding="utf-8") as read_file:
+        expected = list(iter_sections(read_file, include_clauses=True, **tag_filters))
+    stanzas = iter_stanzas(tricky_path, include_clauses=True, **tag_filters)
+    assert list(stanzas) == expected
+
+
+def test_read_obo_mapped_matches_text_file(tricky_path: pathlib.Path) -> None:
+    with open(tricky_path, encoding="utf-8") as read_file:
+        expected = obonet.read_obo(read_file, include_clauses=True)
+    graph = obonet.read_obo(tricky_path, include_clauses=True)
+    assert list(graph.nodes(data=True)) == list(expected.nodes(data=True))
+    assert list(graph.edges(keys=True)) == list(expected.edges(keys=True))
+    assert graph.graph == expected.graph
+
+
+def test_iter_mapped_chunks(tricky_path: pathlib.Path) -> None:
+    data = tricky_path.read_bytes()
+    chunks = list(iter_mapped_chunks(tricky_path, chunk_bytes=16))
+    assert b"".join(chunks) == data
+    assert all(chunk.endswith(b"\n") for chunk in chunks[:-1])
+    assert b"".join(iter_mapped_chunks(tricky_path, start=10, end=40)) == data[10:40]
+
+
+def test_iter_mapped_chunks_empty(tmp_path: pathlib.Path) -> None:
+    path = tmp_path / "empty.obo"
+    path.write_bytes(b"")
+    assert list(iter_mapped_chunks(path)) == []
+
+
+def test_can_map_file() -> None:
+    path = os.path.join(directory, "data", "taxrank.obo")
+    assert can_map_file(path, "utf-8")
+    assert can_map_file(pathlib.Path(path), "latin-1")
+    assert not can_map_file(path, "utf-16")
+    assert not can_map_file(path, "not-an-encoding")
+    assert not can_map_file(path + ".gz", "utf-8")
+    assert not can_map_file("https://example.org/taxrank.obo", "utf-8")
+
+
+def test_read_obo_pipe(pipe_file: Callable[[str], str]) -> None:
+    path = os.path.join(directory, "data", "taxrank.obo")
+    pipe_path = pipe_file(path)
+    # pipes report a size of zero, so they are read without a memory map
+    assert not can_map_file(pipe_path, "utf-8")
+    graph = obonet.read_obo(pipe_path)
+    assert list(graph.nodes(data=True)) == list(obonet.read_obo(path).nodes(data=True))
+    stanzas = list(iter_stanzas(pipe_file(path)))
+    assert stanzas == list(iter_stanzas(path))
@@ -1,10 +1,25 @@
+import collections
+import copy
 import os
 import pathlib
+import pickle
+from collections.abc import Callable
 
+import networkx
 import pytest
 
 import obonet
-from obonet.read import parse_stanza, parse_tag_line, term_tag_singularity
+from obonet.io import get_opener, open_read_file
+from obonet.read import (
+    Clauses,
+    Stanza,
+    build_graph,
+    get_sections,
+    iter_sections,
+    parse_stanza,
+    parse_tag_line,
+    term_tag_singularity,
+)
 
 directory = os.path.dirname(os.path.abspath(__file__))
 
@@ -49,6 +64,43 @@ def test_read_taxrank_url(extension: str) -> None:
     assert len(taxrank) == 61
 
 
+@pytest.mark.parametrize("extension", ["", ".gz", ".bz2", ".xz"])
+def test_read_taxrank_local_url(data_url: str, extension: str) -> None:
+    """
+    Test reading the taxrank ontology OBO file from a local HTTP server,
+    which is streamed and decompressed as the response is read.
+    """
+    taxrank = obonet.read_obo(data_url + "taxrank.obo" + extension)
+    path = os.path.join(directory, "data", "taxrank.obo" + extension)
+    expected = obonet.read_obo(path)
+    assert list(taxrank.nodes(data=True)) == list(expected.nodes(data=True))
+    assert list(taxrank.edges(keys=True)) == list(expected.edges(keys=True))
+    assert taxrank.graph == expected.graph
+
+
+@pytest.mark.parametrize("extension", ["", ".gz"])
+def test_open_read_file_url_streams(
+    serve_directory: Callable[[pathlib.Path], str],
+    tmp_path: pathlib.Path,
+    extension: str,
+) -> None:
+    """
+    Test that reading the first line of a URL does not download the entire
+    response, and that closing the file closes the response.
+    """
+    text = pathlib.Path(directory, "data", "taxrank.obo").read_text("utf-8")
+    path = tmp_path / f"repeated.obo{extension}"
+    with get_opener(str(path))(path, "wt", encoding="utf-8") as write_file:
+        write_file.write(text * 500)
+    url = serve_directory(tmp_path) + path.name
+    with open_read_file(url, encoding="utf-8") as obo_file:
+        assert obo_file.readline() == text.splitlines(keepends=True)[0]
+        response = obo_file.response  # type: ignore [attr-defined]
+        # bytes of the response body that have not been read yet
+        assert response.length > 0
+    assert response.closed
+
+
 def test_read_brenda_subset() -> None:
     """
     Test reading a subset of the BrendaTissue.obo file. This file does not set
@@ -179,6 +231,35 @@ def test_parse_stanza_with_clauses() -> None:
     }
 
 
+def test_parse_stanza_clauses_are_lazy() -> None:
+    lines = [
+        "id: T:1",
+        "! a comment line",
+        "name: one ! comment",
+        'is_a: T:0 {source="x"} ! zero',
+    ]
+    stanza = parse_stanza(
+        lines, term_tag_singularity, include_clauses=True, exclude_tags={"name"}
+    )
+    clauses = stanza["_clauses"]
+    assert isinstance(clauses, Clauses)
+    assert clauses._clauses is None
+    restored = pickle.loads(pickle.dumps(clauses))
+    assert restored._clauses is None
+    assert list(clauses) == ["id", "is_a"]
+    assert clauses["is_a"] == [
+        {
+            "tag": "is_a",
+            "value": "T:0",
+            "trailing_modifier": 'source="x"',
+            "comment": "zero",
+        }
+    ]
+    assert "name" not in clauses
+    assert restored == clauses
+    assert dict(restored) == dict(clauses)
+
+
 def test_read_obo_with_clauses() -> None:
     path = os.path.join(directory, "data", "taxrank.obo")
     taxrank = obonet.read_obo(path)
@@ -240,3 +321,146 @@ def test_presence_of_obsolete_nodes() -> None:
     assert "BTO:0000311" in nodes
     node = nodes["BTO:0000311"]
     assert node["is_obsolete"] == "true"
+
+
+def test_iter_stanzas() -> None:
+    path = os.path.join(directory, "data", "taxrank.obo")
+    stanzas = obonet.iter_stanzas(path)
+    assert not isinstance(stanzas, list)
+    header = next(stanzas)
+    assert header.stanza_type == "header"
+    assert header.tags["ontology"] == "taxrank"
+    counts = collections.Counter(stanza.stanza_type for stanza in stanzas)
+    assert counts == {"Term": 61, "Typedef": 1}
+
+
+def test_iter_stanzas_matches_get_sections() -> None:
+    path = os.path.join(directory, "data", "brenda-subset.obo")
+    with open(path, encoding="utf-8") as read_file:
+        typedefs, terms, instances, header = get_sections(read_file)
+    stanzas = list(obonet.iter_stanzas(path))
+    assert [s.tags for s in stanzas if s.stanza_type == "Term"] == terms
+    assert [s.tags for s in stanzas if s.stanza_type == "Typedef"] == typedefs
+    assert [s.tags for s in stanzas if s.stanza_type == "header"] == [header]
+    assert not instances
+
+
+def build_graph_legacy(stanzas: list[Stanza]) -> networkx.MultiDiGraph:
+    """
+    Reference implementation of graph construction using add_node and
+    add_edge for every term and relationship.
+    """
+    graph = networkx.MultiDiGraph()
+    edge_tuples = []
+    for stanza in stanzas:
+        if stanza.stanza_type != "Term":
+            continue
+        term = dict(stanza.tags)
+        term_id = term.pop("id")
+        graph.add_node(term_id, **term)
+        for target_term in term.pop("is_a", []):
+            edge_tuples.append((term_id, "is_a", target_term))
+        for relationship in term.pop("relationship", []):
+            typedef, target_term = relationship.split(" ")
+            edge_tuples.append((term_id, typedef, target_term))
+    for term0, typedef, term1 in edge_tuples:
+        graph.add_edge(term0, term1, key=typedef)
+    return graph
+
+
+def test_build_graph_matches_add_edge() -> None:
+    """
+    Graph construction must match per-edge add_edge calls, including
+    repeated is_a targets, duplicate term ids and targets without stanzas.
+    """
+    lines = [
+        "ontology: test\n",
+        "\n",
+        "[Term]\n",
+        "id: T:1\n",
+        "name: one\n",
+        "is_a: T:2\n",
+        "is_a: T:2\n",
+        "is_a: T:3\n",
+        "relationship: part_of T:2\n",
+        "relationship: part_of T:2\n",
+        "\n",
+        "[Term]\n",
+        "id: T:2\n",
+        "is_a: T:4\n",
+        "\n",
+        "[Term]\n",
+        "id: T:1\n",
+        "comment: duplicate stanza\n",
+    ]
+    stanzas = list(iter_sections(lines))
+    legacy = build_graph_legacy(copy.deepcopy(stanzas))
+    graph = build_graph(stanzas)
+    assert list(graph.nodes(data=True)) == list(legacy.nodes(data=True))
+    assert list(graph.edges(keys=True, data=True)) == list(
+        legacy.edges(keys=True, data=True)
+    )
+    assert list(graph.pred["T:2"]) == list(legacy.pred["T:2"])
+    assert graph.number_of_edges("T:1", "T:2") == 2
+    assert graph.nodes["T:1"]["comment"] == "duplicate stanza"
+    assert graph.nodes["T:3"] == {}
+    graph.add_edge("T:4", "T:5", key="is_a")
+    assert graph.has_edge("T:4", "T:5", key="is_a")
+    assert networkx.is_directed_acyclic_graph(graph.copy())
+
+
+@pytest.mark.parametrize("filename", ["taxrank.obo", "brenda-subset.obo"])
+def test_build_graph_matches_add_edge_fixtures(filename: str) -> None:
+    path = os.path.join(directory, "data", filename)
+    stanzas = list(obonet.iter_stanzas(path))
+    legacy = build_graph_legacy(copy.deepcopy(stanzas))
+    graph = build_graph(stanzas, ignore_obsolete=False)
+    assert list(graph.nodes(data=True)) == list(legacy.nodes(data=True))
+    assert list(graph.edges(keys=True)) == list(legacy.edges(keys=True))
+
+
+def test_read_obo_include_tags() -> None:
+    path = os.path.join(directory, "data", "taxrank.obo")
+    taxrank = obonet.read_obo(path, include_tags=["name", "is_a"])
+    assert len(taxrank) == 61
+    assert taxrank.nodes["TAXRANK:0000001"] == {
+        "name": "phylum",
+        "is_a": ["TAXRANK:0000000"],
+    }
+    assert taxrank.number_of_edges() == obonet.read_obo(path).number_of_edges()
+    assert taxrank.graph["typedefs"][0].keys() <= {"id", "name"}
+    assert taxrank.graph["ontology"] == "taxrank"
+
+
+def test_read_obo_exclude_tags() -> None:
+    path = os.path.join(directory, "data", "taxrank.obo")
+    taxrank = obonet.read_obo(path, exclude_tags=["xref", "id", "is_a"])
+    node = taxrank.nodes["TAXRANK:0000017"]
+    assert "xref" not in node
+    assert "is_a" not in node
+    assert node["name"] == "kingdom"
+    assert taxrank.number_of_edges() == 0
+
+
+def test_read_obo_include_tags_ignores_obsolete() -> None:
+    path = os.path.join(directory, "data", "brenda-subset.obo")
+    brenda = obonet.read_obo(path, include_tags=["name"])
+    assert "BTO:0000311" not in brenda
+    brenda = obonet.read_obo(path, include_tags=["name"], ignore_obsolete=False)
+    assert brenda.nodes["BTO:0000311"].keys() == {"name"}
+
+
+def test_parse_stanza_tag_filters() -> None:
+    lines = [
+        "id: GO:0000001",
+        "name: mitochondrion inheritance",
+        'def: "The distribution of mitochondria" [GOC:mcc]',
+        "is_a: GO:0048308 ! organelle inheritance",
+        "not a tag line",
+    ]
+    stanza = parse_stanza(lines, term_tag_singularity, include_tags={"id", "name"})
+    assert stanza == {"id": "GO:0000001", "name": "mitochondrion inheritance"}
+    stanza = parse_stanza(
+        lines[:-1], term_tag_singularity, exclude_tags={"def", "is_a"}
+    )
+    assert stanza == {"id": "GO:0000001", "name": "mitochondrion inheritance"}
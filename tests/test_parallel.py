@@ -0,0 +1,76 @@
+import io
+import itertools
+import os
+from collections.abc import Callable
+from typing import Any
+
+import pytest
+
+import obonet
+from obonet import parallel
+
+directory = os.path.dirname(os.path.abspath(__file__))
+
+
+def graph_contents(graph: Any) -> tuple[Any, ...]:
+    return (
+        list(graph.nodes(data=True)),
+        list(graph.edges(keys=True, data=True)),
+        graph.graph,
+    )
+
+
+@pytest.mark.parametrize("filename", ["taxrank.obo", "taxrank.obo.gz"])
+@pytest.mark.parametrize("include_clauses", [False, True])
+def test_read_obo_workers_matches_serial(
+    monkeypatch: pytest.MonkeyPatch, filename: str, include_clauses: bool
+) -> None:
+    """
+    Small chunk sizes force the file to be split across many tasks.
+    """
+    monkeypatch.setattr(parallel, "max_chunk_bytes", 1000)
+    monkeypatch.setattr(parallel, "max_chunk_lines", 50)
+    path = os.path.join(directory, "data", filename)
+    serial = obonet.read_obo(path, include_clauses=include_clauses)
+    parallel_graph = obonet.read_obo(path, include_clauses=include_clauses, workers=2)
+    assert graph_contents(parallel_graph) == graph_contents(serial)
+
+
+def test_read_obo_workers_pipe(
+    monkeypatch: pytest.MonkeyPatch, pipe_file: Callable[[str], str]
+) -> None:
+    """
+    Pipes report a size of zero, so they are sent to workers in batches of
+    lines rather than split into byte ranges.
+    """
+    monkeypatch.setattr(parallel, "max_chunk_lines", 50)
+    path = os.path.join(directory, "data", "taxrank.obo")
+    graph = obonet.read_obo(pipe_file(path), workers=2)
+    assert graph_contents(graph) == graph_contents(obonet.read_obo(path))
+
+
+def test_get_byte_chunks() -> None:
+    path = os.path.join(directory, "data", "taxrank.obo")
+    chunks = parallel.get_byte_chunks(path, n_chunks=8)
+    assert len(chunks) >= 8
+    assert chunks[0][0] == 0
+    assert chunks[-1][1] == os.path.getsize(path)
+    with open(path, "rb") as read_file:
+        data = read_file.read()
+    for (_, end), (start, _) in itertools.pairwise(chunks):
+        assert end == start
+        assert data[:end].endswith(b"\n\n")
+
+
+def test_iter_line_chunks() -> None:
+    lines = io.StringIO("a: 1\nb: 2\n\nc: 3\n\nd: 4\n").readlines()
+    chunks = list(parallel.iter_line_chunks(lines, chunk_lines=2))
+    assert chunks == [["a: 1\n", "b: 2\n", "\n"], ["c: 3\n", "\n"], ["d: 4\n"]]
+
+
+def test_read_obo_workers_include_tags(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(parallel, "max_chunk_bytes", 1000)
+    path = os.path.join(directory, "data", "taxrank.obo")
+    serial = obonet.read_obo(path, include_tags=["name"])
+    parallel_graph = obonet.read_obo(path, include_tags=["name"], workers=2)
+    assert graph_contents(parallel_graph) == graph_contents(serial)
@@ -0,0 +1,73 @@
+import os
+from typing import Any
+
+import pytest
+
+import obonet
+from obonet.cli import main
+from obonet.io import open_read_file
+from obonet.profile import ReadStats
+
+directory = os.path.dirname(os.path.abspath(__file__))
+
+
+@pytest.mark.parametrize("filename", ["taxrank.obo", "taxrank.obo.gz"])
+def test_read_obo_stats(filename: str) -> None:
+    path = os.path.join(directory, "data", filename)
+    stats = ReadStats()
+    graph = obonet.read_obo(path, stats=stats)
+    assert graph.nodes == obonet.read_obo(path).nodes
+    assert set(stats.phase_seconds) == {"read", "parse", "build", "total"}
+    assert sum(stats.phase_seconds.values()) == pytest.approx(
+        2 * stats.phase_seconds["total"]
+    )
+    with open_read_file(path, encoding="utf-8") as read_file:
+        text = read_file.read()
+    assert stats.characters == len(text)
+    assert stats.lines == sum(bool(line.strip()) for line in text.splitlines())
+    assert stats.stanzas == {"header": 1, "Term": 61, "Typedef": 1}
+    assert stats.tag_lines > stats.regex_fallbacks > 0
+    assert stats.nodes == 61
+    assert stats.edges == graph.number_of_edges()
+    assert stats.peak_memory_bytes is None or stats.peak_memory_bytes > 0
+
+
+def test_read_obo_stats_tag_filters() -> None:
+    """
+    Tag lines skipped by include_tags are not counted as parsed.
+    """
+    path = os.path.join(directory, "data", "taxrank.obo")
+    stats = ReadStats()
+    obonet.read_obo(path, include_tags=["name"], stats=stats)
+    with open(path, encoding="utf-8") as read_file:
+        blocks = [block.splitlines() for block in read_file.read().split("\n\n")]
+    header_lines = sum(not line.startswith("!") for line in blocks[0])
+    kept_lines = sum(
+        line.partition(":")[0] in {"id", "name", "is_obsolete"}
+        for block in blocks[1:]
+        for line in block
+    )
+    assert stats.tag_lines == header_lines + kept_lines
+    assert stats.lines == sum(len(block) for block in blocks)
+    unfiltered = ReadStats()
+    obonet.read_obo(path, stats=unfiltered)
+    assert stats.regex_fallbacks < unfiltered.regex_fallbacks
+
+
+def test_read_obo_stats_workers() -> None:
+    path = os.path.join(directory, "data", "taxrank.obo")
+    stats = ReadStats()
+    obonet.read_obo(path, workers=2, stats=stats)
+    assert stats.stanzas["Term"] == 61
+    assert stats.lines == 0
+    assert "parse" in stats.phase_seconds
+
+
+def test_cli_profile(capsys: Any) -> None:
+    path = os.path.join(directory, "data", "taxrank.obo")
+    main([path, "--profile"])
+    captured = capsys.readouterr()
+    assert '"TAXRANK:0000060"' in captured.out
+    assert "parse time:" in captured.err
+    assert "Term stanzas: 61" in captured.err
+    assert "nodes: 61" in captured.err
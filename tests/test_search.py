@@ -0,0 +1,150 @@
+import io
+import os
+import pickle
+
+import pytest
+
+import obonet
+from obonet.search import SearchIndex, SearchMatch, build_search_index, parse_synonym
+
+directory = os.path.dirname(os.path.abspath(__file__))
+taxrank_path = os.path.join(directory, "data", "taxrank.obo")
+
+obo_text = """\
+format-version: 1.4
+ontology: search-test
+
+[Term]
+id: T:1
+name: Alpha  Helix
+synonym: "helix, alpha" EXACT []
+synonym: "a-helix" RELATED [PMID:1]
+alt_id: T:10
+
+[Term]
+id: T:2
+name: alpha sheet
+synonym: "\\"beta\\" sheet" NARROW []
+exact_synonym: "sheet"
+
+[Term]
+id: T:3
+name: gamma turn
+synonym: "turn" []
+
+[Term]
+id: T:4
+name: alpha helix obsolete
+is_obsolete: true
+"""
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        ('"term 49" EXACT []', ("term 49", "EXACT")),
+        (
+            '"a \\"quoted\\" term" BROAD systematic [PMID:1]',
+            ('a "quoted" term', "BROAD"),
+        ),
+        ('"no scope" []', ("no scope", None)),
+        ('"unknown scope" OTHER []', ("unknown scope", None)),
+        ("unquoted", ("unquoted", None)),
+    ],
+)
+def test_parse_synonym(value: str, expected: tuple[str, str | None]) -> None:
+    assert parse_synonym(value) == expected
+
+
+def test_read_obo_search_index() -> None:
+    graph = obonet.read_obo(io.StringIO(obo_text), search_index=True)
+    index = graph.graph["search_index"]
+    assert isinstance(index, SearchIndex)
+    assert index.exact("ALPHA HELIX") == [SearchMatch("T:1", "Alpha  Helix", "name")]
+    assert index.exact("helix,   Alpha") == [
+        SearchMatch("T:1", "helix, alpha", "synonym", "EXACT")
+    ]
+    assert index.exact('"Beta" sheet') == [
+        SearchMatch("T:2", '"beta" sheet', "synonym", "NARROW")
+    ]
+    assert index.exact("sheet") == [SearchMatch("T:2", "sheet", "synonym", "EXACT")]
+    assert index.exact("turn") == [SearchMatch("T:3", "turn", "synonym")]
+    assert index.exact("t:10") == [SearchMatch("T:1", "T:10", "alt_id")]
+    # obsolete terms that are not added to the graph are not indexed
+    assert index.exact("alpha helix obsolete") == []
+    assert index.exact("") == []
+
+
+def test_search_index_prefix() -> None:
+    index = obonet.read_obo(io.StringIO(obo_text), search_index=True).graph[
+        "search_index"
+    ]
+    assert [match.text for match in index.prefix("Alpha")] == [
+        "Alpha  Helix",
+        "alpha sheet",
+    ]
+    assert [match.text for match in index.prefix("alpha", limit=1)] == ["Alpha  Helix"]
+    assert len(index.prefix("", limit=None)) == len(index) == 9
+    assert index.prefix("delta") == []
+    # texts added after a prefix query are found
+    index.add_term("T:5", {"name": "alphabet"})
+    assert [match.term_id for match in index.prefix("alphab")] == ["T:5"]
+
+
+def test_search_index_fuzzy() -> None:
+    index = obonet.read_obo(taxrank_path, search_index=True).graph["search_index"]
+    (score, match), *others = index.fuzzy("subspeceis", limit=3)
+    assert match == SearchMatch("TAXRANK:0000023", "subspecies", "name")
+    assert 0.3 <= score < 1
+    assert all(other_score <= score for other_score, _ in others)
+    assert index.fuzzy("subspecies", limit=1) == [(1.0, match)]
+    assert index.fuzzy("zzzzzz") == []
+    assert index.fuzzy("") == []
+
+
+def test_search_index_search() -> None:
+    index = obonet.read_obo(io.StringIO(obo_text), search_index=True).graph[
+        "search_index"
+    ]
+    # an exact synonym match comes before prefix matches, and each term
+    # is returned once
+    assert [match.term_id for match in index.search("sheet")] == ["T:2"]
+    assert [match.term_id for match in index.search("alpha")] == ["T:1", "T:2"]
+    assert [match.term_id for match in index.search("gama turn")] == ["T:3"]
+    assert [match.term_id for match in index.search("alpha", limit=1)] == ["T:1"]
+
+
+def test_build_search_index_matches_read_obo() -> None:
+    graph = obonet.read_obo(taxrank_path, search_index=True)
+    index = build_search_index(graph)
+    assert index.texts == graph.graph["search_index"].texts
+    assert index.matches == graph.graph["search_index"].matches
+    compact = obonet.read_obo(taxrank_path, compact=True)
+    assert build_search_index(compact).matches == index.matches
+
+
+def test_search_index_tags_and_pickle() -> None:
+    graph = obonet.read_obo(
+        io.StringIO(obo_text), search_index=True, include_tags=["is_a"]
+    )
+    index = graph.graph["search_index"]
+    # tags parsed only for the index are not stored on nodes
+    assert "synonym" not in graph.nodes["T:1"]
+    assert "name" not in graph.nodes["T:1"]
+    assert index.exact("alpha helix")
+    graph = obonet.read_obo(
+        io.StringIO(obo_text),
+        search_index=True,
+        include_tags=["is_a"],
+        include_clauses=True,
+    )
+    assert dict(graph.nodes["T:1"]["_clauses"]) == {
+        "id": [
+            {"tag": "id", "value": "T:1", "trailing_modifier": None, "comment": None}
+        ]
+    }
+    index.prefix("a")
+    restored = pickle.loads(pickle.dumps(index))
+    assert restored._sorted is None
+    assert restored.prefix("a") == index.prefix("a")
+    assert restored.fuzzy("alpha helx") == index.fuzzy("alpha helx")
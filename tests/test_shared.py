@@ -0,0 +1,148 @@
+import io
+import multiprocessing
+import os
+import pathlib
+import pickle
+import subprocess
+import sys
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+
+import pytest
+
+import obonet
+from obonet.arrays import read_obo_arrays
+from obonet.shared import SharedOntology, share_obo
+
+directory = os.path.dirname(os.path.abspath(__file__))
+taxrank_path = os.path.join(directory, "data", "taxrank.obo")
+
+
+@pytest.fixture
+def shared() -> Iterator[SharedOntology]:
+    ontology = share_obo(taxrank_path)
+    yield ontology
+    ontology.close()
+    ontology.unlink()
+
+
+def check_matches_graph(ontology: SharedOntology, graph: Any) -> None:
+    assert len(ontology) == len(graph)
+    assert list(ontology) == list(graph)
+    assert ontology.graph == graph.graph
+    for i, (node, data) in enumerate(graph.nodes(data=True)):
+        assert ontology.index(node) == i
+        assert ontology.node_data(node) == data
+        assert sorted(ontology.out_edges(node)) == sorted(
+            graph.out_edges(node, keys=True)
+        )
+        assert sorted(ontology.in_edges(node)) == sorted(
+            graph.in_edges(node, keys=True)
+        )
+
+
+def test_share_obo_matches_read_obo(shared: SharedOntology) -> None:
+    graph = obonet.read_obo(taxrank_path)
+    check_matches_graph(shared, graph)
+    assert shared.relations == ["is_a"]
+    assert shared.successors("TAXRANK:0000006", "is_a") == ["TAXRANK:0000000"]
+    assert "TAXRANK:0000006" in shared.predecessors("TAXRANK:0000000", "is_a")
+    assert shared.successors("TAXRANK:0000006", "part_of") == []
+    assert "missing" not in shared
+    assert shared.index("missing") is None
+    with pytest.raises(KeyError):
+        shared.node_data("missing")
+
+
+def count_descendants(ontology: SharedOntology, node: str) -> tuple[int, str]:
+    return len(ontology.predecessors(node, "is_a")), ontology.location[1]
+
+
+def attach_and_count(name: str, node: str) -> int:
+    with SharedOntology.attach(name) as ontology:
+        return len(ontology.predecessors(node, "is_a"))
+
+
+def test_shared_memory_attach_from_processes(shared: SharedOntology) -> None:
+    expected = len(shared.predecessors("TAXRANK:0000000", "is_a"))
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=2, mp_context=context) as executor:
+        # passing the ontology pickles a reference to the shared memory block
+        passed = executor.submit(count_descendants, shared, "TAXRANK:0000000")
+        name = shared.location[1]
+        attached = executor.submit(attach_and_count, name, "TAXRANK:0000000")
+        assert passed.result() == (expected, name)
+        assert attached.result() == expected
+    # exiting workers must not unlink the block
+    with SharedOntology.attach(name) as ontology:
+        assert len(ontology) == len(shared)
+
+
+def test_shared_memory_attach_from_unrelated_process(shared: SharedOntology) -> None:
+    """
+    A process started outside multiprocessing has its own resource tracker,
+    which must not unlink the block when the process exits.
+    """
+    name = shared.location[1]
+    code = (
+        "import sys\n"
+        "from obonet.shared import SharedOntology\n"
+        "with SharedOntology.attach(sys.argv[1]) as ontology:\n"
+        "    print(len(ontology))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code, name],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=os.path.dirname(directory),
+    )
+    assert result.stdout.strip() == str(len(shared))
+    assert "KeyError" not in result.stderr
+    with SharedOntology.attach(name) as ontology:
+        assert len(ontology) == len(shared)
+
+
+def test_shared_file(tmp_path: pathlib.Path) -> None:
+    path = tmp_path / "taxrank.obonet-shared"
+    graph = obonet.read_obo(taxrank_path)
+    with SharedOntology.from_graph(graph, path=path) as ontology:
+        check_matches_graph(ontology, graph)
+        reopened = pickle.loads(pickle.dumps(ontology))
+        assert reopened.location == ("file", os.fspath(path))
+        assert reopened.node_data("TAXRANK:0000006")["name"] == "species"
+        reopened.close()
+    with pytest.raises(ValueError, match="not an obonet shared ontology"):
+        SharedOntology.open(taxrank_path)
+
+
+def test_shared_from_graph_clauses(tmp_path: pathlib.Path) -> None:
+    graph = obonet.read_obo(taxrank_path, include_clauses=True)
+    path = tmp_path / "taxrank.obonet-shared"
+    with SharedOntology.from_graph(graph, path=path) as ontology:
+        clauses = ontology.node_data("TAXRANK:0000006")["_clauses"]
+        assert type(clauses) is dict
+        assert clauses == graph.nodes["TAXRANK:0000006"]["_clauses"]
+        assert ontology.graph["_clauses"] == graph.graph["_clauses"]
+
+
+def test_share_obo_node_tags(tmp_path: pathlib.Path) -> None:
+    text = (
+        "ontology: shared-test\n\n"
+        '[Term]\nid: T:1\nname: one\ndef: "First." []\n\n'
+        "[Term]\nid: T:2\nname: two\nis_a: T:1\nrelationship: part_of EXT:1\n"
+    )
+    path = tmp_path / "shared.obo"
+    path.write_text(text)
+    arrays = read_obo_arrays(io.StringIO(text), node_tags=["name"])
+    with share_obo(path, path=tmp_path / "shared", node_tags=["name"]) as ontology:
+        assert list(ontology) == arrays.ids == ["T:1", "T:2", "EXT:1"]
+        assert ontology.node_data("T:1") == {"name": "one"}
+        assert ontology.node_data("EXT:1") == {}
+        assert ontology.out_edges("T:2") == [
+            ("T:2", "T:1", "is_a"),
+            ("T:2", "EXT:1", "part_of"),
+        ]
+        assert ontology.in_edges("EXT:1") == [("T:2", "EXT:1", "part_of")]
+        assert ontology.graph["name"] == "shared-test"
@@ -0,0 +1,89 @@
+"""
+Differential tests checking that the split_tag_line fast path returns the
+same results as the regular expression parser.
+"""
+
+import os
+
+import pytest
+
+from obonet import read
+from obonet.io import open_read_file
+from obonet.read import split_tag_line, split_tag_line_regex, uses_tag_line_regex
+
+directory = os.path.dirname(os.path.abspath(__file__))
+
+
+def read_fixture_lines() -> list[str]:
+    data_dir = os.path.join(directory, "data")
+    lines: set[str] = set()
+    for dirpath, _, filenames in os.walk(data_dir):
+        for filename in filenames:
+            path = os.path.join(dirpath, filename)
+            with open_read_file(path, encoding="utf-8") as read_file:
+                lines.update(read_file)
+    return sorted(line for line in lines if line.strip() and not line.startswith("["))
+
+
+fixture_lines = read_fixture_lines()
+
+edge_case_lines = [
+    "id: GO:0000001",
+    "id: GO:0000001\n",
+    "id: GO:0000001\r\n",
+    "id:GO:0000001",
+    "id:\tGO:0000001  \t\n",
+    "  id : GO:0000001\n",
+    "name:\n",
+    "name:",
+    "name: \n",
+    "name:   \n",
+    "tag:with: colons\n",
+    ": leading colon\n",
+    ":: double colon\n",
+    'def: "a\\nb" []\n',
+    "name: non\u00a0breaking\u00a0space\u00a0\n",
+    "name: trailing unicode space\u2003\n",
+    "name: \u2003leading unicode space\n",
+    "is_a: GO:0005102 ! receptor binding\n",
+    "is_a: GO:0005102 !receptor binding\n",
+    "is_a: GO:0005102! no whitespace\n",
+    'xref: UMLS:C0226369 {source="ncit"}\n',
+    'xref: UMLS:C0226369 {source="ncit"} ! comment\n',
+    "xref: UMLS:C0226369 \\{escaped}\n",
+    'synonym: "10*3.{copies}/mL" EXACT []\n',
+    "synonym: not a real example \\!\n",
+    "name: a\rb\n",
+    "name: a\nb\n",
+    "na\nme: value\n",
+]
+
+
+@pytest.mark.parametrize("line", fixture_lines + edge_case_lines)
+def test_split_tag_line_matches_regex(line: str) -> None:
+    try:
+        expected = split_tag_line_regex(line)
+    except ValueError:
+        with pytest.raises(ValueError):
+            split_tag_line(line)
+        return
+    assert split_tag_line(line) == expected
+
+
+@pytest.mark.parametrize("line", ["no colon here\n", ":\n", ""])
+def test_split_tag_line_invalid(line: str) -> None:
+    with pytest.raises(ValueError):
+        split_tag_line(line)
+
+
+@pytest.mark.parametrize("line", fixture_lines + edge_case_lines)
+def test_uses_tag_line_regex(monkeypatch: pytest.MonkeyPatch, line: str) -> None:
+    regex_lines = []
+
+    def split_regex(line: str) -> read.TagLineParts:
+        regex_lines.append(line)
+        return ("tag", "value", None, None)
+
+    monkeypatch.setattr(read, "split_tag_line_regex", split_regex)
+    split_tag_line(line)
+    assert uses_tag_line_regex(line) == bool(regex_lines)
@@ -0,0 +1,88 @@
+import os
+import pathlib
+from typing import Any
+
+import pytest
+
+import obonet
+
+directory = os.path.dirname(os.path.abspath(__file__))
+
+
+def graph_contents(graph: Any) -> tuple[Any, ...]:
+    return (
+        {node: dict(data) for node, data in graph.nodes(data=True)},
+        sorted(graph.edges(keys=True)),
+        graph.graph,
+    )
+
+
+def write_new_release(tmp_path: pathlib.Path) -> pathlib.Path:
+    """
+    Write a modified taxrank release: one term renamed, one removed, one
+    made obsolete, one added with an edge to a term that is not defined,
+    a typedef added and the data-version changed.
+    """
+    text = pathlib.Path(directory, "data", "taxrank.obo").read_text("utf-8")
+    text = text.replace("data-version: releases/2016-04-15", "data-version: new")
+    text = text.replace("name: species\n", "name: species rank\n")
+    start = text.index("[Term]\nid: TAXRANK:0000017\n")
+    text = text[:start] + text[text.index("[Term]", start + 1) :]
+    text = text.replace(
+        "id: TAXRANK:0000007\nname: subclass\n",
+        "id: TAXRANK:0000007\nname: subclass\nis_obsolete: true\n",
+    )
+    text += (
+        "\n[Term]\nid: TAXRANK:9999999\nname: new rank\n"
+        "is_a: TAXRANK:0000006 ! species rank\n"
+        "relationship: part_of EXT:0000001\n"
+        "\n[Typedef]\nid: part_of\nname: part of\n"
+    )
+    path = tmp_path / "taxrank-new.obo"
+    path.write_text(text, "utf-8")
+    return path
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_update_graph(tmp_path: pathlib.Path, compact: bool) -> None:
+    old_path = os.path.join(directory, "data", "taxrank.obo")
+    new_path = write_new_release(tmp_path)
+    graph = obonet.read_obo(old_path, compact=compact)
+    changes = obonet.update_graph(graph, new_path, compact=compact)
+    expected = obonet.read_obo(new_path, compact=compact)
+    assert graph_contents(graph) == graph_contents(expected)
+    assert changes.added_nodes == ["TAXRANK:9999999", "EXT:0000001"]
+    assert changes.removed_nodes == ["TAXRANK:0000007", "TAXRANK:0000017"]
+    assert changes.changed_nodes == ["TAXRANK:0000006"]
+    assert sorted(changes.added_edges) == [
+        ("TAXRANK:9999999", "EXT:0000001", "part_of"),
+        ("TAXRANK:9999999", "TAXRANK:0000006", "is_a"),
+    ]
+    assert sorted(changes.removed_edges) == [
+        ("TAXRANK:0000007", "TAXRANK:0000000", "is_a"),
+        ("TAXRANK:0000017", "TAXRANK:0000000", "is_a"),
+    ]
+    assert changes.added_typedefs == ["part_of"]
+    assert changes.removed_typedefs == []
+    assert changes.changed_typedefs == []
+    assert changes.header_changed
+    assert changes
+
+
+def test_update_graph_unchanged() -> None:
+    path = os.path.join(directory, "data", "taxrank.obo")
+    graph = obonet.read_obo(path, include_clauses=True)
+    expected = graph_contents(graph)
+    changes = obonet.update_graph(graph, path, include_clauses=True)
+    assert not changes
+    assert graph_contents(graph) == expected
+
+
+def test_update_graph_reverts(tmp_path: pathlib.Path) -> None:
+    old_path = os.path.join(directory, "data", "taxrank.obo")
+    new_path = write_new_release(tmp_path)
+    graph = obonet.read_obo(new_path)
+    changes = obonet.update_graph(graph, old_path)
+    assert graph_contents(graph) == graph_contents(obonet.read_obo(old_path))
+    assert changes.removed_nodes == ["TAXRANK:9999999", "EXT:0000001"]
+    assert changes.removed_typedefs == ["part_of"]